@@ -1,13 +1,24 @@
+import logging
 import os
+import sys
 from dotenv import load_dotenv
 
 # ✅ Load environment variables from .env
 load_dotenv()
 
+# ✅ Level-gated logging instead of prints; LOG_LEVEL=DEBUG shows the per-request details
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s level=%(levelname)s logger=%(name)s %(message)s",
+)
+logging.getLogger("httpx").setLevel(logging.WARNING)  # one INFO line per outbound/test request otherwise
+logger = logging.getLogger(__name__)
+
 class Settings:
     def __init__(self):
         # ✅ Base directory of the project (2 levels up from this file)
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        self.BASE_DIR = base_dir
 
         # ✅ Use .env DATA_DIR or fallback to ./data/inventory inside project
         env_data_dir = os.getenv("DATA_DIR")
@@ -17,7 +28,55 @@ class Settings:
             else os.path.abspath(os.path.join(base_dir, env_data_dir or "data/inventory"))
         )
 
-        print(f"📂 Using data directory: {self.DATA_DIR}")  # ✅ Debugging path
+        # ✅ Driver data lives next to inventory by default (data/drivers)
+        env_drivers_dir = os.getenv("DRIVERS_DIR") or "data/drivers"
+        self.DRIVERS_DIR = (
+            env_drivers_dir
+            if os.path.isabs(env_drivers_dir)
+            else os.path.abspath(os.path.join(base_dir, env_drivers_dir))
+        )
+
+        env_sentiment_dir = os.getenv("SENTIMENT_DIR") or "data/sentiment"
+        self.SENTIMENT_DIR = (
+            env_sentiment_dir
+            if os.path.isabs(env_sentiment_dir)
+            else os.path.abspath(os.path.join(base_dir, env_sentiment_dir))
+        )
+
+        # ✅ Memory-mapped embedding matrices of the chatbot's vector index
+        env_vector_dir = os.getenv("VECTOR_DIR") or "data/vectors"
+        self.VECTOR_DIR = (
+            env_vector_dir
+            if os.path.isabs(env_vector_dir)
+            else os.path.abspath(os.path.join(base_dir, env_vector_dir))
+        )
+
+        # ✅ Per-store inventory shards: <STORES_DIR>/<store>/inventory.csv
+        env_stores_dir = os.getenv("STORES_DIR") or "data/stores"
+        self.STORES_DIR = (
+            env_stores_dir
+            if os.path.isabs(env_stores_dir)
+            else os.path.abspath(os.path.join(base_dir, env_stores_dir))
+        )
+
+        # ✅ Primary row store: "csv" (files parsed into memory) or "sqlite" (typed, indexed tables)
+        self.STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "csv").lower()
+        env_sqlite_path = os.getenv("SQLITE_PATH") or "data/smartstore.db"
+        self.SQLITE_PATH = (
+            env_sqlite_path
+            if os.path.isabs(env_sqlite_path)
+            else os.path.abspath(os.path.join(base_dir, env_sqlite_path))
+        )
+
+        # ✅ Incident log (always SQLite, shared by every worker)
+        env_incidents_db = os.getenv("INCIDENTS_DB") or "data/incidents.db"
+        self.INCIDENTS_DB = (
+            env_incidents_db
+            if os.path.isabs(env_incidents_db)
+            else os.path.abspath(os.path.join(base_dir, env_incidents_db))
+        )
+
+        logger.info("📂 Using data directory: %s", self.DATA_DIR)
 
     def inventory_file_path(self):
         return os.path.join(self.DATA_DIR, "inventory.csv")
@@ -28,4 +87,26 @@ class Settings:
     def transfers_file_path(self):
         return os.path.join(self.DATA_DIR, "transfers.csv")
 
+    def store_inventory_file_path(self, store: str):
+        return os.path.join(self.STORES_DIR, store, "inventory.csv")
+
+    def supplier_orders_file_path(self):
+        return os.path.join(self.DATA_DIR, "supplier_orders.csv")
+
+    def consumption_file_path(self):
+        return os.path.join(self.DATA_DIR, "consumption.csv")
+
+    def drivers_file_path(self):
+        return os.path.join(self.DRIVERS_DIR, "drivers.csv")
+
+    def sentiment_file_path(self):
+        return os.path.join(self.SENTIMENT_DIR, "sentiment.csv")
+
+    def reviews_file_path(self):
+        return os.path.join(self.SENTIMENT_DIR, "reviews.csv")
+
 settings = Settings()
+
+# ✅ Make the project-level packages (realtime_pipeline/, models/) importable from the backend
+if settings.BASE_DIR not in sys.path:
+    sys.path.append(settings.BASE_DIR)
@@ -1,5 +1,12 @@
+import sys
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from app.utils import metrics
+from app.utils.request_timing import TimingMiddleware
 
 # ✅ Import route modules
 from app.routes import (
@@ -12,11 +19,26 @@ from app.routes import (
     weather,
     incidents,
     voice,
+    stream,
+    stores,
     drivers  # ✅ New: driver CSV route
 )
 
+# ✅ Start-up stays short: fork the CPU workers, then load data and pipelines in the background
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.services.cpu_pool import cpu_pool
+    from app.services.warmup import start_warmup
+    pool_ready = cpu_pool.spawn()  # ✅ Fork before any other thread starts
+    app.state.warmup = start_warmup(pool_ready)
+    yield
+    cpu_pool.shutdown()
+    weather_service = sys.modules.get("app.services.weather_service")  # only if a request loaded it
+    if weather_service is not None:
+        await weather_service.weather_client.aclose()
+
 # ✅ Initialize app
-app = FastAPI(title="SmartStore Copilot")
+app = FastAPI(title="SmartStore Copilot", lifespan=lifespan)
 
 # ✅ Enable CORS for frontend (React or others)
 app.add_middleware(
@@ -27,6 +49,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ✅ Per-route latency histograms + opt-in profiling (X-Profile: 1 with PROFILING=1)
+app.add_middleware(TimingMiddleware)
+
 # ✅ Register route modules with prefixes
 app.include_router(inventory.router, prefix="/api/inventory", tags=["Inventory"])
 app.include_router(inventory_add.router, prefix="/api/inventory", tags=["Inventory Add"])
@@ -38,8 +63,32 @@ app.include_router(chatbot.router, prefix="/api/chatbot", tags=["Chatbot"])
 app.include_router(weather.router, prefix="/api/weather", tags=["Weather"])
 app.include_router(incidents.router, prefix="/api/incidents", tags=["Incidents"])
 app.include_router(voice.router, prefix="/api/voice", tags=["Voice Assistant"])
+app.include_router(stream.router, prefix="/api/stream", tags=["Live Stream"])
+app.include_router(stores.router, prefix="/api/stores", tags=["Stores"])
 
 # ✅ Root health check
 @app.get("/")
 def root():
     return {"message": "SmartStore Copilot API is running ✅"}
+
+# ✅ Readiness: 200 once the background warm-up has finished, 503 until then
+@app.get("/ready")
+def ready():
+    warmup = getattr(app.state, "warmup", None)
+    if warmup is None:
+        return JSONResponse(status_code=503, content={"status": "error", "ready": False, "message": "Not started."})
+    status = warmup.status()
+    if not status["ready"]:
+        return JSONResponse(status_code=503, content={"status": "error", **status})
+    return {"status": "success", **status}
+
+# ✅ Prometheus scrape endpoint (per process)
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# ✅ Worker pool for CPU-bound handlers: queue depth, wait/run times, rejections
+@app.get("/api/pool")
+def pool_stats():
+    from app.services.cpu_pool import cpu_pool
+    return {"status": "success", **cpu_pool.stats()}
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Request
-from app.services.csv_qa import answer_from_csv
+from fastapi.responses import JSONResponse
+from app.services.cpu_pool import DeadlineExceeded, Overloaded
+from app.services.csv_qa import ask
 from datetime import datetime
 import traceback
 
@@ -18,8 +20,23 @@ async def ask_bot(request: Request):
                 "status": "error"
             }
 
-        # ✅ Only CSV-based logic is used
-        answer = answer_from_csv(question)
+        # ✅ Only CSV-based logic is used; "search": "vector" switches to nearest-neighbour retrieval
+        # ✅ "page" picks the page of a full-list answer; searches run on the bounded worker pool
+        try:
+            answer = await ask(question, data.get("search"), data.get("page"))
+        except Overloaded as e:
+            return JSONResponse(
+                status_code=503,
+                headers={"Retry-After": str(e.retry_after)},
+                content={"question": question, "answer": "⚠️ The assistant is busy, please try again shortly.",
+                         "status": "error", "error": str(e)}
+            )
+        except DeadlineExceeded as e:
+            return JSONResponse(
+                status_code=504,
+                content={"question": question, "answer": "⚠️ That took too long, please try a narrower question.",
+                         "status": "error", "error": str(e)}
+            )
 
         return {
             "question": question,
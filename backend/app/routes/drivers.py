@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException
+import time
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
-from typing import List
-import csv
-import os
+from typing import List, Optional, Union
+from app.services.driver_risk_service import get_driver_risks, get_risk_engine
+from app.services.incident_store import apply_incident_counts, get_incident_store, iter_with_incident_counts
+from app.services.row_codec import DRIVER_SCHEMA, RowDecodeError, decode_page, decoded_rows, encoded_body
+from app.services.storage import get_storage
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor, parse_fields, prime, stream_rows
 
 router = APIRouter()
 
@@ -24,40 +29,122 @@ class Driver(BaseModel):
     riskLevel: str
     avatar: str = ""
 
-# ✅ Correct CSV path (absolute)
-CSV_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../data/driver/drivers.csv"))
-print("📂 Using drivers.csv path:", CSV_FILE)
+# ✅ Read drivers from the configured store (data/drivers/drivers.csv or its SQLite table)
+def read_drivers_from_csv() -> List[dict]:
+    """Driver rows decoded once per data version; each dict already matches ``Driver``.
 
-# ✅ Read CSV utility
-def read_drivers_from_csv() -> List[Driver]:
-    drivers = []
-    if not os.path.exists(CSV_FILE):
+    ``incidents`` comes from the incident store for every driver it has incidents for.
+    """
+    store = get_storage()
+    if not store.exists("drivers"):
         raise HTTPException(status_code=500, detail="Driver CSV file not found")
-    with open(CSV_FILE, mode="r", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            drivers.append(
-                Driver(
-                    id=row["id"],
-                    name=row["name"],
-                    email=row["email"],
-                    phone=row["phone"],
-                    status=row["status"],
-                    location=row["location"],
-                    vehicle=row["vehicle"],
-                    safetyScore=int(row["safetyScore"]),
-                    deliveries=int(row["deliveries"]),
-                    incidents=int(row["incidents"]),
-                    lastActive=row["lastActive"],
-                    joinDate=row["joinDate"],
-                    certifications=row["certifications"].split(";") if row["certifications"] else [],
-                    riskLevel=row["riskLevel"],
-                    avatar=row.get("avatar", ""),
-                )
-            )
-    return drivers
+    return apply_incident_counts(decoded_rows("drivers", DRIVER_SCHEMA))
+
+class DriverPage(BaseModel):
+    status: str
+    drivers: List[dict]
+    count: int
+    nextCursor: Optional[str] = None
 
 # ✅ API endpoint
-@router.get("/", response_model=List[Driver])
-def get_all_drivers():
-    return read_drivers_from_csv()
+@router.get("/", response_model=Union[List[Driver], DriverPage])
+def get_all_drivers(
+    status: str = Query(None, description="Filter: active, inactive, ..."),
+    riskLevel: str = Query(None, description="Filter: low, medium, high"),
+    location: str = Query(None),
+    fields: str = Query(None, description="Comma-separated columns to return"),
+    sort: str = Query(None, description="id, name, safetyScore or incidents"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: str = Query(None, description="nextCursor of the previous page"),
+    limit: int = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for the full list"),
+):
+    """Driver profiles as stored, with live incident counts.
+
+    ``safetyScore`` and ``riskLevel`` are the static profile values (the ones the
+    ``riskLevel`` filter and ``safetyScore`` sort use); ``/api/drivers/risk``
+    has the values the risk engine computes from decayed incident history.
+    """
+    # ✅ Paginated / filtered / projected page when any list option is given
+    filters = {k: v for k, v in {"status": status, "riskLevel": riskLevel, "location": location}.items() if v}
+    if filters or fields or sort or cursor or limit:
+        store = get_storage()
+        if not store.exists("drivers"):
+            raise HTTPException(status_code=500, detail="Driver CSV file not found")
+        try:
+            rows, next_cursor = store.query(
+                "drivers", filters, parse_fields(fields), sort, order == "desc", decode_cursor(cursor), limit or 100,
+            )
+            # ✅ Same types as the full list, whichever store served the page
+            rows = apply_incident_counts(decode_page(rows, DRIVER_SCHEMA, parse_fields(fields)))
+        except RowDecodeError as e:
+            return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"status": "error", "message": str(e)})
+        return {"status": "success", "drivers": rows, "count": len(rows), "nextCursor": encode_cursor(next_cursor)}
+
+    # ✅ Rows are decoded once and the JSON body encoded once per data version; no per-row re-validation
+    try:
+        body = encoded_body("drivers", "drivers_body", read_drivers_from_csv, get_incident_store().version())
+    except RowDecodeError as e:
+        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+    return Response(content=body, media_type="application/json")
+
+@router.get("/export")
+def export_drivers(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: str = Query(None),
+    riskLevel: str = Query(None),
+    location: str = Query(None),
+    fields: str = Query(None, description="Comma-separated columns to export"),
+):
+    # ✅ Streamed row by row from the store, so memory stays flat whatever the table size
+    store = get_storage()
+    if not store.exists("drivers"):
+        return JSONResponse(status_code=404, content={"status": "error", "message": "Drivers not found."})
+    filters = {k: v for k, v in {"status": status, "riskLevel": riskLevel, "location": location}.items() if v}
+    try:
+        rows = prime(store.iter_rows("drivers", filters, parse_fields(fields)))
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"status": "error", "message": str(e)})
+    return stream_rows(iter_with_incident_counts(rows), format, "drivers", parse_fields(fields))
+
+class DeliveryEvent(BaseModel):
+    driverId: str
+    count: int = 1
+    timestamp: Optional[float] = None  # epoch seconds; defaults to now
+
+# ✅ Every driver with safetyScore / riskLevel computed from decayed incident and delivery history
+# (the live counterpart of the static profile values in /api/drivers/)
+@router.get("/risk")
+def get_risks():
+    result = get_driver_risks()
+    if result["status"] != "success":
+        return JSONResponse(status_code=404, content=result)
+    return result
+
+# ✅ The N riskiest drivers, read off the engine's heap
+@router.get("/risk/top")
+def get_top_risks(limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE)):
+    try:
+        drivers = get_risk_engine().top(limit)
+    except FileNotFoundError:
+        return JSONResponse(status_code=404, content={"status": "error", "message": "Drivers not found."})
+    return {"status": "success", "drivers": drivers, "count": len(drivers)}
+
+@router.get("/risk/{driver_id}")
+def get_driver_risk(driver_id: str):
+    try:
+        score = get_risk_engine().score(driver_id)
+    except FileNotFoundError:
+        score = None
+    if score is None:
+        return JSONResponse(status_code=404, content={"status": "error", "message": f"Driver {driver_id} not found."})
+    return {"status": "success", "driver": score}
+
+# ✅ Completed deliveries, logged next to incidents so every worker's risk engine picks them up
+@router.post("/deliveries")
+def record_deliveries(event: DeliveryEvent):
+    if event.count < 1:
+        return JSONResponse(status_code=400, content={"status": "error", "message": "count must be at least 1."})
+    get_incident_store().record_deliveries(event.driverId, event.count, event.timestamp or time.time())
+    return get_driver_risk(event.driverId)
@@ -1,13 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List
-import uuid
+from app.services.incident_store import get_incident_store
 
 router = APIRouter()
 
-# Mock DB
-incidents = []
-
 # Incident model
 class Incident(BaseModel):
     id: str
@@ -20,22 +18,46 @@ class Incident(BaseModel):
     status: str  # "reported", "investigating", "resolved"
     location: str
 
-# ✅ GET all incidents
+# ✅ GET incidents, optionally filtered (each filter is an indexed column)
 @router.get("/", response_model=List[Incident])
-def get_all_incidents():
-    return incidents
+def get_all_incidents(
+    driverId: str = Query(None),
+    status: str = Query(None, description="reported, investigating or resolved"),
+    severity: str = Query(None, description="minor, moderate or severe"),
+    limit: int = Query(None, ge=1),
+):
+    return get_incident_store().list(driverId, status, severity, limit)
 
 # ✅ POST add new incident
 @router.post("/", response_model=Incident)
 def create_incident(incident: Incident):
-    incidents.append(incident)
+    if not get_incident_store().add(incident.model_dump()):
+        return JSONResponse(status_code=409, content={"status": "error", "message": f"Incident {incident.id} already exists."})
+    return incident
+
+# ✅ POST many incidents in one transaction (existing ids are replaced)
+@router.post("/bulk")
+def create_incidents(incidents: List[Incident]):
+    count = get_incident_store().add_many([incident.model_dump() for incident in incidents])
+    return {"status": "success", "count": count}
+
+# ✅ Per-driver incident counts (total, open and by severity)
+@router.get("/counts")
+def get_incident_counts(driverId: str = Query(None)):
+    return {"status": "success", "counts": get_incident_store().counts_by_driver(driverId)}
+
+# ✅ GET one incident by id
+@router.get("/{incident_id}", response_model=Incident)
+def get_incident(incident_id: str):
+    incident = get_incident_store().get(incident_id)
+    if incident is None:
+        raise HTTPException(status_code=404, detail="Incident not found")
     return incident
 
 # ✅ PATCH to update status (e.g., mark resolved)
 @router.patch("/{incident_id}/resolve", response_model=Incident)
 def resolve_incident(incident_id: str):
-    for incident in incidents:
-        if incident["id"] == incident_id:
-            incident["status"] = "resolved"
-            return incident
-    raise HTTPException(status_code=404, detail="Incident not found")
+    incident = get_incident_store().set_status(incident_id, "resolved")
+    if incident is None:
+        raise HTTPException(status_code=404, detail="Incident not found")
+    return incident
@@ -1,20 +1,43 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Query
 from app.config import settings
+from app.services import transfer_planner
+from app.services.data_store import data_store
+from app.services.row_codec import (
+    INVENTORY_SCHEMA, TRANSFER_SCHEMA, RowDecodeError, decode_frame, decode_page, encoded_body,
+)
+from app.services.storage import get_storage
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor, parse_fields, prime, stream_rows
+import logging
 import os
-import csv
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.get("/status")
-def get_inventory_status():
+def get_inventory_status(
+    status: str = Query(None, description="Filter: in-stock, low-stock, out-of-stock"),
+    category: str = Query(None),
+    location: str = Query(None),
+    fields: str = Query(None, description="Comma-separated columns to return"),
+    sort: str = Query(None, description="id, sku, name, currentStock or price"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: str = Query(None, description="nextCursor of the previous page"),
+    limit: int = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for the full list"),
+):
+    """Inventory rows typed by ``INVENTORY_SCHEMA``: stock columns and ``leadTime`` are ints, ``price`` a float.
+
+    The full list, every page and ``/lookup`` share this shape on both backends.
+    """
     inventory_file = settings.inventory_file_path()
     full_path = os.path.abspath(inventory_file)
+    store = get_storage()
     
-    print("📦 Checking inventory at:", full_path)
+    logger.debug("📦 Checking inventory at: %s", full_path if store.name == "csv" else settings.SQLITE_PATH)
 
-    if not os.path.exists(full_path):
-        print("❌ Inventory file not found at:", full_path)
+    if not store.exists("inventory"):
+        logger.warning("❌ Inventory file not found at: %s", full_path)
         return JSONResponse(
             status_code=404,
             content={
@@ -24,37 +47,51 @@ def get_inventory_status():
             }
         )
 
-    inventory = []
     try:
-        with open(full_path, mode="r", newline="", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            expected_headers = [
-                "id", "name", "sku", "category", "currentStock",
-                "minStock", "maxStock", "reorderPoint", "reorderQuantity",
-                "location", "status", "price", "supplier", "supplierContact", "leadTime"
-            ]
-
-            missing_headers = [h for h in expected_headers if h not in reader.fieldnames]
-            if missing_headers:
-                return JSONResponse(
-                    status_code=400,
-                    content={
-                        "status": "error",
-                        "message": f"Missing headers in CSV: {', '.join(missing_headers)}",
-                        "inventory": []
-                    }
-                )
-
-            for row in reader:
-                inventory.append(row)
+        # ✅ Served from the configured store; CSV is only re-parsed when the file changes
+        fieldnames = store.fieldnames("inventory")
+        expected_headers = [
+            "id", "name", "sku", "category", "currentStock",
+            "minStock", "maxStock", "reorderPoint", "reorderQuantity",
+            "location", "status", "price", "supplier", "supplierContact", "leadTime"
+        ]
+
+        missing_headers = [h for h in expected_headers if h not in fieldnames]
+        if missing_headers:
+            return JSONResponse(
+                status_code=400,
+                content={
+                    "status": "error",
+                    "message": f"Missing headers in CSV: {', '.join(missing_headers)}",
+                    "inventory": []
+                }
+            )
 
-        return {
+        # ✅ Paginated / filtered / projected page when any list option is given
+        filters = {k: v for k, v in {"status": status, "category": category, "location": location}.items() if v}
+        if filters or fields or sort or cursor or limit:
+            try:
+                rows, next_cursor = store.query(
+                    "inventory", filters, parse_fields(fields), sort, order == "desc",
+                    decode_cursor(cursor), limit or 100,
+                )
+                # ✅ Same types as the full list, whichever store served the page
+                rows = decode_page(rows, INVENTORY_SCHEMA, parse_fields(fields))
+            except RowDecodeError as e:
+                return JSONResponse(status_code=500, content={"status": "error", "message": str(e), "inventory": []})
+            except ValueError as e:
+                return JSONResponse(status_code=400, content={"status": "error", "message": str(e), "inventory": []})
+            return {"status": "success", "inventory": rows, "count": len(rows), "nextCursor": encode_cursor(next_cursor)}
+
+        # ✅ Typed rows from the shared codec, encoded once per file version; only the body is kept
+        body = encoded_body("inventory", "status_body", lambda: {
             "status": "success",
-            "inventory": inventory
-        }
+            "inventory": decode_frame(store.raw_frame("inventory"), INVENTORY_SCHEMA)
+        })
+        return Response(content=body, media_type="application/json")
 
     except Exception as e:
-        print("⚠️ Error reading inventory file:", str(e))
+        logger.exception("⚠️ Error reading inventory file: %s", e)
         return JSONResponse(
             status_code=500,
             content={
@@ -66,47 +103,80 @@ def get_inventory_status():
         )
 
 
-@router.post("/add")
-async def add_inventory_item(request: Request):
+@router.get("/lookup")
+def lookup_inventory_item(
+    id: str = Query(None, description="Item id"),
+    sku: str = Query(None, description="Item SKU"),
+):
+    # ✅ Point lookup: an index probe in SQLite, a cached hash lookup on CSV
+    if not id and not sku:
+        return JSONResponse(status_code=422, content={"status": "error", "message": "Pass id or sku."})
+    store = get_storage()
+    if not store.exists("inventory"):
+        return JSONResponse(status_code=404, content={"status": "error", "message": "Inventory not found."})
+    column, value = ("id", id) if id else ("sku", sku)
+    items = store.find("inventory", column, value)
+    if not items:
+        return JSONResponse(status_code=404, content={"status": "error", "message": f"No item with {column} {value}."})
     try:
-        item = await request.json()
-        inventory_file = settings.inventory_file_path()
-        full_path = os.path.abspath(inventory_file)
-
-        if not os.path.exists(full_path):
-            raise HTTPException(status_code=404, detail="Inventory file not found.")
-
-        with open(full_path, mode="r", newline="", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            fieldnames = reader.fieldnames
-
-        # Ensure all required fields are present
-        missing = [field for field in fieldnames if field not in item]
-        if missing:
-            return JSONResponse(
-                status_code=400,
-                content={
-                    "status": "error",
-                    "message": f"Missing fields: {', '.join(missing)}"
-                }
-            )
-
-        with open(full_path, mode="a", newline="", encoding="utf-8") as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writerow(item)
-
-        return {
-            "status": "success",
-            "message": "Inventory item added successfully.",
-            "item": item
-        }
-
+        item = decode_page(items[-1:], INVENTORY_SCHEMA)[0]
+    except RowDecodeError as e:
+        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+    return {"status": "success", "item": item}
+
+
+@router.get("/export")
+def export_inventory(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: str = Query(None),
+    category: str = Query(None),
+    location: str = Query(None),
+    fields: str = Query(None, description="Comma-separated columns to export"),
+):
+    # ✅ Streamed row by row from the store, so memory stays flat whatever the table size
+    store = get_storage()
+    if not store.exists("inventory"):
+        return JSONResponse(status_code=404, content={"status": "error", "message": "Inventory not found."})
+    filters = {k: v for k, v in {"status": status, "category": category, "location": location}.items() if v}
+    try:
+        rows = prime(store.iter_rows("inventory", filters, parse_fields(fields)))
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"status": "error", "message": str(e)})
+    return stream_rows(rows, format, "inventory", parse_fields(fields))
+
+# ✅ Inter-location transfer plan, saved to transfers.csv
+@router.post("/transfers/plan")
+def create_transfer_plan(
+    persist: bool = Query(True, description="Write the plan to transfers.csv"),
+    limit: int = Query(100, ge=0, le=MAX_PAGE_SIZE, description="Transfers to return"),
+):
+    try:
+        plan = transfer_planner.current_plan()
+        path = transfer_planner.save_plan(plan) if persist else None
     except Exception as e:
-        return JSONResponse(
-            status_code=500,
-            content={
-                "status": "error",
-                "message": "Failed to add inventory item.",
-                "details": str(e)
-            }
-        )
+        logger.exception("⚠️ Error planning transfers: %s", e)
+        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+    return {
+        "status": "success",
+        "summary": transfer_planner.plan_summary(plan),
+        "file": path,
+        "transfers": decode_frame(plan.head(limit), TRANSFER_SCHEMA),
+    }
+
+# ✅ The saved plan
+@router.get("/transfers/plan")
+def get_transfer_plan(
+    location: str = Query(None, description="Only transfers from or to this location"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+):
+    path = settings.transfers_file_path()
+    if not os.path.exists(path):
+        return JSONResponse(status_code=404, content={"status": "error", "message": "No transfer plan yet.", "transfers": []})
+    rows = data_store.get(path).raw
+    if "status" in rows:
+        rows = rows[rows["status"] == transfer_planner.PLANNED]
+    if location:
+        rows = rows[(rows["fromLocation"] == location) | (rows["toLocation"] == location)]
+    # ✅ Decoded like the POST response, so both return numbers for quantities, days and costs
+    return {"status": "success", "total": int(len(rows)), "transfers": decode_frame(rows.iloc[offset:offset + limit], TRANSFER_SCHEMA)}
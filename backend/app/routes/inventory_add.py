@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from app.services.inventory_service import add_inventory_item  # 👈 tu is file ko kahin aur rakh raha ho
-import os
+from app.services.inventory_service import (
+    InventoryValidationError,
+    add_inventory_items,
+    compact_inventory,
+)
 
 router = APIRouter()
 
@@ -10,28 +14,72 @@ async def add_item_to_inventory(request: Request):
     try:
         item_data = await request.json()
 
-        # 🧠 Call your helper function
-        result = add_inventory_item(item_data)
+        # 🧠 Validated, lock-protected append (no full-file rewrite), off the event loop
+        await run_in_threadpool(add_inventory_items, [item_data])
 
-        # 🔁 If result starts with ❌, return error
-        if result.startswith("❌"):
+        return {
+            "status": "success",
+            "message": "✅ Item added successfully to inventory.",
+            "item": item_data
+        }
+
+    except InventoryValidationError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "message": f"❌ {e}", "errors": e.errors}
+        )
+
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": "🚨 Server error while adding item.",
+                "details": str(e)
+            }
+        )
+
+@router.post("/add/batch")
+async def add_items_to_inventory(request: Request):
+    try:
+        payload = await request.json()
+        items = payload.get("items") if isinstance(payload, dict) else payload
+
+        if not isinstance(items, list):
             return JSONResponse(
                 status_code=400,
-                content={"status": "error", "message": result}
+                content={"status": "error", "message": "❌ Expected a JSON list of items or {\"items\": [...]}."}
             )
 
+        # ✅ All items are validated first; nothing is written if any of them is invalid
+        count = await run_in_threadpool(add_inventory_items, items)
+
         return {
             "status": "success",
-            "message": result,
-            "item": item_data
+            "message": f"✅ {count} items added successfully to inventory.",
+            "count": count
         }
 
+    except InventoryValidationError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "message": "❌ Batch rejected, no items were added.", "errors": e.errors}
+        )
+
     except Exception as e:
         return JSONResponse(
             status_code=500,
             content={
                 "status": "error",
-                "message": "🚨 Server error while adding item.",
+                "message": "🚨 Server error while adding items.",
                 "details": str(e)
             }
         )
+
+@router.post("/compact")
+def compact():
+    try:
+        rows = compact_inventory()
+        return {"status": "success", "message": f"✅ Inventory compacted to {rows} rows.", "rows": rows}
+    except FileNotFoundError:
+        return JSONResponse(status_code=404, content={"status": "error", "message": "Inventory file not found."})
@@ -1,9 +1,16 @@
-from fastapi import APIRouter
-from typing import List
-import csv
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse, Response
+from typing import List, Optional, Union
 import os
+import numpy as np
 from pydantic import BaseModel
 from app.config import settings
+from app.services.auto_reorder_service import auto_reorder_status
+from app.services.data_store import data_store
+from app.services.row_codec import REORDER_SCHEMA, RowDecodeError, decode_frame, decode_page, encoded_body
+from app.services.storage import get_storage
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor, parse_fields, prime, stream_rows
+from models.refill_predictor import predict_reorders, URGENCY_ORDER
 
 router = APIRouter()
 
@@ -20,30 +27,113 @@ class Reorder(BaseModel):
     status: str
     notes: str
 
-@router.get("/list", response_model=List[Reorder])
-def get_reorders():
-    filepath = os.path.join(settings.DATA_DIR, "reorders.csv")  # Corrected path
-    
-    reorders = []
+class ReorderPage(BaseModel):
+    status: str
+    reorders: List[dict]
+    count: int
+    nextCursor: Optional[str] = None
+
+@router.get("/list", response_model=Union[List[Reorder], ReorderPage])
+def get_reorders(
+    status: str = Query(None, description="Filter: pending, approved, delivered, ..."),
+    urgency: str = Query(None, description="Filter: critical, high, medium, low"),
+    supplier: str = Query(None),
+    fields: str = Query(None, description="Comma-separated columns to return"),
+    sort: str = Query(None, description="id, requestedDate, urgency, estimatedCost or quantity"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    cursor: str = Query(None, description="nextCursor of the previous page"),
+    limit: int = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for the full list"),
+):
+    filepath = settings.reorders_file_path()
+
+    # ✅ Paginated / filtered / projected page when any list option is given
+    filters = {k: v for k, v in {"status": status, "urgency": urgency, "supplier": supplier}.items() if v}
+    if filters or fields or sort or cursor or limit:
+        try:
+            rows, next_cursor = get_storage().query(
+                "reorders", filters, parse_fields(fields), sort, order == "desc", decode_cursor(cursor), limit or 100,
+            )
+            # ✅ Same types as the full list, whichever store served the page
+            rows = decode_page(rows, REORDER_SCHEMA, parse_fields(fields))
+        except FileNotFoundError:
+            return JSONResponse(status_code=404, content={"status": "error", "message": f"Reorders file not found at {filepath}"})
+        except RowDecodeError as e:
+            return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"status": "error", "message": str(e)})
+        return {"status": "success", "reorders": rows, "count": len(rows), "nextCursor": encode_cursor(next_cursor)}
+
     try:
-        with open(filepath, newline="", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                reorders.append(Reorder(
-                    id=row["id"],
-                    itemId=row["itemId"],
-                    itemName=row["itemName"],
-                    supplier=row["supplier"],
-                    quantity=int(row["quantity"]),
-                    estimatedCost=float(row["estimatedCost"]),
-                    urgency=row["urgency"],
-                    requestedBy=row["requestedBy"],
-                    requestedDate=row["requestedDate"],
-                    status=row["status"],
-                    notes=row["notes"]
-                ))
-        return reorders
+        # ✅ Decoded and encoded once per data version, only the body is kept; no per-row model construction
+        store = get_storage()
+        body = encoded_body("reorders", "reorders_body", lambda: decode_frame(store.raw_frame("reorders"), REORDER_SCHEMA))
+        return Response(content=body, media_type="application/json")
     except FileNotFoundError:
         return {"status": "error", "message": f"Reorders file not found at {filepath}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
+
+
+@router.get("/export")
+def export_reorders(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: str = Query(None),
+    urgency: str = Query(None),
+    supplier: str = Query(None),
+    fields: str = Query(None, description="Comma-separated columns to export"),
+):
+    # ✅ Streamed row by row from the store, so memory stays flat whatever the table size
+    store = get_storage()
+    if not store.exists("reorders"):
+        return JSONResponse(status_code=404, content={"status": "error", "message": "Reorders not found."})
+    filters = {k: v for k, v in {"status": status, "urgency": urgency, "supplier": supplier}.items() if v}
+    try:
+        rows = prime(store.iter_rows("reorders", filters, parse_fields(fields)))
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"status": "error", "message": str(e)})
+    return stream_rows(rows, format, "reorders", parse_fields(fields))
+
+
+@router.get("/auto")
+def get_auto_reorder_status():
+    # ✅ Counters of the auto-reorder stage and its latest per-supplier orders
+    return auto_reorder_status()
+
+
+def _suggestions_frame(inventory, consumption):
+    scores = predict_reorders(inventory.frame, consumption.frame if consumption is not None else None)
+    for column in ["id", "name", "supplier", "location"]:
+        if column in inventory.raw:
+            scores[column] = inventory.raw[column].to_numpy()
+    for column in ["reorderPoint", "leadTime"]:
+        if column in inventory.frame:
+            scores[column] = inventory.frame[column].to_numpy()
+    scores["daysToStockout"] = scores["daysToStockout"].replace(np.inf, np.nan)
+    scores["urgencyRank"] = scores["urgency"].map({u: i for i, u in enumerate(URGENCY_ORDER)})
+    return scores.sort_values(["urgencyRank", "daysToStockout"], kind="stable", na_position="last").drop(columns="urgencyRank")
+
+@router.get("/suggestions")
+def get_reorder_suggestions(
+    all_items: bool = Query(False, description="Include SKUs that do not need a reorder"),
+    limit: int = Query(100, ge=1, le=10000),
+):
+    try:
+        inventory = data_store.get(settings.inventory_file_path())
+        consumption_path = settings.consumption_file_path()
+        consumption = data_store.get(consumption_path) if os.path.exists(consumption_path) else None
+
+        # ✅ All SKUs scored in one vectorized pass, once per inventory/consumption version
+        key = f"reorder_suggestions:{consumption.version if consumption is not None else 0}"
+        scores = inventory.derive(key, lambda: _suggestions_frame(inventory, consumption))
+
+        selected = scores if all_items else scores[scores["reorder"]]
+        rows = selected.head(limit).astype(object).where(selected.head(limit).notna(), None)
+        return {
+            "status": "success",
+            "total": int(len(selected)),
+            "suggestions": rows.to_dict("records"),
+        }
+    except FileNotFoundError:
+        return JSONResponse(status_code=404, content={"status": "error", "message": "Inventory file not found."})
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
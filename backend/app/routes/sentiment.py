@@ -1,8 +1,55 @@
-from fastapi import APIRouter
-from app.services.sentiment_service import analyze_sentiment
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from typing import List
+import json
+from app.services.cpu_pool import cpu_pool
+from app.services.sentiment_service import analyze_sentiment, ingest_reviews, sentiment_classifier
 
 router = APIRouter()
 
+MAX_REVIEWS = 100_000
+
+class ClassifyRequest(BaseModel):
+    reviews: List[str]
+
 @router.get("/reviews")
 def get_sentiment():
     return analyze_sentiment()
+
+@router.post("/reviews")
+def post_reviews(body: ClassifyRequest):
+    # ✅ Queued for the streaming stage; they show up in GET /reviews after the next micro-batch
+    if len(body.reviews) > MAX_REVIEWS:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "message": f"At most {MAX_REVIEWS} reviews per request."}
+        )
+    return {"status": "success", "queued": ingest_reviews(body.reviews)}
+
+@router.post("/classify")
+def classify_reviews(body: ClassifyRequest, stream: bool = Query(True, description="Stream NDJSON results as chunks finish")):
+    if len(body.reviews) > MAX_REVIEWS:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "message": f"At most {MAX_REVIEWS} reviews per request."}
+        )
+    # ✅ Shed load up front while the shared worker pool is saturated
+    if not cpu_pool.admitting():
+        retry_after = cpu_pool.retry_after()
+        return JSONResponse(
+            status_code=503,
+            headers={"Retry-After": str(retry_after)},
+            content={"status": "error", "message": f"Classifier is busy, retry after {retry_after}s."}
+        )
+
+    if not stream:
+        results = sentiment_classifier.classify_all(body.reviews)
+        return {"status": "success", "count": len(results), "results": results}
+
+    # ✅ One JSON object per line, sent as soon as its chunk is classified
+    def ndjson():
+        for chunk in sentiment_classifier.classify(body.reviews):
+            yield "".join(json.dumps(result) + "\n" for result in chunk)
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
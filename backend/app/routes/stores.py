@@ -0,0 +1,76 @@
+import pandas as pd
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+from app.services import transfer_planner
+from app.services.row_codec import INVENTORY_SCHEMA, RowDecodeError, decode_frame
+from app.services.store_shards import store_shards
+from app.utils.pagination import MAX_PAGE_SIZE
+
+router = APIRouter()
+
+def _page(frame, offset: int, limit: int) -> list:
+    rows = frame.iloc[offset:offset + limit]
+    return rows.astype(object).where(rows.notna(), None).to_dict("records")
+
+# ✅ Stores (inventory shards) and their current row counts
+@router.get("/")
+def list_stores():
+    snapshots = store_shards.snapshots()
+    return {
+        "status": "success",
+        "stores": [{"store": store, "items": len(snapshot), "version": snapshot.version} for store, snapshot in snapshots.items()],
+    }
+
+# ✅ Total stock per SKU across every store
+@router.get("/stock")
+def get_stock_by_sku(
+    sku: str = Query(None),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+):
+    totals = store_shards.stock_by_sku()
+    if sku:
+        totals = totals[totals["sku"] == sku]
+    return {"status": "success", "total": int(len(totals)), "stock": _page(totals, offset, limit)}
+
+# ✅ Transfers between stores: the current plan, same rules as POST /api/inventory/transfers/plan
+@router.get("/transfers")
+def get_transfer_suggestions(
+    sku: str = Query(None),
+    store: str = Query(None, description="Only transfers from or to this store"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+):
+    plan = transfer_planner.current_plan()
+    transfers = pd.DataFrame({
+        "sku": plan["sku"], "name": plan["name"],
+        "fromStore": plan["fromLocation"], "toStore": plan["toLocation"], "quantity": plan["quantity"],
+    })
+    if sku:
+        transfers = transfers[transfers["sku"] == sku]
+    if store:
+        transfers = transfers[(transfers["fromStore"] == store) | (transfers["toStore"] == store)]
+    return {
+        "status": "success",
+        "total": int(len(transfers)),
+        "units": int(transfers["quantity"].sum()) if len(transfers) else 0,
+        "transfers": _page(transfers, offset, limit),
+    }
+
+# ✅ One store's inventory
+@router.get("/{store}/inventory")
+def get_store_inventory(
+    store: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+):
+    try:
+        snapshot = store_shards.snapshot(store)
+    except (ValueError, FileNotFoundError):
+        return JSONResponse(status_code=404, content={"status": "error", "message": f"Store {store} not found."})
+    # ✅ Same typed rows as /api/inventory/status, decoded once per shard version
+    try:
+        rows = snapshot.derive("decoded_rows", lambda: decode_frame(snapshot.raw, INVENTORY_SCHEMA))
+    except RowDecodeError as e:
+        return JSONResponse(status_code=500, content={"status": "error", "message": f"Store {store}: {e}"})
+    return {"status": "success", "store": store, "total": len(snapshot), "inventory": rows[offset:offset + limit]}
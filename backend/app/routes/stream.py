@@ -0,0 +1,37 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from app.services.live_feed import LiveFeed, inventory_feed, drivers_feed
+
+router = APIRouter()
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# ✅ Server-Sent Events: one snapshot, then incremental added/changed/removed diffs
+async def _sse(feed: LiveFeed):
+    async for message in feed.messages():
+        yield b": keep-alive\n\n" if message is None else message.sse
+
+async def _websocket(feed: LiveFeed, websocket: WebSocket):
+    await websocket.accept()
+    try:
+        async for message in feed.messages():
+            if message is not None:
+                await websocket.send_text(message.json)
+    except WebSocketDisconnect:
+        pass
+
+@router.get("/inventory")
+async def stream_inventory():
+    return StreamingResponse(_sse(inventory_feed), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@router.get("/drivers")
+async def stream_drivers():
+    return StreamingResponse(_sse(drivers_feed), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@router.websocket("/inventory/ws")
+async def stream_inventory_ws(websocket: WebSocket):
+    await _websocket(inventory_feed, websocket)
+
+@router.websocket("/drivers/ws")
+async def stream_drivers_ws(websocket: WebSocket):
+    await _websocket(drivers_feed, websocket)
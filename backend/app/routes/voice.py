@@ -1,7 +1,12 @@
 # app/routes/voice.py
+import json
+
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from app.services.voice_service import reply_chunks
+
 router = APIRouter()
 
 class VoiceCommand(BaseModel):
@@ -9,31 +14,15 @@ class VoiceCommand(BaseModel):
 
 @router.post("/command")
 async def handle_voice_command(data: VoiceCommand):
-    query = data.query.lower()
-
-    if "inventory" in query:
-        # Example hardcoded items with status
-        inventory_status = [
-            "Laptop Pro is in stock",
-            "Smartphone X is out of stock",
-            "Office Chair is in stock",
-            "Desk Lamp is in stock"
-        ]
-        
-        # Suggest reorder for out-of-stock items
-        reorder_suggestion = "Please reorder Smartphone X."
-
-        full_reply = (
-            "Here is your current inventory status: "
-            + ". ".join(inventory_status)
-            + ". "
-            + reorder_suggestion
-        )
-
-        return {"reply": full_reply}
-
-    elif "reorder" in query:
-        return {"reply": "Reorder request has been placed."}
-
-    else:
-        return {"reply": "Sorry, I didn’t understand that."}
+    # ✅ Live data: precomputed summaries for common commands, the chatbot engine for the rest
+    sentences = [sentence async for sentence in reply_chunks(data.query, acknowledge=False)]
+    return {"reply": " ".join(sentences)}
+
+async def _ndjson(chunks):
+    async for text in chunks:
+        yield json.dumps({"text": text}) + "\n"
+
+@router.post("/command/stream")
+async def stream_voice_command(data: VoiceCommand):
+    # ✅ One NDJSON line per sentence, so a TTS client can speak the first one right away
+    return StreamingResponse(_ndjson(reply_chunks(data.query)), media_type="application/x-ndjson")
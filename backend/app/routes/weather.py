@@ -1,8 +1,31 @@
 from fastapi import APIRouter, Query
-from app.services.weather_service import fetch_weather
+from fastapi.responses import JSONResponse
+from typing import Optional
 
 router = APIRouter()
 
+MAX_BATCH_CITIES = 50
+
+@router.get("")
 @router.get("/")
-def get_weather(city: str = Query(..., description="City name to check weather")):
-    return fetch_weather(city)
+async def get_weather(
+    city: Optional[str] = Query(None, description="City name to check weather"),
+    cities: Optional[str] = Query(None, description="Comma-separated city names, e.g. London,Paris"),
+):
+    # ✅ Imported on first use: the HTTP client stack isn't needed to boot the server
+    from app.services.weather_service import fetch_weather, fetch_weather_many
+
+    # ✅ Batch: /api/weather?cities=a,b,c (duplicates share one upstream call)
+    if cities:
+        names = [c.strip() for c in cities.split(",") if c.strip()]
+        if len(names) > MAX_BATCH_CITIES:
+            return JSONResponse(
+                status_code=400,
+                content={"status": "error", "message": f"At most {MAX_BATCH_CITIES} cities per request."}
+            )
+        return {"status": "success", "results": await fetch_weather_many(names)}
+
+    if not city:
+        return JSONResponse(status_code=422, content={"status": "error", "message": "Provide ?city= or ?cities="})
+
+    return await fetch_weather(city)
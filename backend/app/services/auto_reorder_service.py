@@ -0,0 +1,35 @@
+import os
+import threading
+
+from app.config import settings
+from app.services.storage import get_storage
+from realtime_pipeline.auto_reorder import AutoReorderStage
+
+# ✅ On by default; run it in one process only (e.g. AUTO_REORDER=0 on all but one worker)
+AUTO_REORDER = os.getenv("AUTO_REORDER", "1") == "1"
+
+_stage = None
+_stage_lock = threading.Lock()
+
+
+def get_auto_reorder() -> AutoReorderStage:
+    """The running stage, started on first use: inventory.csv deltas -> reorders.csv + supplier_orders.csv."""
+    global _stage
+    with _stage_lock:
+        if _stage is None:
+            # ✅ CSV stays the change log; the active store (e.g. SQLite) gets the same rows, under the same lock
+            stage = AutoReorderStage(settings.reorders_file_path(), settings.supplier_orders_file_path(),
+                                     mirror=lambda reorders: get_storage().upsert("reorders", reorders))
+            stage.start()
+            stage.follow_inventory(settings.inventory_file_path())
+            _stage = stage
+        return _stage
+
+
+def auto_reorder_status() -> dict:
+    if _stage is None:
+        return {"status": "success", "running": False, "enabled": AUTO_REORDER}
+    return {
+        "status": "success", "running": True, "enabled": AUTO_REORDER,
+        "stats": _stage.stats(), "recentOrders": _stage.recent_orders[-20:][::-1],
+    }
@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+
+class Subscription:
+    """One client's bounded message queue.
+
+    If the client falls ``max_queue`` messages behind, its backlog is dropped
+    and ``resync`` is set. The stream then sends a fresh snapshot instead of
+    buffering without limit.
+    """
+
+    def __init__(self, max_queue: int):
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.resync = False
+        self.dropped = 0
+
+    def offer(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize() + 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.resync = True
+            self.queue.put_nowait(None)  # wake the consumer so it can resync
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class Broadcaster:
+    """Fan-out of pre-encoded messages to many subscribers on one event loop.
+
+    ``publish`` may be called from any thread (e.g. the file-watcher thread).
+    Each message is encoded once and the same object is handed to every
+    subscriber, so the cost per subscriber is a single ``put_nowait``.
+    """
+
+    def __init__(self, max_queue: int = 64):
+        self.max_queue = max_queue
+        self.subscribers = set()
+        self.loop = None
+        self.published = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        if self.loop is None:
+            self.loop = loop
+
+    def subscribe(self) -> Subscription:
+        self.bind(asyncio.get_running_loop())
+        subscription = Subscription(self.max_queue)
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscribers.discard(subscription)
+
+    def _fanout(self, message):
+        self.published += 1
+        for subscription in list(self.subscribers):
+            subscription.offer(message)
+
+    def publish(self, message):
+        """Thread-safe: schedule ``message`` for every current subscriber."""
+        if self.loop is None or self.loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._fanout(message)
+        else:
+            self.loop.call_soon_threadsafe(self._fanout, message)
+
+
+def sse_event(event: str, payload: dict, event_id=None) -> bytes:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(payload, separators=(",", ":")))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import math
+import os
+import signal
+import statistics
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.config import settings
+from app.services.warmup import WARMUP
+from app.utils.metrics import Collected, Histogram
+
+CPU_POOL = os.getenv("CPU_POOL", "process")  # "process" keeps CPU-bound work off the server's GIL; "thread" for debugging
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(os.cpu_count() or 1)))
+CPU_QUEUE = int(os.getenv("CPU_QUEUE", str(4 * CPU_WORKERS)))  # jobs allowed to wait for a free worker
+CHATBOT_DEADLINE = float(os.getenv("CHATBOT_DEADLINE", "10"))  # seconds, queueing included
+
+logger = logging.getLogger(__name__)
+
+POOL_WAIT = Histogram("cpu_pool_wait_seconds", "Time a job waited for a free worker.")
+POOL_RUN = Histogram("cpu_pool_run_seconds", "Time a job ran on its worker.")
+
+
+class Overloaded(Exception):
+    """Every worker is busy and the queue is full; retry after ``retry_after`` seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"CPU pool is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def warm_worker(data_dir: str = None):
+    """Pool initializer: load the CSVs, search index and sentiment model once per worker, not per request."""
+    # ✅ Forked workers inherit the server's signal handlers; with them SIGTERM would never stop a worker
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if data_dir:
+        settings.DATA_DIR = data_dir
+    if not WARMUP:
+        return
+    from app.services import csv_qa
+    from models.sentiment_model import classify_batch
+
+    try:
+        csv_qa.get_search_index(csv_qa.inventory_snapshot())
+        csv_qa.reorders_snapshot()
+    except FileNotFoundError:
+        pass
+    classify_batch(["warm up"])
+
+
+def _call(fn, deadline, args):
+    # Runs in the worker: a job whose caller already gave up is dropped instead of computed
+    started = time.time()
+    if deadline is not None and started > deadline:
+        raise DeadlineExceeded("Deadline passed while the job was queued")
+    return started, fn(*args)
+
+
+def _percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return round(1000 * values[min(len(values) - 1, int(q * len(values)))], 2)
+
+
+class CpuPool:
+    """Bounded executor for CPU-bound handlers.
+
+    At most ``workers`` jobs run and ``max_queue`` more wait; beyond that
+    ``submit`` raises Overloaded right away (the route answers 503 with
+    Retry-After) instead of queueing without limit. Jobs carry a deadline:
+    the awaiting request stops waiting at its timeout and a job still
+    queued by then is skipped by the worker. Queue depth, wait and run
+    times are kept for ``stats``. If a worker dies the process pool is broken
+    for good, so it is replaced by a new one, warmed up again by ``warm_worker``.
+    """
+
+    def __init__(self, workers: int = CPU_WORKERS, max_queue: int = CPU_QUEUE, kind: str = CPU_POOL):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.kind = kind
+        self.in_flight = 0
+        self.counts = Counter()
+        self.waits = deque(maxlen=1000)
+        self.runs = deque(maxlen=1000)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers, initializer=warm_worker, initargs=(settings.DATA_DIR,))
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="cpu-pool")
+            return self._executor
+
+    def spawn(self) -> list:
+        """Fork every worker now; the returned futures finish once each one has warmed up.
+
+        Forking happens right here, so call it before the server starts other threads.
+        """
+        executor = self.executor()
+        if self.kind != "process":
+            return []
+        return [executor.submit(time.sleep, 0) for _ in range(self.workers)]
+
+    def start(self):
+        """Spawn and warm every worker now rather than on the first requests."""
+        for future in self.spawn():
+            future.result()
+        return self
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+    def _replace(self, broken):
+        """Drop the broken executor and spawn (and warm) a new one in the background."""
+        with self._lock:
+            if self._executor is not broken:
+                return  # already replaced
+            self._executor = None
+            self.counts["respawns"] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+        logger.error("💥 A CPU pool worker died; starting a new pool")
+        threading.Thread(target=self.spawn, name="cpu-pool-respawn", daemon=True).start()
+
+    def admitting(self) -> bool:
+        return self.in_flight < self.workers + self.max_queue
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained, from recent run times."""
+        with self._lock:
+            run = statistics.fmean(self.runs) if self.runs else 1.0
+            return max(1, math.ceil(run * self.in_flight / self.workers))
+
+    def _submit(self, fn, args: tuple, deadline: float = None) -> tuple:
+        with self._lock:
+            full = self.in_flight >= self.workers + self.max_queue
+            if full:
+                self.counts["rejected"] += 1
+            else:
+                self.in_flight += 1
+                self.counts["submitted"] += 1
+        if full:
+            raise Overloaded(self.retry_after())
+        submitted = time.time()
+        result = Future()
+        try:
+            executor = self.executor()
+            try:
+                job = executor.submit(_call, fn, deadline, args)
+            except BrokenProcessPool:
+                self._replace(executor)
+                executor = self.executor()
+                job = executor.submit(_call, fn, deadline, args)
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        job.add_done_callback(lambda job: self._done(job, result, submitted, executor))
+        return job, result
+
+    def _done(self, job: Future, result: Future, submitted: float, executor=None):
+        finished = time.time()
+        error = None if job.cancelled() else job.exception()
+        if isinstance(error, BrokenProcessPool):
+            self._replace(executor)
+        with self._lock:
+            self.in_flight -= 1
+            if job.cancelled():
+                self.counts["cancelled"] += 1
+            elif error is None:
+                started, value = job.result()
+                self.waits.append(started - submitted)
+                self.runs.append(finished - started)
+                POOL_WAIT.observe(started - submitted)
+                POOL_RUN.observe(finished - started)
+                self.counts["completed"] += 1
+            else:
+                self.counts["expired" if isinstance(error, DeadlineExceeded) else "errors"] += 1
+        if job.cancelled():
+            result.cancel()
+            return
+        if result.set_running_or_notify_cancel():  # False when the caller already gave up
+            if error is None:
+                result.set_result(value)
+            else:
+                result.set_exception(error)
+
+    def submit(self, fn, *args) -> Future:
+        """Queue ``fn(*args)``; raises Overloaded when the pool is full."""
+        return self._submit(fn, args)[1]
+
+    async def run(self, fn, *args, timeout: float = None):
+        """Await ``fn(*args)`` on the pool; raises Overloaded, or DeadlineExceeded after ``timeout`` seconds."""
+        deadline = time.time() + timeout if timeout else None
+        job, result = self._submit(fn, args, deadline)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(result), timeout)
+        except asyncio.TimeoutError:
+            job.cancel()  # only succeeds while it is still queued
+            with self._lock:
+                self.counts["timeouts"] += 1
+            raise DeadlineExceeded(f"No result within {timeout:g}s") from None
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits, runs = list(self.waits), list(self.runs)
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "maxQueue": self.max_queue,
+            "inFlight": self.in_flight,
+            "queueDepth": max(0, self.in_flight - self.workers),
+            **{key: self.counts[key] for key in
+               ["submitted", "completed", "rejected", "timeouts", "expired", "cancelled", "errors", "respawns"]},
+            "waitMs": {"p50": _percentile(waits, 0.5), "p95": _percentile(waits, 0.95)},
+            "runMs": {"p50": _percentile(runs, 0.5), "p95": _percentile(runs, 0.95)},
+        }
+
+
+# ✅ Shared by the chatbot, the voice fallback and sentiment classification
+cpu_pool = CpuPool()
+Collected("cpu_pool_in_flight", "Jobs running or queued on the CPU pool.", "gauge", lambda: {(): cpu_pool.in_flight})
+Collected("cpu_pool_queue_depth", "Jobs waiting for a free worker.", "gauge",
+          lambda: {(): max(0, cpu_pool.in_flight - cpu_pool.workers)})
+Collected("cpu_pool_jobs_total", "CPU pool jobs by outcome.", "counter", lambda: {
+    (outcome,): cpu_pool.counts[outcome]
+    for outcome in ["submitted", "completed", "rejected", "timeouts", "expired", "cancelled", "errors"]
+}, ("outcome",))
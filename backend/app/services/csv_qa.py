@@ -1,61 +1,188 @@
-import pandas as pd
+import asyncio
 import os
-from rapidfuzz import fuzz
-
-# ✅ Base directory - adjust if needed
-BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
-INVENTORY_CSV = os.path.join(BASE_DIR, "data/inventory/inventory.csv")
-REORDERS_CSV = os.path.join(BASE_DIR, "data/inventory/reorders.csv")
-
-# ✅ Load data once
-inventory_df = pd.read_csv(INVENTORY_CSV)
-reorders_df = pd.read_csv(REORDERS_CSV)
-
-def fuzzy_search(df: pd.DataFrame, question: str, threshold=50, max_results=3) -> list:
-    question_lower = question.lower()
-    matches = []
-    for _, row in df.iterrows():
-        row_text = " ".join(str(v).lower() for v in row.values)
-        score = fuzz.token_set_ratio(question_lower, row_text)
-        if score >= threshold:
-            matches.append((score, row))
-    matches = sorted(matches, key=lambda x: x[0], reverse=True)
-    return [row for _, row in matches[:max_results]]
+import re
+import threading
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services.cpu_pool import CHATBOT_DEADLINE, DeadlineExceeded, cpu_pool
+from app.services.data_store import data_store, Snapshot
+from app.services.search_index import SearchIndex
+from app.utils.cache import TTLCache
+from app.utils.metrics import CACHE_REQUESTS
+
+CHATBOT_SEARCH = os.getenv("CHATBOT_SEARCH", "fuzzy")
+CHATBOT_LIST_ROWS = int(os.getenv("CHATBOT_LIST_ROWS", "50"))  # rows per page of a full-list answer
+CHATBOT_CACHE_TTL = float(os.getenv("CHATBOT_CACHE_TTL", "300"))
+CHATBOT_CACHE_SIZE = int(os.getenv("CHATBOT_CACHE_SIZE", "1024"))
+
+# ✅ Intent keywords, checked in this order (same substring matching as the old ``in`` scans)
+INTENTS = [
+    ("full_inventory", ["show all inventory", "full inventory", "entire inventory", "show full stock", "list inventory"]),
+    ("full_reorders", ["show all reorders", "full reorder", "entire reorder", "list reorders"]),
+    ("inventory", ["stock", "inventory", "available", "quantity", "status", "price", "location", "supplier", "lead time"]),
+    ("reorders", ["reorder", "restock", "order", "urgent", "requested", "estimated cost", "delivered"]),
+]
+# One compiled pass finds every keyword: a zero-width lookahead is tried at each position, so
+# overlapping keywords ("restock" / "stock") are all seen
+INTENT_PATTERN = re.compile(
+    "(?=(?:" + "|".join(
+        f"(?P<{name}>" + "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)) + ")"
+        for name, keywords in INTENTS
+    ) + "))"
+)
+SKU_PATTERN = re.compile(r"\bsku[\s#:-]*([a-z0-9-]+)")
+ITEM_ID_PATTERN = re.compile(r"\b(?:item|id)\s*#?\s*(\d+)\b")
+PAGE_PATTERN = re.compile(r"\bpage\s*(\d+)\b")
+
+_answers = TTLCache(CHATBOT_CACHE_TTL, CHATBOT_CACHE_SIZE)
+_answers_lock = threading.Lock()
+
+# ✅ Data comes from the shared store, so rows added through the API show up without a restart
+def inventory_snapshot() -> Snapshot:
+    return data_store.get(settings.inventory_file_path())
+
+def reorders_snapshot() -> Snapshot:
+    return data_store.get(settings.reorders_file_path())
+
+def get_search_index(snapshot: Snapshot) -> SearchIndex:
+    # ✅ Built once per data version, rebuilt when the CSV changes
+    return snapshot.derive("search_index", lambda: SearchIndex(snapshot.frame))
+
+def fuzzy_search(snapshot: Snapshot, question: str, threshold=50, max_results=3) -> list:
+    return get_search_index(snapshot).search_rows(question, threshold, max_results)
+
+def vector_search(snapshot: Snapshot, name: str, question: str, max_results=3) -> list:
+    # ✅ Top-k nearest rows from the watcher-fed vector index, returned as rows of the current snapshot
+    # (server process only: the index files have a single writer, see ``ask``)
+    from realtime_pipeline.vector_indexer import get_indexer
+
+    if "id" not in snapshot.fieldnames:
+        return []
+    positions = snapshot.derive("id_positions", lambda: {key: i for i, key in enumerate(snapshot.raw["id"].tolist())})
+    keys = [key for key, _ in get_indexer().search(name, question, max_results)]
+    return [snapshot.frame.iloc[positions[key]] for key in keys if key in positions]
+
+def search_rows(snapshot: Snapshot, name: str, question: str, mode: str) -> list:
+    if mode == "vector":
+        return vector_search(snapshot, name, question)
+    return fuzzy_search(snapshot, question)
 
 def format_rows(rows: list) -> str:
     if not rows:
         return ""
     return "\n\n".join([row.to_string(index=False) for row in rows])
 
-def answer_from_csv(question: str) -> str:
-    q = question.lower().strip()
+def normalize_question(question: str) -> str:
+    return " ".join(question.lower().split()).rstrip("?!. ")
+
+def classify(q: str) -> str:
+    """First intent of INTENTS with a keyword in ``q`` (None if nothing matches)."""
+    found = {m.lastgroup for m in INTENT_PATTERN.finditer(q)}
+    return next((name for name, _ in INTENTS if name in found), None)
+
+def lookup_rows(snapshot: Snapshot, column: str, value: str) -> list:
+    # ✅ Direct hash lookup, built once per data version
+    if column not in snapshot.fieldnames:
+        return []
+    index = snapshot.derive(f"qa_lookup:{column}", lambda: {
+        str(key).lower(): i for i, key in enumerate(snapshot.raw[column].tolist())
+    })
+    position = index.get(value.lower())
+    return [] if position is None else [snapshot.frame.iloc[position]]
+
+def full_list(snapshot: Snapshot, title: str, ask: str, page: int) -> str:
+    # ✅ One page of rows instead of the whole table
+    total = len(snapshot)
+    pages = max(1, -(-total // CHATBOT_LIST_ROWS))
+    page = min(max(page, 1), pages)
+    start = (page - 1) * CHATBOT_LIST_ROWS
+    rows = snapshot.frame.iloc[start:start + CHATBOT_LIST_ROWS]
+    answer = f"{title}:\n" + (rows.to_string(index=False) if total else "(empty)")
+    if pages > 1:
+        answer += f"\n\nShowing rows {start + 1}-{start + len(rows)} of {total} (page {page} of {pages})."
+        if page < pages:
+            answer += f' Ask "{ask} page {page + 1}" for more.'
+    return answer
+
+async def ask(question: str, mode: str = None, page: int = None) -> str:
+    """``answer_from_csv`` within CHATBOT_DEADLINE, on the CPU pool.
+
+    Vector searches run on a thread of this process instead: the vector index
+    (its watcher and its files) has one owner, not one per pool worker.
+    """
+    if (mode or CHATBOT_SEARCH) != "vector":
+        return await cpu_pool.run(answer_from_csv, question, mode, page, timeout=CHATBOT_DEADLINE)
+    try:
+        return await asyncio.wait_for(run_in_threadpool(answer_from_csv, question, mode, page), CHATBOT_DEADLINE)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"No result within {CHATBOT_DEADLINE:g}s") from None
+
+def answer_from_csv(question: str, mode: str = None, page: int = None) -> str:
+    """Answer from the CSVs; ``mode`` picks row retrieval: "fuzzy" (default) or "vector" (ANN).
+
+    Answers are cached per normalized question, page and data version, so a CSV change
+    is never answered from a stale entry.
+    """
+    mode = mode or CHATBOT_SEARCH
+    q = normalize_question(question)
+    inventory = inventory_snapshot()
+    reorders = reorders_snapshot()
+
+    match = PAGE_PATTERN.search(q)
+    page = page or (int(match.group(1)) if match else 1)
+    key = (q, mode, page, inventory.version, reorders.version)
+    with _answers_lock:
+        answer = _answers.get(key)
+    CACHE_REQUESTS.inc("chatbot_answers", "miss" if answer is None else "hit")
+    if answer is None:
+        answer = _answer(q, mode, page, inventory, reorders)
+        with _answers_lock:
+            _answers.set(key, answer)
+    return answer
+
+def _answer(q: str, mode: str, page: int, inventory: Snapshot, reorders: Snapshot) -> str:
+    intent = classify(q)
+
+    # ✅ Full list queries, paginated
+    if intent == "full_inventory":
+        return full_list(inventory, "📦 Full Inventory", "show all inventory", page)
 
-    # ✅ Full list queries
-    if any(x in q for x in ["show all inventory", "full inventory", "entire inventory", "show full stock", "list inventory"]):
-        return "📦 Full Inventory:\n" + inventory_df.to_string(index=False)
+    if intent == "full_reorders":
+        return full_list(reorders, "🔁 Full Reorder List", "show all reorders", page)
 
-    if any(x in q for x in ["show all reorders", "full reorder", "entire reorder", "list reorders"]):
-        return "🔁 Full Reorder List:\n" + reorders_df.to_string(index=False)
+    # ✅ Structured lookups: "stock of SKU123", "item 42"
+    match = SKU_PATTERN.search(q)
+    if match and intent != "reorders":
+        rows = lookup_rows(inventory, "sku", "sku" + match.group(1)) or lookup_rows(inventory, "sku", match.group(1))
+        if rows:
+            return "📦 Inventory Matches:\n" + format_rows(rows)
+    match = ITEM_ID_PATTERN.search(q)
+    if match and intent != "reorders":
+        rows = lookup_rows(inventory, "id", match.group(1))
+        if rows:
+            return "📦 Inventory Matches:\n" + format_rows(rows)
 
     # ✅ Inventory-specific search
-    if any(k in q for k in ["stock", "inventory", "available", "quantity", "status", "price", "location", "supplier", "lead time"]):
-        matches = fuzzy_search(inventory_df, q)
+    if intent == "inventory":
+        matches = search_rows(inventory, "inventory", q, mode)
         if matches:
             return "📦 Inventory Matches:\n" + format_rows(matches)
         else:
             return "⚠️ No relevant inventory info found."
 
     # ✅ Reorder-specific search
-    if any(k in q for k in ["reorder", "restock", "order", "urgent", "requested", "estimated cost", "delivered"]):
-        matches = fuzzy_search(reorders_df, q)
+    if intent == "reorders":
+        matches = search_rows(reorders, "reorders", q, mode)
         if matches:
             return "🔁 Reorder Matches:\n" + format_rows(matches)
         else:
             return "⚠️ No relevant reorder info found."
 
     # 🔍 Fallback to both
-    for df, label in [(inventory_df, "Inventory"), (reorders_df, "Reorders")]:
-        matches = fuzzy_search(df, q)
+    for snapshot, name, label in [(inventory, "inventory", "Inventory"), (reorders, "reorders", "Reorders")]:
+        matches = search_rows(snapshot, name, q, mode)
         if matches:
             return f"🔍 Matches in {label}:\n" + format_rows(matches)
 
@@ -0,0 +1,142 @@
+import itertools
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.shared_snapshots import SHARED_SNAPSHOTS, shared_snapshots
+from app.utils.metrics import CACHE_REQUESTS, CSV_PARSE_SECONDS, CSV_ROWS_READ
+
+# ✅ Every rebuilt snapshot gets a new, process-wide unique version
+_versions = itertools.count(1)
+
+
+def _infer_types(raw: pd.DataFrame) -> pd.DataFrame:
+    # Same typing pd.read_csv would give: numeric columns become int/float, empty cells NaN
+    typed = {}
+    for column in raw.columns:
+        values = raw[column].replace("", np.nan)
+        try:
+            typed[column] = pd.to_numeric(values)
+        except (ValueError, TypeError):
+            typed[column] = values
+    return pd.DataFrame(typed, columns=raw.columns)
+
+
+def read_raw(path: str) -> pd.DataFrame:
+    """Every cell as a string, empty cells as "" (picklable, so it can run on a process pool)."""
+    try:
+        return pd.read_csv(path, dtype=str, keep_default_na=False)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+
+class Snapshot:
+    """Immutable parsed view of one CSV file at one (mtime, size) signature."""
+
+    def __init__(self, path: str, signature: tuple, raw: pd.DataFrame, version: int = None, frame: pd.DataFrame = None,
+                 source: str = None):
+        self.path = path
+        self.source = source  # the shared version directory it is mapped from, if any
+        self.signature = signature
+        self.version = next(_versions) if version is None else version
+        self.raw = raw
+        self.fieldnames = list(raw.columns)
+        self._derived = {} if frame is None else {"frame": frame}
+        self._lock = threading.RLock()
+
+    def derive(self, key: str, builder):
+        """Build ``builder()`` once per snapshot and reuse it until the file changes."""
+        value = self._derived.get(key)
+        if value is None:
+            with self._lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = builder()
+                    self._derived[key] = value
+        return value
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        # ✅ Typed DataFrame (what the chatbot used to get from pd.read_csv)
+        return self.derive("frame", lambda: _infer_types(self.raw))
+
+    @property
+    def records(self) -> list:
+        # ✅ Rows as dicts of strings, exactly what csv.DictReader yields
+        return self.derive("records", lambda: self.raw.to_dict("records"))
+
+    def __len__(self):
+        return len(self.raw)
+
+
+class DataStore:
+    """Shared in-memory CSV store keyed by file path.
+
+    Each ``get`` costs one ``os.stat``. The file is only re-parsed when its
+    mtime or size changed since the cached snapshot was built. With
+    ``shared`` (SHARED_SNAPSHOTS=1) snapshots come from shared_snapshots
+    instead: parsed once for all worker processes and memory-mapped by each.
+    """
+
+    def __init__(self, shared: bool = SHARED_SNAPSHOTS):
+        self.shared = shared  # ✅ Map the snapshots every worker shares instead of parsing per process
+        self._snapshots = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def _path_lock(self, path: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    @staticmethod
+    def _signature(path: str) -> tuple:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: str, read=read_raw) -> Snapshot:
+        """Return the current snapshot of ``path``; raises FileNotFoundError if it is missing.
+
+        ``read(path)`` parses the file when it changed (e.g. on a process pool).
+        """
+        path = os.path.abspath(path)
+        if self.shared:
+            return shared_snapshots.get(path, read)
+        signature = self._signature(path)
+        snapshot = self._snapshots.get(path)
+        if snapshot is not None and snapshot.signature == signature:
+            CACHE_REQUESTS.inc("csv_snapshot", "hit")
+            return snapshot
+
+        # ✅ One parse per change, even when many requests notice it at once
+        with self._path_lock(path):
+            signature = self._signature(path)
+            snapshot = self._snapshots.get(path)
+            if snapshot is None or snapshot.signature != signature:
+                CACHE_REQUESTS.inc("csv_snapshot", "miss")
+                start = time.perf_counter()
+                raw = read(path)
+                name = os.path.basename(path)
+                CSV_PARSE_SECONDS.observe(time.perf_counter() - start, name)
+                CSV_ROWS_READ.inc(name, amount=len(raw))
+                snapshot = Snapshot(path, signature, raw)
+                self._snapshots[path] = snapshot
+            else:
+                CACHE_REQUESTS.inc("csv_snapshot", "hit")
+            return snapshot
+
+    def invalidate(self, path: str = None):
+        shared_snapshots.invalidate(path)
+        with self._guard:
+            if path is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(os.path.abspath(path), None)
+
+    def version(self, path: str) -> int:
+        return self.get(path).version
+
+
+data_store = DataStore()
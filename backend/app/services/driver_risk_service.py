@@ -1,32 +1,215 @@
-import csv
-import os
-from app.config import settings
+import heapq
+import math
+import threading
+import time
+from datetime import datetime
 
-def get_driver_risks():
-    file_path = os.path.join(settings.DATA_DIR, "drivers.csv")
-    drivers = []
+from app.services.incident_store import apply_incident_counts, get_incident_store
+from app.services.row_codec import DRIVER_SCHEMA, decoded_rows
+from app.services.storage import get_storage
+
+HALF_LIFE_DAYS = 30
+SEVERITY_WEIGHTS = {"minor": 1.0, "moderate": 3.0, "severe": 8.0}  # unknown severities count as minor
+PRIOR_DELIVERIES = 20  # pseudo-deliveries every driver starts with, so one early incident isn't a 100% rate
+SAFETY_PER_RISK = 10   # safety points lost per weighted incident per 100 deliveries
+RISK_LEVELS = [(85, "low"), (70, "medium")]  # lowest safetyScore of each level; below that "high"
+REBASE_EXPONENT = 500  # exp(500) is far from float overflow
+
+
+class DriverRisk:
+    __slots__ = ("name", "incidents", "deliveries", "baseline", "incident_count", "delivery_count", "risk")
+
+    def __init__(self, name: str, prior: float):
+        self.name = name
+        self.incidents = 0.0
+        self.deliveries = prior
+        self.baseline = 0.0  # weight of the CSV incident count, dropped at the first logged incident
+        self.incident_count = 0
+        self.delivery_count = 0
+        self.risk = 0.0
+
+
+class RiskEngine:
+    """Per-driver risk from exponentially decayed incident and delivery aggregates.
+
+    Aggregates use forward decay: an event at time t adds
+    ``weight * exp(lam * (t - landmark))``, so recording one is O(1) and never
+    rescans history. Decaying to "now" would scale every driver's sums by the
+    same factor, so the risk (weighted incidents per 100 deliveries) and the
+    ranking don't move with time alone, and the top-N heap only gets an entry
+    when a driver's aggregates change. Stale heap entries are skipped lazily.
+
+    Limitation: the same property means risk only changes when events arrive.
+    Incidents age out relative to a driver's later deliveries, not to the clock,
+    so an idle driver keeps the risk of their last activity until new
+    deliveries or incidents are recorded.
+    """
+
+    def __init__(self, half_life_days: float = HALF_LIFE_DAYS, now: float = None):
+        self.lam = math.log(2) / (half_life_days * 86400)
+        self.landmark = time.time() if now is None else now
+        self.drivers = {}
+        self._heap = []
+        self._lock = threading.RLock()
+        self._incidents = {}  # incident id -> (driver id, severity, ts), to take an updated incident back out
+        self._synced = (None, 0, 0)  # incident store version, last incident seq, last delivery rowid
+
+    def _weight(self, ts: float) -> float:
+        exponent = self.lam * (ts - self.landmark)
+        if exponent > REBASE_EXPONENT:
+            self._rebase(ts)
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def _rebase(self, ts: float):
+        # Move the landmark forward; ratios (and so the heap) are unchanged
+        factor = math.exp(-self.lam * (ts - self.landmark))
+        for state in self.drivers.values():
+            state.incidents *= factor
+            state.deliveries *= factor
+            state.baseline *= factor
+        self.landmark = ts
+
+    def _state(self, driver_id: str, name: str, weight: float) -> DriverRisk:
+        state = self.drivers.get(driver_id)
+        if state is None:
+            state = self.drivers[driver_id] = DriverRisk(name, PRIOR_DELIVERIES * weight)
+        elif name and not state.name:
+            state.name = name
+        return state
+
+    def _rescore(self, driver_id: str, state: DriverRisk):
+        state.risk = 100.0 * state.incidents / state.deliveries if state.deliveries > 0 else 0.0
+        heapq.heappush(self._heap, (-state.risk, driver_id))
+        if len(self._heap) > 4 * len(self.drivers) + 1024:
+            self._heap = [(-s.risk, d) for d, s in self.drivers.items()]
+            heapq.heapify(self._heap)
+
+    def seed(self, drivers: list) -> "RiskEngine":
+        """Baseline from the driver table: its delivery and incident counts, as of now."""
+        with self._lock:
+            weight = self._weight(time.time())
+            for row in drivers:
+                state = self._state(row["id"], row["name"], weight)
+                state.deliveries += row["deliveries"] * weight
+                state.delivery_count += row["deliveries"]
+                state.baseline = row["incidents"] * weight
+                state.incidents += state.baseline
+                state.incident_count = row["incidents"]
+                self._rescore(row["id"], state)
+        return self
 
+    def record_incident(self, driver_id: str, severity: str, ts: float = None, name: str = "",
+                        incident_id: str = None):
+        """Add one incident; with ``incident_id``, a later call for the same id replaces the earlier one."""
+        with self._lock:
+            ts = time.time() if ts is None else ts
+            if incident_id is not None:
+                previous = self._incidents.get(incident_id)
+                if previous is not None:
+                    self._forget_incident(*previous)
+                self._incidents[incident_id] = (driver_id, severity, ts)
+            weight = self._weight(ts)
+            state = self._state(driver_id, name, weight)
+            if state.baseline:
+                # Logged incidents replace the static CSV count (same rule as apply_incident_counts)
+                state.incidents -= state.baseline
+                state.baseline = 0.0
+                state.incident_count = 0
+            state.incidents += SEVERITY_WEIGHTS.get(severity, 1.0) * weight
+            state.incident_count += 1
+            self._rescore(driver_id, state)
+
+    def _forget_incident(self, driver_id: str, severity: str, ts: float):
+        state = self.drivers.get(driver_id)
+        if state is None:
+            return
+        state.incidents = max(0.0, state.incidents - SEVERITY_WEIGHTS.get(severity, 1.0) * self._weight(ts))
+        state.incident_count -= 1
+        self._rescore(driver_id, state)
+
+    def record_deliveries(self, driver_id: str, count: int = 1, ts: float = None):
+        with self._lock:
+            weight = self._weight(time.time() if ts is None else ts)
+            state = self._state(driver_id, "", weight)
+            state.deliveries += count * weight
+            state.delivery_count += count
+            self._rescore(driver_id, state)
+
+    def sync(self, store):
+        """Apply incidents and deliveries logged since the last sync (by any worker)."""
+        version = store.version()
+        if self._synced[0] == version:
+            return
+        with self._lock:
+            _, incident_seq, delivery_rowid = self._synced
+            # ✅ By change number: an incident posted again with a new severity or date is rescored
+            rows = store.incidents_since(incident_seq)
+            while rows:
+                for incident_seq, incident_id, driver_id, name, severity, date in rows:
+                    self.record_incident(driver_id, severity, _timestamp(date), name, incident_id)
+                rows = store.incidents_since(incident_seq)
+            rows = store.deliveries_since(delivery_rowid)
+            while rows:
+                for delivery_rowid, driver_id, count, ts in rows:
+                    self.record_deliveries(driver_id, count, ts)
+                rows = store.deliveries_since(delivery_rowid)
+            self._synced = (version, incident_seq, delivery_rowid)
+
+    def _row(self, driver_id: str, state: DriverRisk) -> dict:
+        safety = max(0, min(100, round(100 - SAFETY_PER_RISK * state.risk)))
+        level = next((name for floor, name in RISK_LEVELS if safety >= floor), "high")
+        return {
+            "id": driver_id, "name": state.name, "riskScore": round(state.risk, 3), "safetyScore": safety,
+            "riskLevel": level, "incidents": state.incident_count, "deliveries": state.delivery_count,
+        }
+
+    def score(self, driver_id: str) -> dict:
+        with self._lock:
+            state = self.drivers.get(driver_id)
+            return None if state is None else self._row(driver_id, state)
+
+    def top(self, n: int) -> list:
+        """The ``n`` riskiest drivers, highest risk first."""
+        with self._lock:
+            found, seen = [], set()
+            while self._heap and len(found) < n:
+                entry = heapq.heappop(self._heap)
+                state = self.drivers.get(entry[1])
+                if state is None or state.risk != -entry[0] or entry[1] in seen:
+                    continue  # stale or duplicate entry
+                found.append(entry)
+                seen.add(entry[1])
+            for entry in found:
+                heapq.heappush(self._heap, entry)
+            return [self._row(driver_id, self.drivers[driver_id]) for _, driver_id in found]
+
+
+def _timestamp(value: str) -> float:
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+def get_risk_engine() -> RiskEngine:
+    """Engine seeded from the driver table (rebuilt when it changes), caught up with the incident store."""
+    engine = get_storage().derive(
+        "drivers", "risk_engine", lambda: RiskEngine().seed(decoded_rows("drivers", DRIVER_SCHEMA))
+    )
+    engine.sync(get_incident_store())
+    return engine
+
+
+def get_driver_risks():
+    # ✅ Same decoded rows as /api/drivers (data/drivers/drivers.csv or SQLite), not DATA_DIR
+    # ✅ with live incident counts, and safetyScore / riskLevel computed by the risk engine
     try:
-        with open(file_path, newline='', encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                drivers.append({
-                    "id": row["id"],
-                    "name": row["name"],
-                    "email": row["email"],
-                    "phone": row["phone"],
-                    "status": row["status"],
-                    "location": row["location"],
-                    "vehicle": row["vehicle"],
-                    "safetyScore": int(row["safetyScore"]),
-                    "deliveries": int(row["deliveries"]),
-                    "incidents": int(row["incidents"]),
-                    "lastActive": row["lastActive"],
-                    "joinDate": row["joinDate"],
-                    "certifications": row["certifications"].split(";") if row["certifications"] else [],
-                    "riskLevel": row["riskLevel"],
-                    "avatar": row.get("avatar", ""),
-                })
+        engine = get_risk_engine()
+        drivers = []
+        for row in apply_incident_counts(decoded_rows("drivers", DRIVER_SCHEMA)):
+            score = engine.score(row["id"])
+            drivers.append({**row, "safetyScore": score["safetyScore"], "riskLevel": score["riskLevel"]})
         return {"status": "success", "drivers": drivers}
     except FileNotFoundError:
         return {"status": "error", "message": "Driver risk file not found"}
@@ -0,0 +1,193 @@
+import os
+import sqlite3
+import threading
+
+from app.config import settings
+
+INCIDENT_FIELDS = ["id", "driverId", "driverName", "type", "severity", "description", "date", "status", "location"]
+SEVERITIES = ["minor", "moderate", "severe"]
+_COLUMNS = ", ".join(f'"{f}"' for f in INCIDENT_FIELDS)
+
+
+class IncidentStore:
+    """Durable incident and delivery log in SQLite (WAL), shared by every worker process.
+
+    ``id`` is the primary key, so lookups are one index probe. ``driverId``,
+    ``status`` and ``severity`` have secondary indexes. A version in
+    ``_meta`` is bumped with every write, which lets callers cache data
+    derived from the incidents (e.g. per-driver counts) across processes.
+    Every insert or update also gives the row a new ``seq`` (change number),
+    so readers can follow changed incidents, not just new ones.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._counts = (None, {})
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self.connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS incidents ("
+                + ", ".join(f'"{f}" TEXT NOT NULL' + (" PRIMARY KEY" if f == "id" else "") for f in INCIDENT_FIELDS)
+                + ', "seq" INTEGER)'
+            )
+            if "seq" not in [row["name"] for row in conn.execute("PRAGMA table_info(incidents)")]:
+                # Stores created before change numbers: existing rows keep their insertion order
+                conn.execute('ALTER TABLE incidents ADD COLUMN "seq" INTEGER')
+                conn.execute("UPDATE incidents SET seq = rowid")
+            conn.execute('CREATE INDEX IF NOT EXISTS "ix_incidents_seq" ON incidents ("seq")')
+            # driverId leads a covering index, so per-driver counts never touch the table
+            conn.execute('CREATE INDEX IF NOT EXISTS "ix_incidents_driverId" ON incidents ("driverId", "status", "severity")')
+            for column in ["status", "severity"]:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_incidents_{column}" ON incidents ("{column}")')
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS deliveries (driverId TEXT NOT NULL, count INTEGER NOT NULL, ts REAL NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS _meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO _meta (name, value) VALUES ('version', 0)")
+            conn.execute("INSERT OR IGNORE INTO _meta (name, value) SELECT 'seq', COALESCE(MAX(seq), 0) FROM incidents")
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _bump(conn):
+        conn.execute("UPDATE _meta SET value = value + 1 WHERE name = 'version'")
+
+    @staticmethod
+    def _reserve(conn, count: int) -> int:
+        """First of ``count`` new change numbers (the UPDATE takes the write lock, so writers never share one)."""
+        last = conn.execute("UPDATE _meta SET value = value + ? WHERE name = 'seq' RETURNING value", (count,)).fetchone()[0]
+        return last - count + 1
+
+    def version(self) -> int:
+        return self.connection().execute("SELECT value FROM _meta WHERE name = 'version'").fetchone()[0]
+
+    def add(self, incident: dict) -> bool:
+        """Insert one incident; False if its id already exists."""
+        try:
+            with self.connection() as conn:
+                seq = self._reserve(conn, 1)
+                conn.execute(
+                    f"INSERT INTO incidents ({_COLUMNS}, seq) VALUES ({', '.join('?' for _ in INCIDENT_FIELDS)}, ?)",
+                    [incident[f] for f in INCIDENT_FIELDS] + [seq],
+                )
+                self._bump(conn)
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def add_many(self, incidents: list) -> int:
+        """Bulk ingest in one transaction; an incident with an existing id is updated in place (new seq)."""
+        updates = ", ".join(f'"{f}" = excluded."{f}"' for f in INCIDENT_FIELDS[1:] + ["seq"])
+        with self.connection() as conn:
+            seq = self._reserve(conn, len(incidents))
+            conn.executemany(
+                f"INSERT INTO incidents ({_COLUMNS}, seq) VALUES ({', '.join('?' for _ in INCIDENT_FIELDS)}, ?)"
+                f" ON CONFLICT(id) DO UPDATE SET {updates}",
+                ([incident[f] for f in INCIDENT_FIELDS] + [seq + i] for i, incident in enumerate(incidents)),
+            )
+            self._bump(conn)
+        return len(incidents)
+
+    def get(self, incident_id: str) -> dict:
+        row = self.connection().execute(f"SELECT {_COLUMNS} FROM incidents WHERE id = ?", (incident_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list(self, driver_id: str = None, status: str = None, severity: str = None, limit: int = None) -> list:
+        filters = {"driverId": driver_id, "status": status, "severity": severity}
+        where = [(f'"{column}" = ?', value) for column, value in filters.items() if value is not None]
+        sql = f"SELECT {_COLUMNS} FROM incidents"
+        if where:
+            sql += " WHERE " + " AND ".join(clause for clause, _ in where)
+        sql += " ORDER BY rowid"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self.connection().execute(sql, [value for _, value in where])]
+
+    def set_status(self, incident_id: str, status: str) -> dict:
+        with self.connection() as conn:
+            updated = conn.execute("UPDATE incidents SET status = ? WHERE id = ?", (status, incident_id)).rowcount
+            if updated:
+                self._bump(conn)
+        return self.get(incident_id) if updated else None
+
+    def record_deliveries(self, driver_id: str, count: int, ts: float):
+        with self.connection() as conn:
+            conn.execute("INSERT INTO deliveries VALUES (?, ?, ?)", (driver_id, count, ts))
+            self._bump(conn)
+
+    def incidents_since(self, seq: int, batch: int = 50_000) -> list:
+        """``(seq, id, driverId, driverName, severity, date)`` of incidents added or updated after ``seq``, oldest first."""
+        return self.connection().execute(
+            "SELECT seq, id, driverId, driverName, severity, date FROM incidents WHERE seq > ? ORDER BY seq LIMIT ?",
+            (seq, batch),
+        ).fetchall()
+
+    def deliveries_since(self, rowid: int, batch: int = 50_000) -> list:
+        """``(rowid, driverId, count, ts)`` of deliveries recorded after ``rowid``, oldest first."""
+        return self.connection().execute(
+            "SELECT rowid, driverId, count, ts FROM deliveries WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (rowid, batch),
+        ).fetchall()
+
+    def counts_by_driver(self, driver_id: str = None) -> dict:
+        """``{driverId: {"total", "open", "minor", "moderate", "severe"}}``, cached per store version."""
+        version = self.version()
+        cached_version, counts = self._counts
+        if cached_version != version:
+            severity_sums = ", ".join(f"SUM(severity = '{s}') AS \"{s}\"" for s in SEVERITIES)
+            rows = self.connection().execute(
+                f"SELECT driverId, COUNT(*) AS total, SUM(status != 'resolved') AS open, {severity_sums} "
+                "FROM incidents GROUP BY driverId"
+            )
+            counts = {row["driverId"]: {k: row[k] for k in row.keys() if k != "driverId"} for row in rows}
+            self._counts = (version, counts)
+        if driver_id is not None:
+            return {driver_id: counts[driver_id]} if driver_id in counts else {}
+        return counts
+
+
+def apply_incident_counts(drivers: list) -> list:
+    """Driver rows with ``incidents`` taken from the incident store.
+
+    Drivers the store has no incidents for keep the CSV value as their baseline.
+    """
+    counts = get_incident_store().counts_by_driver()
+    if not counts:
+        return drivers
+    return [_with_count(driver, counts) for driver in drivers]
+
+
+def iter_with_incident_counts(rows):
+    """Streaming ``apply_incident_counts`` for exports."""
+    counts = get_incident_store().counts_by_driver()
+    for row in rows:
+        yield _with_count(row, counts)
+
+
+def _with_count(driver: dict, counts: dict) -> dict:
+    key = str(driver.get("id"))
+    if "incidents" not in driver or key not in counts:
+        return driver
+    return {**driver, "incidents": counts[key]["total"]}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_incident_store() -> IncidentStore:
+    """The store at ``settings.INCIDENTS_DB``, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None or _store.path != settings.INCIDENTS_DB:
+            _store = IncidentStore(settings.INCIDENTS_DB)
+        return _store
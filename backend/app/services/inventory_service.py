@@ -1,9 +1,12 @@
-import pandas as pd
-import os
-from typing import Dict
+import csv
+import logging
+import threading
+from typing import Dict, List
 
-BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
-INVENTORY_CSV = os.path.join(BASE_DIR, "data/inventory/inventory.csv")
+from app.config import settings
+from app.services.storage import get_storage
+from app.utils.csv_io import append_rows, read_header, write_rows_atomic
+from app.utils.file_lock import FileLock
 
 REQUIRED_COLUMNS = [
     "id", "name", "sku", "category", "currentStock", "minStock",
@@ -11,18 +14,124 @@ REQUIRED_COLUMNS = [
     "status", "price", "supplier", "supplierContact", "leadTime"
 ]
 
-def add_inventory_item(item_data: Dict[str, str]) -> str:
+logger = logging.getLogger(__name__)
+
+MIRROR_RETRY_SECONDS = 5.0
+
+INT_COLUMNS = ["currentStock", "minStock", "maxStock", "reorderPoint", "reorderQuantity", "leadTime"]
+FLOAT_COLUMNS = ["price"]
+
+
+class InventoryValidationError(ValueError):
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def validate_item(item_data: Dict[str, str]) -> Dict[str, str]:
+    """Return the item as a CSV-ready row, or raise InventoryValidationError."""
+    if not isinstance(item_data, dict):
+        raise InventoryValidationError(["item must be a JSON object"])
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in item_data]
+    if missing:
+        raise InventoryValidationError([f"Missing required field: {col}" for col in missing])
+
+    errors = []
+    row = {}
+    for col in REQUIRED_COLUMNS:
+        value = "" if item_data[col] is None else str(item_data[col]).strip()
+        if col in INT_COLUMNS:
+            try:
+                value = str(int(value))
+            except ValueError:
+                errors.append(f"{col} must be an integer, got {item_data[col]!r}")
+        elif col in FLOAT_COLUMNS:
+            try:
+                float(value)
+            except ValueError:
+                errors.append(f"{col} must be a number, got {item_data[col]!r}")
+        elif col in ("id", "sku", "name") and not value:
+            errors.append(f"{col} must not be empty")
+        row[col] = value
+    if errors:
+        raise InventoryValidationError(errors)
+    return row
+
+
+def add_inventory_items(items: List[Dict[str, str]]) -> int:
+    """Validate every item, then append them all in one locked write (all or nothing)."""
+    rows = []
+    errors = []
+    for i, item in enumerate(items):
+        try:
+            rows.append(validate_item(item))
+        except InventoryValidationError as e:
+            prefix = f"item {i}: " if len(items) > 1 else ""
+            errors.extend(prefix + err for err in e.errors)
+    if errors:
+        raise InventoryValidationError(errors)
+    if rows:
+        path = settings.inventory_file_path()
+        with FileLock(path):
+            append_rows(path, rows, fieldnames=REQUIRED_COLUMNS, lock=False)
+            # ✅ CSV stays the change log; the active store (e.g. SQLite) gets the same rows, in the same order
+            _mirror(rows)
+    return len(rows)
+
+
+_unmirrored = []
+_retry_timer = None
+
+
+def _mirror(rows: list):
+    """Upsert ``rows`` plus any earlier failed ones into the active store; caller holds the inventory lock.
+
+    The rows are already in the CSV, so a failure is retried later instead of failing the request.
+    """
+    global _unmirrored, _retry_timer
+    pending = _unmirrored + rows
+    if not pending:
+        return
     try:
-        df = pd.read_csv(INVENTORY_CSV)
+        get_storage().upsert("inventory", pending)
+        _unmirrored = []
+    except Exception:
+        _unmirrored = pending
+        logger.exception("❌ Mirroring %d inventory rows to the active store failed; will retry", len(pending))
+        if _retry_timer is None:
+            _retry_timer = threading.Timer(MIRROR_RETRY_SECONDS, retry_mirror)
+            _retry_timer.daemon = True
+            _retry_timer.start()
+
 
-        for col in REQUIRED_COLUMNS:
-            if col not in item_data:
-                return f"❌ Missing required field: {col}"
+def retry_mirror():
+    global _retry_timer
+    _retry_timer = None  # a failure below schedules the next attempt
+    if _unmirrored:
+        with FileLock(settings.inventory_file_path()):
+            _mirror([])
 
-        new_row = pd.DataFrame([item_data])
-        df = pd.concat([df, new_row], ignore_index=True)
-        df.to_csv(INVENTORY_CSV, index=False)
+
+def add_inventory_item(item_data: Dict[str, str]) -> str:
+    try:
+        add_inventory_items([item_data])
         return "✅ Item added successfully to inventory."
-    
+    except InventoryValidationError as e:
+        return f"❌ {e}"
     except Exception as e:
         return f"❌ Error adding item: {str(e)}"
+
+
+def compact_inventory() -> int:
+    """Rewrite inventory.csv atomically, keeping only the last row for each id."""
+    path = settings.inventory_file_path()
+    with FileLock(path):
+        header = read_header(path) or REQUIRED_COLUMNS
+        with open(path, mode="r", newline="", encoding="utf-8") as file:
+            latest = {}
+            for row in csv.DictReader(file):
+                if row.get("id"):
+                    latest.pop(row["id"], None)
+                    latest[row["id"]] = row
+        return write_rows_atomic(path, header, latest.values())
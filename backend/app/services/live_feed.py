@@ -0,0 +1,95 @@
+import asyncio
+import json
+import threading
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services.broadcaster import Broadcaster, sse_event
+from realtime_pipeline.driver_monitor import DriverTracker
+from realtime_pipeline.inventory_tracker import InventoryTracker
+
+HEARTBEAT_SECONDS = 15
+
+
+class FeedMessage:
+    """A snapshot or diff, encoded once for SSE and once for WebSocket clients."""
+
+    def __init__(self, kind: str, payload: dict):
+        self.kind = kind
+        self.version = payload["version"]
+        body = dict(payload, type=kind)
+        self.json = json.dumps(body, separators=(",", ":"))
+        self.sse = sse_event(kind, body, event_id=self.version)
+
+
+class LiveFeed:
+    """Connects a realtime_pipeline tracker to a Broadcaster.
+
+    The tracker is started during warm-up (or, off the event loop, on the
+    first subscriber). From then on every file change reaches all connected
+    clients as one pre-encoded diff.
+    """
+
+    def __init__(self, name: str, tracker_class, path_fn):
+        self.name = name
+        self.tracker_class = tracker_class
+        self.path_fn = path_fn
+        self.tracker = None
+        self.broadcaster = Broadcaster()
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self.tracker is not None
+
+    def ensure_started(self):
+        """Start the tracker; its first read parses the whole file, so call it off the event loop."""
+        with self._lock:
+            if self.tracker is None:
+                tracker = self.tracker_class(self.path_fn())
+                tracker.add_listener(self._on_diff)
+                self.tracker = tracker.start()
+        return self.tracker
+
+    def _on_diff(self, diff: dict):
+        self.broadcaster.publish(FeedMessage("diff", diff))
+
+    def snapshot_message(self) -> FeedMessage:
+        # ✅ Encoded once per tracker version, shared by every client that (re)connects
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self.tracker.version:
+            snapshot = FeedMessage("snapshot", self.tracker.snapshot())
+            self._snapshot = snapshot
+        return snapshot
+
+    async def messages(self):
+        """Yield a snapshot, then every newer diff; slow clients get a fresh snapshot instead of a backlog."""
+        if not self.started:
+            await run_in_threadpool(self.ensure_started)
+        subscription = self.broadcaster.subscribe()
+        try:
+            # ✅ A new snapshot encodes every row: done on a worker thread, not the event loop
+            message = await run_in_threadpool(self.snapshot_message)
+            version = message.version
+            yield message
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield None  # heartbeat
+                    continue
+                if message is None or subscription.resync:
+                    subscription.resync = False
+                    message = await run_in_threadpool(self.snapshot_message)
+                elif message.version <= version:
+                    continue
+                version = message.version
+                yield message
+        finally:
+            self.broadcaster.unsubscribe(subscription)
+
+
+inventory_feed = LiveFeed("inventory", InventoryTracker, settings.inventory_file_path)
+drivers_feed = LiveFeed("drivers", DriverTracker, settings.drivers_file_path)
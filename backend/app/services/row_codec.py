@@ -0,0 +1,143 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # ✅ Optional: falls back to the stdlib encoder
+    orjson = None
+
+from app.services.shared_snapshots import shared_snapshots
+from app.services.storage import get_storage
+from app.utils.metrics import CACHE_REQUESTS
+
+# ✅ Column types of the typed models, declared once for every route and service that decodes rows
+DRIVER_SCHEMA = {
+    "id": str, "name": str, "email": str, "phone": str, "status": str, "location": str, "vehicle": str,
+    "safetyScore": int, "deliveries": int, "incidents": int, "lastActive": str, "joinDate": str,
+    "certifications": list, "riskLevel": str, "avatar": str,
+}
+INVENTORY_SCHEMA = {
+    "id": str, "name": str, "sku": str, "category": str, "currentStock": int, "minStock": int, "maxStock": int,
+    "reorderPoint": int, "reorderQuantity": int, "location": str, "status": str, "price": float, "supplier": str,
+    "supplierContact": str, "leadTime": int,
+}
+REORDER_SCHEMA = {
+    "id": str, "itemId": str, "itemName": str, "supplier": str, "quantity": int, "estimatedCost": float,
+    "urgency": str, "requestedBy": str, "requestedDate": str, "status": str, "notes": str,
+}
+TRANSFER_SCHEMA = {
+    "id": str, "sku": str, "name": str, "fromLocation": str, "toLocation": str, "quantity": int,
+    "transferLeadDays": int, "supplierLeadDays": int, "daysSaved": int, "estimatedCost": float, "status": str,
+    "createdAt": str,
+}
+# ✅ Schema of each storage table; also declares the SQLite column types
+TABLE_SCHEMAS = {"inventory": INVENTORY_SCHEMA, "reorders": REORDER_SCHEMA, "drivers": DRIVER_SCHEMA}
+# Columns that may be missing from the file, with their default
+OPTIONAL_COLUMNS = {"avatar": "", "notes": ""}
+
+
+class RowDecodeError(ValueError):
+    pass
+
+
+def dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _to_str(value) -> str:
+    # Typed stores hand back numbers for id-like columns (a NULL turns them into floats)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _text(values: pd.Series) -> list:
+    if pd.api.types.is_string_dtype(values) and not values.hasnans:
+        return values.tolist()  # CSV columns are strings already
+    values = values.astype(object).where(values.notna(), "")
+    return [v if isinstance(v, str) else _to_str(v) for v in values.tolist()]
+
+
+def _numbers(name: str, values: pd.Series, integer: bool) -> list:
+    numbers = pd.to_numeric(values.replace("", np.nan), errors="coerce")
+    bad = numbers.isna() | (np.isinf(numbers) if integer else False)
+    if integer:
+        bad |= numbers.notna() & (numbers % 1 != 0)
+    if bad.any():
+        kind = "an integer" if integer else "a number"
+        raise RowDecodeError(f"{name} must be {kind}, got {values[bad].iloc[0]!r} (row {int(bad.to_numpy().argmax())})")
+    return numbers.astype("int64" if integer else "float64").tolist()
+
+
+def decode_frame(frame: pd.DataFrame, schema: dict) -> list:
+    """Coerce every column of ``frame`` to ``schema`` in one vectorised pass per column.
+
+    Returns plain dicts (Python ints/floats/strs/lists) that already match the
+    pydantic models, so they can be serialized without per-row validation.
+    Raises RowDecodeError naming the first bad value.
+    """
+    columns = []
+    for name, kind in schema.items():
+        if name not in frame:
+            if name not in OPTIONAL_COLUMNS:
+                raise RowDecodeError(f"Missing column: {name}")
+            columns.append([OPTIONAL_COLUMNS[name]] * len(frame))
+        elif kind is int or kind is float:
+            columns.append(_numbers(name, frame[name], kind is int))
+        elif kind is list:
+            columns.append([v.split(";") if v else [] for v in _text(frame[name])])
+        else:
+            columns.append(_text(frame[name]))
+    names = list(schema)
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def decode_page(rows: list, schema: dict, fields: list = None) -> list:
+    """``decode_frame`` for rows read from a store (a page, a lookup), cut down to ``fields``.
+
+    Gives paged and point responses the same types as the full lists on every backend.
+    """
+    if not rows:
+        return []
+    if fields:
+        schema = {name: schema.get(name, str) for name in fields}
+    return decode_frame(pd.DataFrame(rows), schema)
+
+
+def decoded_rows(table: str, schema: dict) -> list:
+    # ✅ Decoded once per data version, shared by every caller
+    store = get_storage()
+    return store.derive(table, "decoded_rows", lambda: decode_frame(store.raw_frame(table), schema))
+
+
+def encoded_body(table: str, key: str, build, depends_on=None):
+    """``dumps(build())`` cached per data version of ``table``.
+
+    ``depends_on`` is a second version the body must match (e.g. the incident
+    store's); only the latest body is kept for it. With shared snapshots the
+    body is written next to the mapped columns and mapped (a memoryview), so
+    all workers share one copy.
+    """
+    store = get_storage()
+    holder = store.derive(table, key, dict)
+    cached = holder.get("body")
+    hit = cached is not None and cached[0] == depends_on
+    CACHE_REQUESTS.inc("encoded_body", "hit" if hit else "miss")
+    if not hit:
+        cached = holder["body"] = (depends_on, _encode(store, table, key, build, depends_on))
+    return cached[1]
+
+
+def _encode(store, table: str, key: str, build, depends_on):
+    source = store.shared_source(table)
+    if source is not None:
+        name = key if depends_on is None else f"{key}-{depends_on}"
+        try:
+            return shared_snapshots.map_body(source, name, lambda: dumps(build()), f"{key}-")
+        except FileNotFoundError:
+            pass  # the version was pruned; this worker moves to the new one on its next request
+    return dumps(build())
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+
+def _row_texts(df: pd.DataFrame) -> list:
+    # ✅ Same text blob the chatbot always matched against: every value, str()'d and lowercased
+    columns = [map(str, df.iloc[:, i].tolist()) for i in range(df.shape[1])]
+    return [" ".join(values).lower() for values in zip(*columns)]
+
+
+def _token_set_len(tokens) -> int:
+    # Length of " ".join(sorted(set(tokens))) without building the string
+    unique = set(tokens)
+    return sum(len(t) for t in unique) + max(len(unique) - 1, 0)
+
+
+class SearchIndex:
+    """Precomputed fuzzy-search index over the rows of a DataFrame.
+
+    Row texts are built once. A token -> rows inverted index narrows the
+    candidates, and the candidates are scored in one batched
+    ``rapidfuzz.process.cdist`` call. Rows that share no token with the
+    question can only reach ``200 * min(lq, lr) / (lq + lr)`` with
+    ``token_set_ratio``, so they are only scored when that bound could still
+    beat the threshold or the current top-k. Results are identical to scoring
+    every row.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.texts = _row_texts(df)
+        self.size = len(self.texts)
+
+        token_lists = [text.split() for text in self.texts]
+        self.token_set_lens = np.fromiter(
+            (_token_set_len(tokens) for tokens in token_lists), dtype=np.int64, count=self.size
+        )
+
+        # ✅ CSR-style postings: rows of token t are row_ids[starts[code]:starts[code + 1]]
+        counts = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=self.size)
+        row_ids = np.repeat(np.arange(self.size, dtype=np.int64), counts)
+        flat_tokens = [token for tokens in token_lists for token in tokens]
+        self.token_codes = {}
+        self.row_ids = np.empty(0, dtype=np.int64)
+        self.starts = np.zeros(1, dtype=np.int64)
+        if flat_tokens:
+            codes, uniques = pd.factorize(pd.Series(flat_tokens, dtype=object), sort=False)
+            order = np.lexsort((row_ids, codes))
+            self.row_ids = row_ids[order]
+            self.starts = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self.token_codes = dict(zip(uniques.tolist(), range(len(uniques))))
+
+    def candidates(self, tokens) -> np.ndarray:
+        codes = [self.token_codes[t] for t in set(tokens) if t in self.token_codes]
+        lists = [self.row_ids[self.starts[c]:self.starts[c + 1]] for c in codes]
+        if not lists:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(lists))
+
+    def _score(self, query: str, rows: np.ndarray, threshold: float) -> np.ndarray:
+        if len(rows) == 0:
+            return np.empty(0, dtype=np.float64)
+        from rapidfuzz import fuzz, process  # ✅ Imported on first search, not at app startup
+
+        choices = [self.texts[i] for i in rows]
+        return process.cdist(
+            [query], choices, scorer=fuzz.token_set_ratio,
+            score_cutoff=threshold, dtype=np.float64, workers=-1,
+        )[0]
+
+    def search(self, question: str, threshold: float = 50, max_results: int = 3) -> list:
+        """Return the positions of the best matching rows, best first."""
+        query = question.lower()
+        tokens = query.split()
+        if not tokens or self.size == 0 or max_results <= 0:
+            return []
+
+        candidates = self.candidates(tokens)
+        scores = self._score(query, candidates, threshold)
+        keep = scores >= threshold
+        rows, scores = candidates[keep], scores[keep]
+
+        # ✅ Only rows without a shared token whose length bound can still compete
+        floor = float(threshold)
+        if len(scores) >= max_results:
+            floor = max(floor, float(np.partition(scores, -max_results)[-max_results]))
+        lq = _token_set_len(tokens)
+        lr = self.token_set_lens
+        bound = 200.0 * np.minimum(lq, lr) / np.maximum(lq + lr, 1)
+        mask = bound >= floor - 1e-9
+        mask[candidates] = False
+        extra = np.flatnonzero(mask)
+        if len(extra):
+            extra_scores = self._score(query, extra, threshold)
+            extra_keep = extra_scores >= threshold
+            rows = np.concatenate((rows, extra[extra_keep]))
+            scores = np.concatenate((scores, extra_scores[extra_keep]))
+
+        # ✅ Highest score first, ties in original row order (same as a stable sort)
+        order = np.lexsort((rows, -scores))[:max_results]
+        return rows[order].tolist()
+
+    def search_rows(self, question: str, threshold: float = 50, max_results: int = 3) -> list:
+        return [self.df.iloc[i] for i in self.search(question, threshold, max_results)]
@@ -1,7 +1,203 @@
-import random
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from datetime import datetime
+
+from app.config import settings
+from app.services.cpu_pool import Overloaded, cpu_pool
+from app.services.data_store import data_store
+from app.utils.csv_io import append_rows
+from models.sentiment_model import classify_batch
+from realtime_pipeline.sentiment_stream import SentimentStream, SentimentWindow
+
+SENTIMENT_COLUMNS = ["textHash", "text", "sentiment", "polarity", "classifiedAt"]
+CHUNK_SIZE = int(os.getenv("SENTIMENT_CHUNK_SIZE", "256"))
+# Below this many new reviews the process-pool round trip costs more than it saves
+PARALLEL_THRESHOLD = int(os.getenv("SENTIMENT_PARALLEL_THRESHOLD", "1024"))
+CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "200000"))
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """LRU of ``text hash -> (label, polarity)``, warmed from sentiment.csv on first use."""
+
+    def __init__(self, max_entries: int = CACHE_SIZE):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._warmed = False
+
+    def warm(self, path: str):
+        if self._warmed:
+            return
+        self._warmed = True
+        if not os.path.exists(path):
+            return
+        for row in data_store.get(path).records[-self.max_entries:]:
+            if row.get("textHash") and row.get("sentiment"):
+                self.set(row["textHash"], (row["sentiment"], float(row.get("polarity") or 0)))
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class BatchSentimentClassifier:
+    """Deduplicating, cached, multi-core batch classifier.
+
+    ``classify`` yields lists of results as chunks complete. Cache hits come
+    first, then every chunk of newly classified reviews. Those chunks run
+    in-process for small batches and on a process pool for large ones. New
+    results are appended to sentiment.csv.
+    """
+
+    def __init__(self, workers: int = None, persist: bool = True, executor=None):
+        self.executor = executor  # e.g. the shared CpuPool; otherwise a private process pool
+        self.workers = executor.workers if executor is not None else workers or os.cpu_count() or 1
+        self.persist = persist
+        self.cache = SentimentCache()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """``listener(results)`` is called with every newly classified chunk."""
+        self._listeners.append(listener)
+
+    def pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+
+    def _completed_chunks(self, chunks):
+        if self.executor is not None:
+            yield from self._pooled_chunks(chunks)
+        elif len(chunks) * CHUNK_SIZE >= PARALLEL_THRESHOLD and self.workers > 1:
+            futures = {self.pool().submit(classify_batch, [text for _, text in chunk]): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        else:
+            for chunk in chunks:
+                yield chunk, classify_batch([text for _, text in chunk])
+
+    def _pooled_chunks(self, chunks):
+        # At most ``workers`` chunks of one batch in flight, so a big batch can't fill the shared queue;
+        # a chunk the full pool turns away is classified here rather than dropped
+        pending = {}
+        for chunk in chunks:
+            while len(pending) >= self.workers:
+                yield from self._first_completed(pending)
+            texts = [text for _, text in chunk]
+            try:
+                pending[self.executor.submit(classify_batch, texts)] = chunk
+            except Overloaded:
+                yield chunk, classify_batch(texts)
+        while pending:
+            yield from self._first_completed(pending)
+
+    @staticmethod
+    def _first_completed(pending: dict):
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future.result()
+
+    def classify(self, texts: list):
+        self.cache.warm(settings.sentiment_file_path())
+
+        # ✅ Deduplicate: every distinct text is classified once, however often it repeats
+        positions = {}
+        for i, text in enumerate(texts):
+            positions.setdefault(text_hash(text), []).append(i)
+
+        hits, misses = [], []
+        for key, indices in positions.items():
+            cached = self.cache.get(key)
+            if cached is None:
+                misses.append((key, texts[indices[0]]))
+            else:
+                hits.extend(self._expand(indices, texts, cached, cached=True))
+        if hits:
+            yield hits
+
+        chunks = [misses[i:i + CHUNK_SIZE] for i in range(0, len(misses), CHUNK_SIZE)]
+        for chunk, labels in self._completed_chunks(chunks):
+            now = datetime.utcnow().isoformat()
+            rows, results = [], []
+            for (key, text), (label, polarity) in zip(chunk, labels):
+                self.cache.set(key, (label, polarity))
+                rows.append({"textHash": key, "text": text, "sentiment": label,
+                             "polarity": polarity, "classifiedAt": now})
+                results.extend(self._expand(positions[key], texts, (label, polarity), cached=False))
+            if self.persist:
+                append_rows(settings.sentiment_file_path(), rows, fieldnames=SENTIMENT_COLUMNS)
+            for listener in self._listeners:
+                listener(rows)
+            yield results
+
+    @staticmethod
+    def _expand(indices, texts, result, cached: bool):
+        label, polarity = result
+        return [{"index": i, "text": texts[i], "sentiment": label, "polarity": polarity, "cached": cached}
+                for i in indices]
+
+    def classify_all(self, texts: list) -> list:
+        results = [None] * len(texts)
+        for chunk in self.classify(texts):
+            for result in chunk:
+                results[result["index"]] = result
+        return results
+
+
+sentiment_classifier = BatchSentimentClassifier(executor=cpu_pool)
+
+# ✅ Live review feed: reviews.csv tail + POSTed reviews -> micro-batches -> windowed aggregates
+sentiment_window = SentimentWindow()
+_review_stream = None
+_review_stream_lock = threading.Lock()
+
+
+def review_stream() -> SentimentStream:
+    global _review_stream
+    with _review_stream_lock:
+        if _review_stream is None:
+            stream = SentimentStream(sentiment_classifier, sentiment_window).start()
+            if os.path.isdir(settings.SENTIMENT_DIR):
+                stream.follow_file(settings.reviews_file_path())
+            _review_stream = stream
+        return _review_stream
+
+
+def ingest_reviews(texts: list) -> int:
+    review_stream().submit(texts)
+    return len(texts)
+
 
-# Simulate Twitter sentiment response
 def analyze_sentiment():
-    sentiments = ["positive", "neutral", "negative"]
-    sample = random.choice(sentiments)
-    return {"status": "success", "sentiment": sample}
+    # O(1): the aggregates are maintained by the stream, nothing is computed per request
+    stream = review_stream()
+    return {"status": "success", **sentiment_window.snapshot(), "stream": stream.stats()}
@@ -0,0 +1,310 @@
+"""CSV snapshots shared by every worker process through memory-mapped NumPy columns.
+
+With ``SHARED_SNAPSHOTS=1`` the DataStore stops parsing CSVs in each worker.
+The first process to notice a change parses the file once, under a file lock,
+and publishes an immutable columnar copy under ``SHARED_DIR`` (RAM-backed
+/dev/shm by default). Every worker then maps that copy instead of holding its
+own:
+
+- each column is dictionary-encoded: codes (int8/16/32) plus the sorted
+  distinct values. ``raw`` columns are Categoricals over the mapped codes,
+  so they compare, sort and serialize like the strings they stand for.
+- numeric columns of the typed ``frame`` are stored as int64/float64 arrays
+  and mapped as they are.
+- encoded list bodies (``row_codec.encoded_body``) are written into the
+  version directory by the first worker that needs them and mapped by all.
+
+Everything else derived from a snapshot stays per process, one copy per live
+version (the previous version's is dropped with it): lookup dicts, sort
+orders, decoded rows of the small tables and the chatbot's search index,
+which pool workers build from the mapped frame.
+
+A version is a directory ``v<time_ns>``; ``current`` names the live one and
+is swapped with an atomic rename. Its ``meta["version"]`` number is a
+counter seeded from the clock in microseconds, so it stays exact in JSON
+(below 2**53). A ``get`` costs two ``os.stat`` calls, so every worker sees
+a new version on its next request.
+
+Keep them fresh from one loader process (optional, workers publish on
+demand anyway):
+    python -m app.services.shared_snapshots watch      (run from backend/)
+"""
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.utils.file_lock import FileLock
+from app.utils.metrics import CACHE_REQUESTS, CSV_PARSE_SECONDS, CSV_ROWS_READ
+
+logger = logging.getLogger(__name__)
+
+# ✅ Off by default; turn on when running several uvicorn/gunicorn workers
+SHARED_SNAPSHOTS = os.getenv("SHARED_SNAPSHOTS", "0") == "1"
+SHARED_DIR = os.getenv("SHARED_DIR") or os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "smartstore-snapshots")
+KEEP_VERSIONS = 2  # the live version and the previous one, which workers may still be reading
+MAP_RETRIES = 3  # re-reads of "current" when the version being mapped was pruned meanwhile
+MAX_SAFE_VERSION = 2 ** 53  # larger integers lose precision in JavaScript clients
+
+
+def _code_dtype(categories: int):
+    # The dtype pandas gives Categorical codes, so mapping them needs no copy
+    for dtype in (np.int8, np.int16, np.int32):
+        if categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _signature(path: str) -> list:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _current_stamp(current: str):
+    try:
+        stat = os.stat(current)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+
+def write_columns(target: str, raw: pd.DataFrame, typed: pd.DataFrame) -> list:
+    """Write every column of ``raw`` (strings) and ``typed`` (its typed frame) as .npy files."""
+    columns = []
+    for i, name in enumerate(raw.columns):
+        codes, categories = pd.factorize(raw[name], sort=True)  # sorted, so "" (if any) is code 0
+        dtype = _code_dtype(len(categories))
+        np.save(os.path.join(target, f"{i}.codes.npy"), codes.astype(dtype))
+        np.save(os.path.join(target, f"{i}.values.npy"), np.array(categories.tolist(), dtype=str))
+        column = {"name": name, "typed": None, "blank": bool(len(categories) and categories[0] == "")}
+        if pd.api.types.is_numeric_dtype(typed[name]):
+            np.save(os.path.join(target, f"{i}.typed.npy"), typed[name].to_numpy())
+            column["typed"] = str(typed[name].dtype)
+        elif column["blank"]:
+            # Empty cells become NaN in the typed frame: the same codes shifted past ""
+            np.save(os.path.join(target, f"{i}.frame.npy"), (codes - 1).astype(dtype))
+        columns.append(column)
+    return columns
+
+
+def map_columns(source: str, meta: dict) -> tuple:
+    """``(raw, frame)`` DataFrames over the mapped columns of one published version."""
+    raw, frame = {}, {}
+    for i, column in enumerate(meta["columns"]):
+        load = lambda kind: np.load(os.path.join(source, f"{i}.{kind}.npy"), mmap_mode="r")
+        values = pd.Index(load("values").tolist(), dtype=object)
+        raw[column["name"]] = pd.Categorical.from_codes(load("codes"), dtype=pd.CategoricalDtype(values), validate=False)
+        if column["typed"]:
+            frame[column["name"]] = load("typed")
+        elif column["blank"]:
+            frame[column["name"]] = pd.Categorical.from_codes(
+                load("frame"), dtype=pd.CategoricalDtype(values[1:]), validate=False)
+        else:
+            frame[column["name"]] = raw[column["name"]]
+    names = [column["name"] for column in meta["columns"]]
+    return pd.DataFrame(raw, columns=names, copy=False), pd.DataFrame(frame, columns=names, copy=False)
+
+
+def _map_file(path: str) -> memoryview:
+    with open(path, "rb") as file:
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class SharedSnapshots:
+    """Publishes and maps shared snapshots; one instance per process, keyed by CSV path."""
+
+    def __init__(self, root: str = SHARED_DIR):
+        self.root = root
+        self._mapped = {}  # path -> (stamp of "current", Snapshot)
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def directory(self, path: str) -> str:
+        digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.root, f"{os.path.basename(path)}-{digest}")
+
+    def _path_lock(self, path: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    @staticmethod
+    def _live(directory: str):
+        """``(version directory, meta)`` of the published version, or ``(None, None)``."""
+        try:
+            with open(os.path.join(directory, "current"), encoding="utf-8") as file:
+                source = os.path.join(directory, file.read().strip())
+            with open(os.path.join(source, "meta.json"), encoding="utf-8") as file:
+                return source, json.load(file)
+        except FileNotFoundError:
+            return None, None
+
+    def publish(self, path: str, read) -> tuple:
+        """Parse ``path`` and make the result the live version; returns ``(version directory, meta)``."""
+        from app.services.data_store import _infer_types
+
+        directory = self.directory(path)
+        os.makedirs(directory, exist_ok=True)
+        signature = _signature(path)
+        start = time.perf_counter()
+        raw = read(path)
+        name = os.path.basename(path)
+        CSV_PARSE_SECONDS.observe(time.perf_counter() - start, name)
+        CSV_ROWS_READ.inc(name, amount=len(raw))
+
+        # ✅ Strictly increasing across publishes (they hold the publish lock), JSON-safe
+        _, live = self._live(directory)
+        previous = live["version"] if live is not None and live["version"] < MAX_SAFE_VERSION else 0
+        version = max(time.time_ns() // 1000, previous + 1)
+        stamp = time.time_ns()
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=directory)
+        try:
+            meta = {"path": path, "signature": signature, "version": version, "rows": len(raw),
+                    "columns": write_columns(staging, raw, _infer_types(raw))}
+            with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as file:
+                json.dump(meta, file)
+            source = os.path.join(directory, f"v{stamp}")
+            os.rename(staging, source)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        # ✅ The version bump: one atomic rename, seen by every worker's next stat
+        pointer = os.path.join(directory, f".current-{stamp}")
+        with open(pointer, "w", encoding="utf-8") as file:
+            file.write(os.path.basename(source))
+        os.replace(pointer, os.path.join(directory, "current"))
+        self._prune(directory)
+        logger.info("📤 Published %s (%d rows) as version %d", path, len(raw), version)
+        return source, meta
+
+    @staticmethod
+    def _prune(directory: str):
+        versions = sorted((entry for entry in os.listdir(directory) if entry.startswith("v")),
+                          key=lambda entry: int(entry[1:]))
+        # ✅ Workers still mapping an older version keep their pages until they drop it (POSIX unlink)
+        for entry in versions[:-KEEP_VERSIONS]:
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+    def get(self, path: str, read):
+        """The snapshot of ``path`` mapped from shared memory, published first if the file changed."""
+        from app.services.data_store import Snapshot
+
+        path = os.path.abspath(path)
+        signature = _signature(path)
+        directory = self.directory(path)
+        current = os.path.join(directory, "current")
+        cached = self._mapped.get(path)
+        if cached is not None and cached[0] == _current_stamp(current) and cached[1].signature == tuple(signature):
+            CACHE_REQUESTS.inc("shared_snapshot", "hit")
+            return cached[1]
+
+        with self._path_lock(path):
+            for attempt in range(MAP_RETRIES + 1):
+                stamp = _current_stamp(current)
+                source, meta = self._live(directory)
+                if meta is None or meta["signature"] != signature:
+                    # ✅ One parse per change across all processes; the others wait and map its result
+                    os.makedirs(directory, exist_ok=True)
+                    with FileLock(os.path.join(directory, "publish")):
+                        source, meta = self._live(directory)
+                        if meta is None or meta["signature"] != _signature(path):
+                            source, meta = self.publish(path, read)
+                    stamp = _current_stamp(current)
+                cached = self._mapped.get(path)
+                if cached is not None and cached[1].version == meta["version"]:
+                    self._mapped[path] = (stamp, cached[1])
+                    CACHE_REQUESTS.inc("shared_snapshot", "hit")
+                    return cached[1]
+                try:
+                    raw, frame = map_columns(source, meta)
+                    break
+                except FileNotFoundError:
+                    # ✅ A burst of newer publishes pruned this version before it was mapped: follow "current" again
+                    if attempt == MAP_RETRIES:
+                        raise
+                    logger.debug("🔁 %s was pruned while mapping, re-reading current", source)
+            CACHE_REQUESTS.inc("shared_snapshot", "miss")
+            snapshot = Snapshot(path, tuple(meta["signature"]), raw, version=meta["version"], frame=frame, source=source)
+            self._mapped[path] = (stamp, snapshot)
+            return snapshot
+
+    @staticmethod
+    def map_body(source: str, name: str, build, stale_prefix: str = None) -> memoryview:
+        """``build()`` (bytes) stored in the version directory ``source`` and mapped read-only.
+
+        The first worker to ask builds and writes it; every other worker maps the
+        same pages. Files starting with ``stale_prefix`` (older variants of the
+        body) are removed when a new one is written. Raises FileNotFoundError
+        if ``source`` was pruned meanwhile.
+        """
+        path = os.path.join(source, f"{name}.body")
+        try:
+            return _map_file(path)
+        except FileNotFoundError:
+            pass
+        # Same lock as publish/prune, so ``source`` cannot disappear while it is written
+        with FileLock(os.path.join(os.path.dirname(source), "publish")):
+            if not os.path.isdir(source):
+                raise FileNotFoundError(source)
+            if not os.path.exists(path):
+                staging = f"{path}.{os.getpid()}.tmp"
+                with open(staging, "wb") as file:
+                    file.write(build())
+                os.replace(staging, path)
+                for entry in os.listdir(source) if stale_prefix else []:
+                    if entry.startswith(stale_prefix) and entry.endswith(".body") and entry != os.path.basename(path):
+                        os.remove(os.path.join(source, entry))
+        return _map_file(path)
+
+    def invalidate(self, path: str = None):
+        with self._guard:
+            if path is None:
+                self._mapped.clear()
+            else:
+                self._mapped.pop(os.path.abspath(path), None)
+
+
+shared_snapshots = SharedSnapshots()
+
+
+def watch(paths: list, interval: float):
+    """Loader loop: publish each file as soon as it changes, so workers only ever map."""
+    from app.services.data_store import read_raw
+
+    logger.info("📤 Publishing %d files to %s every %.2fs", len(paths), SHARED_DIR, interval)
+    while True:
+        for path in paths:
+            try:
+                shared_snapshots.get(path, read_raw)
+            except FileNotFoundError:
+                pass
+            except Exception:
+                logger.exception("❌ Could not publish %s", path)
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    from app.services.storage import TABLES
+
+    parser = argparse.ArgumentParser(description="Shared CSV snapshots for multi-worker deployments")
+    parser.add_argument("command", choices=["watch", "publish"])
+    parser.add_argument("--interval", type=float, default=0.05, help="seconds between checks (watch)")
+    args = parser.parse_args()
+    table_paths = [os.path.abspath(file_path()) for file_path, _ in TABLES.values()]
+    if args.command == "watch":
+        watch(table_paths, args.interval)
+    else:
+        from app.services.data_store import read_raw
+        for table_path in table_paths:
+            if os.path.exists(table_path):
+                shared_snapshots.get(table_path, read_raw)
+                print(f"✅ Published {table_path}")
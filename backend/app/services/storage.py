@@ -0,0 +1,483 @@
+"""Pluggable row storage behind the inventory, reorder and driver read paths.
+
+``csv`` (default) serves the CSV files through the shared in-memory data store.
+``sqlite`` keeps typed, indexed tables in one SQLite database, so point
+lookups and filtered scans never parse a file. CSV stays the import/export
+format (and the change feed the watchers tail): writes append to the CSV and
+are mirrored into the active store.
+
+Migrate once with:  python -m app.services.storage migrate   (run from backend/)
+Export back with:   python -m app.services.storage export
+"""
+import argparse
+import csv
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.services.data_store import data_store
+
+# ✅ Logical tables -> CSV path and indexed lookup columns
+TABLES = {
+    "inventory": (settings.inventory_file_path, ["id", "sku"]),
+    "reorders": (settings.reorders_file_path, ["id", "itemId"]),
+    "drivers": (settings.drivers_file_path, ["id"]),
+}
+# ✅ Columns the list endpoints filter and sort on (all indexed in SQLite)
+FILTER_COLUMNS = {
+    "inventory": ["status", "category", "location"],
+    "reorders": ["status", "urgency", "supplier"],
+    "drivers": ["status", "riskLevel", "location"],
+}
+SORT_COLUMNS = {
+    "inventory": ["id", "sku", "name", "currentStock", "price"],
+    "reorders": ["id", "requestedDate", "urgency", "estimatedCost", "quantity"],
+    "drivers": ["id", "name", "safetyScore", "incidents"],
+}
+IMPORT_CHUNK = 100_000
+FETCH_CHUNK = 1000
+
+
+class StorageQueryError(ValueError):
+    pass
+
+
+def csv_path(table: str) -> str:
+    return TABLES[table][0]()
+
+
+def indexed_columns(table: str) -> list:
+    columns = TABLES.get(table, (None, []))[1] + FILTER_COLUMNS.get(table, []) + SORT_COLUMNS.get(table, [])
+    return list(dict.fromkeys(column for column in columns if column != "id"))
+
+
+def check_query(table: str, fieldnames: list, filters: dict, fields: list, sort: str):
+    """Raise StorageQueryError for filters, fields or sort keys the table does not support."""
+    errors = [f"cannot filter on {c!r}" for c in filters if c not in FILTER_COLUMNS.get(table, [])]
+    errors += [f"unknown field {c!r}" for c in fields or [] if c not in fieldnames]
+    if sort is not None and sort not in SORT_COLUMNS.get(table, []):
+        errors.append(f"cannot sort on {sort!r} (one of: {', '.join(SORT_COLUMNS.get(table, []))})")
+    errors += [f"unknown field {c!r}" for c in filters if c in FILTER_COLUMNS.get(table, []) and c not in fieldnames]
+    if errors:
+        raise StorageQueryError("; ".join(errors))
+
+
+class CsvStorage:
+    """Rows straight from the CSV files, parsed once per file change by ``data_store``."""
+
+    name = "csv"
+
+    def _snapshot(self, table: str):
+        return data_store.get(csv_path(table))
+
+    def exists(self, table: str) -> bool:
+        return os.path.exists(csv_path(table))
+
+    def fieldnames(self, table: str) -> list:
+        return self._snapshot(table).fieldnames
+
+    def version(self, table: str) -> int:
+        return self._snapshot(table).version
+
+    def derive(self, table: str, key: str, builder):
+        return self._snapshot(table).derive(key, builder)
+
+    def shared_source(self, table: str):
+        """The shared snapshot version directory ``table`` is mapped from (None unless SHARED_SNAPSHOTS=1)."""
+        return self._snapshot(table).source
+
+    def records(self, table: str) -> list:
+        return self._snapshot(table).records
+
+    def raw_frame(self, table: str) -> pd.DataFrame:
+        # Stored values as read: every cell a string
+        return self._snapshot(table).raw
+
+    def find(self, table: str, column: str, value) -> list:
+        # ✅ Hash index built once per file version; later rows win like in the trackers
+        snapshot = self._snapshot(table)
+        if column not in snapshot.fieldnames:
+            return []
+        lookup = snapshot.derive(f"lookup:{column}", lambda: {
+            key: i for i, key in enumerate(snapshot.raw[column].tolist())
+        })
+        position = lookup.get(str(value))
+        return [] if position is None else self._rows(snapshot, [position])
+
+    def scan(self, table: str, filters: dict = None, limit: int = None) -> list:
+        snapshot = self._snapshot(table)
+        raw = snapshot.raw
+        mask = None
+        for column, value in (filters or {}).items():
+            if column not in raw:
+                return []
+            match = raw[column].to_numpy() == str(value)
+            mask = match if mask is None else mask & match
+        positions = range(len(raw)) if mask is None else mask.nonzero()[0]
+        return self._rows(snapshot, positions[:limit])
+
+    @staticmethod
+    def _rows(snapshot, positions, fields: list = None) -> list:
+        # ✅ Only the matched rows become dicts, not the whole file
+        raw = snapshot.raw if not fields else snapshot.raw[fields]
+        return raw.iloc[list(positions)].to_dict("records")
+
+    @staticmethod
+    def _order(snapshot, sort: str, numeric: bool) -> tuple:
+        """Row positions in ascending ``sort`` order (ties by position) and each position's rank.
+
+        ``numeric`` columns sort by value, the others as text, like their declared SQLite types.
+        """
+        def build():
+            if sort is None:
+                order = np.arange(len(snapshot.raw))
+            else:
+                typed = snapshot.frame[sort]
+                keys = typed if numeric and pd.api.types.is_numeric_dtype(typed) else snapshot.raw[sort]
+                # Empty cells first, like NULLs in SQLite
+                order = keys.reset_index(drop=True).sort_values(kind="stable", na_position="first").index.to_numpy()
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            return order, rank
+        return snapshot.derive(f"order:{sort}", build)
+
+    def query(self, table: str, filters: dict = None, fields: list = None, sort: str = None,
+              descending: bool = False, cursor: dict = None, limit: int = 100) -> tuple:
+        """One page of rows and the cursor of the next page (None on the last page).
+
+        Cursors point at the last returned row, so pages stay stable while rows are appended.
+        """
+        filters = filters or {}
+        snapshot = self._snapshot(table)
+        check_query(table, snapshot.fieldnames, filters, fields, sort)
+        order, rank = self._order(snapshot, sort, _sql_types(table).get(sort, "TEXT") != "TEXT")
+        n = len(order)
+        start = 0
+        if cursor is not None:
+            key = cursor.get("k")
+            if not isinstance(key, int) or not 0 <= key < n:
+                return [], None
+            start = n - rank[key] if descending else rank[key] + 1
+        sequence = (order[::-1] if descending else order)[start:]
+        for column, value in filters.items():
+            sequence = sequence[snapshot.raw[column].to_numpy()[sequence] == str(value)]
+        page = sequence[:limit + 1]
+        rows = self._rows(snapshot, page[:limit], fields)
+        next_cursor = None
+        if len(page) > limit:
+            last = int(page[limit - 1])
+            next_cursor = {"v": snapshot.raw[sort].iat[last] if sort else None, "k": last}
+        return rows, next_cursor
+
+    def iter_rows(self, table: str, filters: dict = None, fields: list = None):
+        """Yield rows straight from the file, one at a time (flat memory for exports)."""
+        filters = {column: str(value) for column, value in (filters or {}).items()}
+        with open(csv_path(table), newline="", encoding="utf-8") as file:
+            reader = csv.DictReader(file)
+            check_query(table, reader.fieldnames or [], filters, fields, None)
+            for row in reader:
+                if all(row.get(column) == value for column, value in filters.items()):
+                    yield {column: row.get(column) for column in fields} if fields else row
+
+    def upsert(self, table: str, rows: list) -> int:
+        # The CSV append already is the write
+        return len(rows)
+
+
+def _sql_types(table: str) -> dict:
+    """Column types declared by the table's row_codec schema.
+
+    Only the schema's int and float columns are numeric; everything else, ids,
+    SKUs and phone numbers included, is TEXT so values like ``007`` survive.
+    """
+    from app.services.row_codec import TABLE_SCHEMAS  # row_codec imports this module
+
+    sql = {int: "INTEGER", float: "REAL"}
+    return {column: sql.get(kind, "TEXT") for column, kind in TABLE_SCHEMAS.get(table, {}).items()}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SqliteStorage:
+    """Typed rows in SQLite (WAL), with a unique ``id`` and indexes on the lookup columns.
+
+    ``id`` is ``UNIQUE`` rather than the primary key: an ``INTEGER PRIMARY KEY``
+    would alias the rowid and reject non-numeric ids (e.g. ``AR-20261018-1``),
+    and the rowid has to stay the insertion order.
+
+    Every table has a version in ``_versions`` that is bumped in the same
+    transaction as each write, so derived values (e.g. encoded response
+    bodies) are cached per version exactly like the CSV snapshots.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._derived = {}
+        self._columns = {}
+        self._lock = threading.RLock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self.connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS _versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def exists(self, table: str) -> bool:
+        return bool(self.fieldnames(table))
+
+    def fieldnames(self, table: str) -> list:
+        columns = self._columns.get(table)
+        if columns is None:
+            rows = self.connection().execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+            columns = [row["name"] for row in rows]
+            if columns:
+                self._ensure_indexes(table, columns)
+                self._columns[table] = columns
+        return columns
+
+    def _ensure_indexes(self, table: str, columns: list):
+        with self.connection() as conn:
+            for column in indexed_columns(table):
+                if column in columns:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_{column}')} "
+                                 f"ON {_quote(table)} ({_quote(column)})")
+
+    def version(self, table: str) -> int:
+        row = self.connection().execute("SELECT version FROM _versions WHERE name = ?", (table,)).fetchone()
+        return row["version"] if row else 0
+
+    def _bump(self, conn, table: str):
+        conn.execute(
+            "INSERT INTO _versions (name, version) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET version = version + 1", (table,))
+
+    def derive(self, table: str, key: str, builder):
+        version = self.version(table)
+        cached = self._derived.get((table, key))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with self._lock:
+            cached = self._derived.get((table, key))
+            if cached is None or cached[0] != version:
+                cached = (version, builder())
+                self._derived[(table, key)] = cached
+            return cached[1]
+
+    def _select(self, table: str, where: str = "", params=(), limit: int = None) -> list:
+        if not self.exists(table):
+            raise FileNotFoundError(f"Table {table!r} not found in {self.path}")
+        sql = f"SELECT * FROM {_quote(table)}{where} ORDER BY rowid"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self.connection().execute(sql, params)]
+
+    def shared_source(self, table: str):
+        return None
+
+    def records(self, table: str) -> list:
+        return self.derive(table, "records", lambda: self._select(table))
+
+    def raw_frame(self, table: str) -> pd.DataFrame:
+        # Stored values as read: typed columns, NULL for empty cells
+        if not self.exists(table):
+            raise FileNotFoundError(f"Table {table!r} not found in {self.path}")
+        return self.derive(table, "raw_frame", lambda: pd.read_sql_query(
+            f"SELECT * FROM {_quote(table)} ORDER BY rowid", self.connection()))
+
+    def find(self, table: str, column: str, value) -> list:
+        if column not in self.fieldnames(table):
+            return []
+        return self._select(table, f" WHERE {_quote(column)} = ?", (value,))
+
+    def scan(self, table: str, filters: dict = None, limit: int = None) -> list:
+        filters = filters or {}
+        if any(column not in self.fieldnames(table) for column in filters):
+            return []
+        where = " AND ".join(f"{_quote(column)} = ?" for column in filters)
+        return self._select(table, f" WHERE {where}" if where else "", tuple(filters.values()), limit)
+
+    def _page_sql(self, table: str, filters: dict, fields: list, sort: str, descending: bool, cursor: dict):
+        columns = ", ".join(map(_quote, fields)) if fields else "*"
+        where = [f"{_quote(column)} = ?" for column in filters]
+        params = list(filters.values())
+        direction, op = ("DESC", "<") if descending else ("ASC", ">")
+        if cursor is not None:
+            if sort is None:
+                where.append(f"rowid {op} ?")
+                params.append(cursor.get("k"))
+            else:
+                # ✅ Keyset condition on (sort, rowid); NULLs sort first ascending, last descending
+                column = _quote(sort)
+                if cursor.get("v") is None:
+                    where.append(f"({column} IS NULL AND rowid {op} ?)" + ("" if descending else f" OR {column} IS NOT NULL"))
+                    params.append(cursor.get("k"))
+                else:
+                    where.append(f"({column} {op} ? OR ({column} = ? AND rowid {op} ?)"
+                                 + (f" OR {column} IS NULL)" if descending else ")"))
+                    params += [cursor.get("v"), cursor.get("v"), cursor.get("k")]
+        order_by = f"{_quote(sort)} {direction}, rowid {direction}" if sort else f"rowid {direction}"
+        sort_column = f", {_quote(sort)} AS __sort" if sort else ""
+        sql = (f"SELECT rowid AS __key{sort_column}, {columns} FROM {_quote(table)}"
+               + (f" WHERE {' AND '.join(where)}" if where else "") + f" ORDER BY {order_by}")
+        return sql, params
+
+    def query(self, table: str, filters: dict = None, fields: list = None, sort: str = None,
+              descending: bool = False, cursor: dict = None, limit: int = 100) -> tuple:
+        """One page of rows and the cursor of the next page (None on the last page); keyset pagination."""
+        filters = filters or {}
+        if not self.exists(table):
+            raise FileNotFoundError(f"Table {table!r} not found in {self.path}")
+        check_query(table, self.fieldnames(table), filters, fields, sort)
+        sql, params = self._page_sql(table, filters, fields, sort, descending, cursor)
+        found = self.connection().execute(f"{sql} LIMIT {int(limit) + 1}", params).fetchall()
+        rows = []
+        for row in found[:limit]:
+            row = dict(row)
+            row.pop("__key")
+            row.pop("__sort", None)
+            rows.append(row)
+        next_cursor = None
+        if len(found) > limit:
+            last = found[limit - 1]
+            next_cursor = {"v": last["__sort"] if sort else None, "k": last["__key"]}
+        return rows, next_cursor
+
+    def iter_rows(self, table: str, filters: dict = None, fields: list = None):
+        """Yield rows from a server-side cursor, FETCH_CHUNK at a time (flat memory for exports)."""
+        filters = filters or {}
+        if not self.exists(table):
+            raise FileNotFoundError(f"Table {table!r} not found in {self.path}")
+        check_query(table, self.fieldnames(table), filters, fields, None)
+        sql, params = self._page_sql(table, filters, fields, None, False, None)
+        # Own connection: a streaming response may resume the generator on another thread
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                found = cursor.fetchmany(FETCH_CHUNK)
+                if not found:
+                    break
+                for row in found:
+                    row = dict(row)
+                    row.pop("__key")
+                    yield row
+        finally:
+            conn.close()
+
+    def create_table(self, table: str, fieldnames: list, types: dict):
+        columns = ", ".join(
+            f"{_quote(column)} {types.get(column, 'TEXT')}" + (" UNIQUE" if column == "id" else "")
+            for column in fieldnames
+        )
+        with self.connection() as conn:
+            conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            conn.execute(f"CREATE TABLE {_quote(table)} ({columns})")
+            self._bump(conn, table)
+        self._columns.pop(table, None)
+
+    def _insert(self, table: str, columns: list, values) -> int:
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT OR REPLACE INTO {_quote(table)} ({', '.join(map(_quote, columns))}) VALUES ({placeholders})"
+        with self.connection() as conn:
+            count = conn.executemany(sql, values).rowcount
+            self._bump(conn, table)
+        return count
+
+    def upsert(self, table: str, rows: list) -> int:
+        """Insert rows, replacing any existing row with the same ``id`` (later rows win, as in the CSV)."""
+        columns = self.fieldnames(table)
+        if not columns or not rows:
+            return 0
+        self._insert(table, columns, ([None if row.get(c) == "" else row.get(c) for c in columns] for row in rows))
+        return len(rows)
+
+    def import_csv(self, table: str, path: str) -> int:
+        """(Re)create ``table`` from a CSV, streaming it in chunks; returns the row count."""
+        count = 0
+        reader = pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=IMPORT_CHUNK)
+        for i, chunk in enumerate(reader):
+            if i == 0:
+                self.create_table(table, list(chunk.columns), _sql_types(table))
+            values = chunk.replace("", None).itertuples(index=False, name=None)
+            self._insert(table, list(chunk.columns), values)
+            count += len(chunk)
+        # ✅ Indexes are built once after the bulk load instead of row by row
+        self._columns.pop(table, None)
+        self.fieldnames(table)
+        return count
+
+    def export_csv(self, table: str, path: str) -> int:
+        columns = self.fieldnames(table)
+        cursor = self.connection().execute(f"SELECT * FROM {_quote(table)} ORDER BY rowid")
+        count = 0
+        with open(path + ".tmp", "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            while True:
+                rows = cursor.fetchmany(IMPORT_CHUNK)
+                if not rows:
+                    break
+                writer.writerows(["" if value is None else value for value in row] for row in rows)
+                count += len(rows)
+        os.replace(path + ".tmp", path)
+        return count
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """The store selected by ``settings.STORAGE_BACKEND`` (``csv`` or ``sqlite``)."""
+    global _storage
+    with _storage_lock:
+        if _storage is None or _storage.name != settings.STORAGE_BACKEND:
+            if settings.STORAGE_BACKEND == "sqlite":
+                _storage = SqliteStorage(settings.SQLITE_PATH)
+            else:
+                _storage = CsvStorage()
+        return _storage
+
+
+def migrate(tables=None, db_path: str = None):
+    store = SqliteStorage(db_path or settings.SQLITE_PATH)
+    for table in tables or TABLES:
+        path = csv_path(table)
+        if not os.path.exists(path):
+            print(f"⚠️ Skipping {table}: {path} not found")
+            continue
+        print(f"📥 {table}: {store.import_csv(table, path)} rows imported from {path}")
+    return store
+
+
+def export(tables=None, db_path: str = None):
+    store = SqliteStorage(db_path or settings.SQLITE_PATH)
+    for table in tables or TABLES:
+        if store.exists(table):
+            print(f"📤 {table}: {store.export_csv(table, csv_path(table))} rows written to {csv_path(table)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move data between the CSV files and the SQLite store.")
+    parser.add_argument("command", choices=["migrate", "export"])
+    parser.add_argument("--tables", nargs="+", choices=list(TABLES))
+    parser.add_argument("--db", help=f"SQLite file (default {settings.SQLITE_PATH})")
+    args = parser.parse_args()
+    (migrate if args.command == "migrate" else export)(args.tables, args.db)
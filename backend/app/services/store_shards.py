@@ -0,0 +1,131 @@
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.services.data_store import Snapshot, data_store, read_raw
+
+SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", str(min(8, os.cpu_count() or 1))))
+SHARD_POOL = os.getenv("SHARD_POOL", "thread")  # "thread" or "process" (parses on other cores)
+DEFAULT_STORE = "main"  # the single DATA_DIR inventory when there are no shards
+STORE_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+STOCK_COLUMNS = ["currentStock", "minStock", "maxStock", "reorderPoint", "reorderQuantity", "leadTime"]
+
+
+def _process_read(pool: ProcessPoolExecutor):
+    return lambda path: pool.submit(read_raw, path).result()
+
+
+class StoreShards:
+    """Inventory partitioned per store: ``<STORES_DIR>/<store>/inventory.csv``.
+
+    Shards are loaded in parallel through the shared DataStore, so each one is
+    cached on its own and only re-parsed when its file changes. The combined
+    frame, and everything derived from it, is cached per tuple of shard
+    versions: editing one store rebuilds the aggregates but re-reads only that
+    store's file.
+    """
+
+    def __init__(self, workers: int = SHARD_WORKERS, pool: str = SHARD_POOL):
+        self.workers = workers
+        self.pool = pool
+        self._executor = None
+        self._process_pool = None
+        self._combined = (None, None, {})  # (versions, frame, derived)
+        self._lock = threading.Lock()
+
+    def stores(self) -> list:
+        root = settings.STORES_DIR
+        if os.path.isdir(root):
+            shards = sorted(
+                name for name in os.listdir(root)
+                if STORE_NAME.match(name) and os.path.exists(settings.store_inventory_file_path(name))
+            )
+            if shards:
+                return shards
+        return [DEFAULT_STORE] if os.path.exists(settings.inventory_file_path()) else []
+
+    def path(self, store: str) -> str:
+        if not STORE_NAME.match(store or ""):
+            raise ValueError(f"Invalid store name: {store!r}")
+        if store == DEFAULT_STORE and not os.path.exists(settings.store_inventory_file_path(store)):
+            return settings.inventory_file_path()
+        return settings.store_inventory_file_path(store)
+
+    def _reader(self):
+        if self.pool != "process":
+            return read_raw
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.workers)
+        return _process_read(self._process_pool)
+
+    def snapshots(self, stores: list = None) -> dict:
+        """``{store: Snapshot}``, loading changed shards in parallel."""
+        stores = self.stores() if stores is None else stores
+        paths = [self.path(store) for store in stores]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="shard-loader")
+        read = self._reader()
+        return dict(zip(stores, self._executor.map(lambda path: data_store.get(path, read), paths)))
+
+    def snapshot(self, store: str) -> Snapshot:
+        return data_store.get(self.path(store))
+
+    def combined(self) -> tuple:
+        """``(versions, frame)``: every shard's typed rows plus a ``store`` column."""
+        snapshots = self.snapshots()
+        versions = tuple((store, snapshot.version) for store, snapshot in snapshots.items())
+        cached_versions, frame, _ = self._combined
+        if cached_versions != versions:
+            frames = []
+            for store, snapshot in snapshots.items():
+                if len(snapshot) and "sku" in snapshot.fieldnames:
+                    part = snapshot.frame.copy()
+                    part["sku"] = snapshot.raw["sku"].to_numpy()  # SKUs stay strings whatever they look like
+                    part.insert(0, "store", store)
+                    frames.append(part)
+            frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["store", "sku"])
+            frame["store"] = frame["store"].astype("category")
+            frame["sku"] = frame["sku"].astype("category")  # factorized once, shared by every aggregate
+            for column in STOCK_COLUMNS:
+                values = frame[column] if column in frame else pd.Series(0, index=frame.index)
+                frame[column] = pd.to_numeric(values, errors="coerce").fillna(0).astype("int64")
+            with self._lock:
+                self._combined = (versions, frame, {})
+        return versions, frame
+
+    def derive(self, key: str, builder):
+        """``builder(frame)`` once per combination of shard versions."""
+        versions, frame = self.combined()
+        cached_versions, _, derived = self._combined
+        if cached_versions != versions:
+            return builder(frame)
+        if key not in derived:
+            derived[key] = builder(frame)
+        return derived[key]
+
+    def stock_by_sku(self) -> pd.DataFrame:
+        """Total stock per SKU across stores: one factorize, then bincounts."""
+        def build(frame):
+            codes, skus = pd.factorize(frame["sku"], sort=True)
+            stock = frame["currentStock"].to_numpy()
+            count = lambda mask=None: np.bincount(codes, mask, len(skus)).astype(np.int64)
+            first = np.unique(codes, return_index=True)[1]
+            return pd.DataFrame({
+                "sku": skus,
+                "name": frame["name"].to_numpy()[first] if "name" in frame else "",
+                "totalStock": count(stock),
+                "stores": count(),  # one row per SKU per store
+                "storesOut": count(stock <= 0),
+                "storesBelowReorderPoint": count(stock <= frame["reorderPoint"].to_numpy()),
+            })
+        return self.derive("stock_by_sku", build)
+
+
+store_shards = StoreShards()
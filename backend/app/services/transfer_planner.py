@@ -0,0 +1,102 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.services.data_store import data_store
+from app.services.store_shards import store_shards
+from app.utils.csv_io import write_frame_atomic
+from app.utils.file_lock import FileLock
+from app.utils.matching import greedy_match
+
+TRANSFER_LEAD_DAYS = int(os.getenv("TRANSFER_LEAD_DAYS", "1"))  # days for stock to move between locations
+TRANSFER_SHIPMENT_COST = float(os.getenv("TRANSFER_SHIPMENT_COST", "25"))  # per transfer
+TRANSFER_UNIT_COST = float(os.getenv("TRANSFER_UNIT_COST", "0.5"))  # per unit moved
+TRANSFER_COLUMNS = ["id", "sku", "name", "fromLocation", "toLocation", "quantity", "transferLeadDays",
+                    "supplierLeadDays", "daysSaved", "estimatedCost", "status", "createdAt"]
+PLANNED = "planned"
+
+
+def target_level(min_stock: np.ndarray, max_stock: np.ndarray) -> np.ndarray:
+    """Middle of the min/max band; just minStock when no usable maxStock is set."""
+    return np.where(max_stock > min_stock, (min_stock + max_stock) // 2, min_stock)
+
+
+def plan_arrays(groups, stock, min_stock, max_stock, lead_time, transfer_lead_days: int = TRANSFER_LEAD_DAYS) -> tuple:
+    """Transfers for one block of (SKU, location) rows: ``(donor rows, receiver rows, quantities)``.
+
+    Locations below minStock are topped up to their target level, but only
+    when the supplier (``lead_time`` days, 0 = unknown) is slower than a
+    transfer. Locations above their target give the excess. Stock-outs are
+    served first, then the longest supplier lead times; greedy largest-first
+    matching keeps the number of shipments (the fixed cost) low.
+    """
+    target = target_level(min_stock, max_stock)
+    short = (stock < min_stock) & ((lead_time <= 0) | (lead_time > transfer_lead_days))
+    need = np.where(short, target - stock, 0)
+    spare = np.where(stock > target, stock - target, 0)
+    return greedy_match(groups, spare, need, receiver_keys=(-lead_time, stock > 0))
+
+
+def location_frame() -> pd.DataFrame:
+    """Per-location rows: one per store shard, or per ``location`` of the single inventory file."""
+    _, frame = store_shards.combined()
+    if frame["store"].nunique() <= 1 and "location" in frame:
+        return frame.assign(store=frame["location"].astype("category"))
+    return frame
+
+
+def plan_transfers(frame: pd.DataFrame, transfer_lead_days: int = TRANSFER_LEAD_DAYS) -> pd.DataFrame:
+    if frame.empty:
+        return pd.DataFrame(columns=TRANSFER_COLUMNS)
+    groups, skus = pd.factorize(frame["sku"])
+    stock = frame["currentStock"].to_numpy()
+    lead_time = frame["leadTime"].to_numpy()
+    donor, receiver, quantity = plan_arrays(groups, stock, frame["minStock"].to_numpy(),
+                                            frame["maxStock"].to_numpy(), lead_time, transfer_lead_days)
+    stamp = datetime.utcnow()
+    supplier_lead = lead_time[receiver]
+    return pd.DataFrame({
+        "id": [f"TR-{stamp:%Y%m%d%H%M%S}-{i + 1}" for i in range(len(quantity))],
+        "sku": skus[groups[receiver]],
+        "name": frame["name"].to_numpy()[receiver] if "name" in frame else "",
+        "fromLocation": frame["store"].to_numpy()[donor],
+        "toLocation": frame["store"].to_numpy()[receiver],
+        "quantity": quantity,
+        "transferLeadDays": transfer_lead_days,
+        "supplierLeadDays": supplier_lead,
+        "daysSaved": np.where(supplier_lead > 0, supplier_lead - transfer_lead_days, 0).clip(0),
+        "estimatedCost": (TRANSFER_SHIPMENT_COST + TRANSFER_UNIT_COST * quantity).round(2),
+        "status": PLANNED,
+        "createdAt": stamp.isoformat(),
+    }, columns=TRANSFER_COLUMNS)
+
+
+def current_plan() -> pd.DataFrame:
+    """The plan for the current stock, computed once per combination of shard versions."""
+    return store_shards.derive("transfer_plan", lambda _: plan_transfers(location_frame()))
+
+
+def plan_summary(plan: pd.DataFrame) -> dict:
+    return {
+        "transfers": int(len(plan)),
+        "units": int(plan["quantity"].sum()) if len(plan) else 0,
+        "skus": int(plan["sku"].nunique()),
+        "locations": int(pd.concat([plan["fromLocation"], plan["toLocation"]]).nunique()) if len(plan) else 0,
+        "estimatedCost": round(float(plan["estimatedCost"].sum()), 2) if len(plan) else 0.0,
+    }
+
+
+def save_plan(plan: pd.DataFrame, path: str = None) -> str:
+    """Replace the planned rows of transfers.csv with ``plan``; rows in any other status are kept."""
+    path = path or settings.transfers_file_path()
+    with FileLock(path):
+        kept = pd.DataFrame(columns=TRANSFER_COLUMNS)
+        if os.path.exists(path):
+            existing = data_store.get(path).raw
+            if "status" in existing:
+                kept = existing[existing["status"] != PLANNED]
+        write_frame_atomic(path, pd.concat([kept, plan], ignore_index=True)[TRANSFER_COLUMNS])
+    return path
@@ -0,0 +1,225 @@
+import itertools
+import re
+import threading
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services.cpu_pool import DeadlineExceeded, Overloaded
+from app.services.csv_qa import ask
+from app.utils.file_watcher import RowStateTracker
+from realtime_pipeline.inventory_tracker import InventoryTracker
+
+SPOKEN_ITEMS = 5  # names read out before "and N more"
+URGENCY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+STOCK_STATES = ["in-stock", "low-stock", "out-of-stock"]
+
+# ✅ Common commands answered from precomputed summaries, checked in this order
+COMMANDS = [
+    ("out_of_stock", ["out of stock", "out-of-stock", "sold out"]),
+    ("low_stock", ["low stock", "low-stock", "running low"]),
+    ("pending_reorders", ["pending reorders", "pending reorder", "pending orders", "pending order",
+                          "reorders", "reorder", "restock"]),
+    ("inventory_status", ["inventory status", "stock status", "inventory"]),
+]
+COMMAND_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{name}>" + "|".join(r"\b" + re.escape(k) + r"\b" for k in keywords) + ")" for name, keywords in COMMANDS
+    )
+)
+# Words a command may be wrapped in; anything else ("reorder status for Laptop Pro") goes to the chatbot
+FILLER_WORDS = {
+    "a", "about", "all", "any", "are", "current", "currently", "do", "give", "have", "hey", "how", "is", "items",
+    "list", "me", "my", "now", "our", "please", "products", "right", "show", "status", "tell", "the", "there",
+    "today", "us", "we", "what", "what's", "whats", "which",
+}
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+
+def classify_command(query: str) -> str:
+    text = query.lower()
+    found = {m.lastgroup for m in COMMAND_PATTERN.finditer(text)}
+    if not found or any(word not in FILLER_WORDS for word in WORD_PATTERN.findall(COMMAND_PATTERN.sub(" ", text))):
+        return None
+    return next(name for name, _ in COMMANDS if name in found)
+
+
+def _stock_state(row: dict) -> str:
+    status = (row.get("status") or "").lower()
+    if status in STOCK_STATES:
+        return status
+    try:
+        stock = float(row.get("currentStock") or 0)
+        reorder_point = float(row.get("reorderPoint") or 0)
+    except ValueError:
+        return "in-stock"
+    if stock <= 0:
+        return "out-of-stock"
+    return "low-stock" if stock <= reorder_point else "in-stock"
+
+
+def _plural(n: int, word: str) -> str:
+    return f"{n} {word}" if n == 1 else f"{n} {word}s"
+
+
+def _spoken_list(names: list, total: int) -> str:
+    if total > len(names):
+        return ", ".join(names) + f" and {total - len(names)} more"
+    if len(names) > 1:
+        return ", ".join(names[:-1]) + " and " + names[-1]
+    return names[0]
+
+
+class VoiceSummaries:
+    """Stock and reorder summaries for the voice assistant, maintained from tracker diffs.
+
+    Each diff only touches the rows it carries, so keeping the summaries
+    current costs O(changed rows). Spoken replies are rendered once per
+    version and reused until the next change.
+    """
+
+    def __init__(self):
+        self.items = {}  # inventory id -> (name, stock state)
+        self.by_state = {state: {} for state in STOCK_STATES}  # stock state -> {id: name}
+        self.pending = {}  # reorder id -> (itemName, quantity, urgency)
+        self.version = 0
+        self._replies = {}
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._trackers = None
+
+    @property
+    def started(self) -> bool:
+        return self._trackers is not None
+
+    def ensure_started(self):
+        """Start both trackers (parses inventory and reorders once); blocking, keep it off the event loop."""
+        if self._trackers is not None:
+            return
+        with self._start_lock:
+            if self._trackers is None:
+                inventory = InventoryTracker(settings.inventory_file_path())
+                inventory.add_listener(self.apply_inventory)
+                reorders = RowStateTracker(settings.reorders_file_path())
+                reorders.add_listener(self.apply_reorders)
+                inventory.start()  # delivers the current file as the first diff
+                reorders.start()
+                self._trackers = (inventory, reorders)
+
+    def apply_inventory(self, diff: dict):
+        with self._lock:
+            for row in diff["added"] + diff["changed"]:
+                key = row.get("id")
+                old = self.items.get(key)
+                if old is not None:
+                    self.by_state[old[1]].pop(key, None)
+                name, state = row.get("name") or f"item {key}", _stock_state(row)
+                self.items[key] = (name, state)
+                self.by_state[state][key] = name
+            for key in diff["removed"]:
+                old = self.items.pop(key, None)
+                if old is not None:
+                    self.by_state[old[1]].pop(key, None)
+            self._changed()
+
+    def apply_reorders(self, diff: dict):
+        with self._lock:
+            for row in diff["added"] + diff["changed"]:
+                key = row.get("id")
+                if (row.get("status") or "").lower() == "pending":
+                    self.pending[key] = (row.get("itemName") or f"item {row.get('itemId')}",
+                                         row.get("quantity") or "0", (row.get("urgency") or "").lower())
+                else:
+                    self.pending.pop(key, None)
+            for key in diff["removed"]:
+                self.pending.pop(key, None)
+            self._changed()
+
+    def _changed(self):
+        self.version += 1
+        self._replies = {}
+
+    def reply(self, command: str) -> list:
+        """Sentences of the spoken reply to ``command`` (one of COMMANDS)."""
+        self.ensure_started()
+        with self._lock:
+            sentences = self._replies.get(command)
+            if sentences is None:
+                sentences = self._replies[command] = getattr(self, f"_render_{command}")()
+            return sentences
+
+    def _names(self, state: str) -> tuple:
+        items = self.by_state[state]
+        return list(itertools.islice(items.values(), SPOKEN_ITEMS)), len(items)
+
+    def _render_out_of_stock(self) -> list:
+        names, total = self._names("out-of-stock")
+        if not total:
+            return ["Nothing is out of stock."]
+        return [f"{_plural(total, 'item')} {'is' if total == 1 else 'are'} out of stock:",
+                f"{_spoken_list(names, total)}.", "Please reorder them." if total > 1 else "Please reorder it."]
+
+    def _render_low_stock(self) -> list:
+        names, total = self._names("low-stock")
+        if not total:
+            return ["No items are running low."]
+        return [f"{_plural(total, 'item')} {'is' if total == 1 else 'are'} running low:", f"{_spoken_list(names, total)}."]
+
+    def _render_pending_reorders(self) -> list:
+        total = len(self.pending)
+        if not total:
+            return ["There are no pending reorders."]
+        urgent = sorted(self.pending.values(), key=lambda p: URGENCY_ORDER.get(p[2], len(URGENCY_ORDER)))
+        critical = sum(1 for p in self.pending.values() if p[2] == "critical")
+        sentences = [f"There {'is' if total == 1 else 'are'} {_plural(total, 'pending reorder')}"
+                     + (f", {critical} critical." if critical else ".")]
+        sentences += [f"{name}, {quantity} units, {urgency or 'no urgency set'}." for name, quantity, urgency in urgent[:SPOKEN_ITEMS]]
+        if total > SPOKEN_ITEMS:
+            sentences.append(f"And {total - SPOKEN_ITEMS} more.")
+        return sentences
+
+    def _render_inventory_status(self) -> list:
+        counts = {state: len(items) for state, items in self.by_state.items()}
+        sentences = [
+            f"Here is your current inventory status: {_plural(len(self.items), 'item')},"
+            f" {counts['in-stock']} in stock, {counts['low-stock']} running low"
+            f" and {counts['out-of-stock']} out of stock."
+        ]
+        names, total = self._names("out-of-stock")
+        if total:
+            sentences.append(f"Please reorder {_spoken_list(names, total)}.")
+        return sentences
+
+
+voice_summaries = VoiceSummaries()
+
+
+async def reply_chunks(query: str, acknowledge: bool = True):
+    """Yield the reply sentence by sentence; anything that isn't a common command goes to the chatbot engine."""
+    command = classify_command(query)
+    if command is not None:
+        if not voice_summaries.started:
+            await run_in_threadpool(voice_summaries.ensure_started)
+        for sentence in voice_summaries.reply(command):
+            yield sentence
+        return
+    if acknowledge:
+        yield "Let me check."  # lets a TTS client start speaking while the search runs
+    try:
+        answer = await ask(query)
+    except (Overloaded, DeadlineExceeded):
+        yield "Sorry, I'm busy right now. Please ask again in a moment."
+        return
+    for part in answer.split("\n\n"):
+        yield _speakable(part)
+
+
+def _speakable(text: str) -> str:
+    # Chatbot answers are laid out for a screen: drop the leading emoji and read column values as a list
+    lines = [" ".join(line.split()) for line in text.splitlines() if line.strip()]
+    if not lines:
+        return ""
+    head, values = lines[0].lstrip("📦🔁🔍⚠️❌ "), ", ".join(lines[1:])
+    if not values:
+        return head
+    return f"{head} {values}" if head.endswith(":") else f"{head}, {values}"
@@ -0,0 +1,127 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# ✅ On by default; WARMUP=0 loads everything on first use instead (quickest reloads in development)
+WARMUP = os.getenv("WARMUP", "1") == "1"
+
+
+class Warmup:
+    """Background start-up work, run in order on one thread after the server is already answering.
+
+    Each step is a ``(name, fn)``; its state, duration and error are kept for
+    the readiness endpoint. The server is ready once every step has finished
+    without error.
+    """
+
+    def __init__(self, steps: list = None):
+        self.steps = list(steps or [])
+        self.state = {name: {"status": "pending"} for name, _ in self.steps}
+        self.started_at = None
+        self.finished_at = None
+        self._thread = None
+
+    def add(self, name: str, fn):
+        self.steps.append((name, fn))
+        self.state[name] = {"status": "pending"}
+
+    def run(self):
+        self.started_at = time.time()
+        for name, fn in self.steps:
+            self.state[name] = {"status": "running"}
+            start = time.perf_counter()
+            try:
+                fn()
+                self.state[name] = {"status": "done"}
+            except Exception as e:
+                self.state[name] = {"status": "failed", "error": str(e)}
+                logger.exception("❌ Warm-up step %s failed", name)
+            self.state[name]["seconds"] = round(time.perf_counter() - start, 3)
+        self.finished_at = time.time()
+        logger.info("🔥 Warm-up finished in %.2fs", self.finished_at - self.started_at)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def wait(self, timeout: float = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready()
+
+    def ready(self) -> bool:
+        return self.finished_at is not None and all(step["status"] == "done" for step in self.state.values())
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready(),
+            "seconds": round((self.finished_at or time.time()) - self.started_at, 3) if self.started_at else None,
+            "steps": self.state,
+        }
+
+
+def _load_tables():
+    # ✅ Parse the CSVs (or open the SQLite tables) the list and lookup endpoints read
+    from app.services.storage import TABLES, get_storage
+    store = get_storage()
+    for table in TABLES:
+        if store.exists(table):
+            store.fieldnames(table)
+
+
+def _load_search_index():
+    from app.services import csv_qa
+    try:
+        csv_qa.get_search_index(csv_qa.inventory_snapshot())
+    except FileNotFoundError:
+        pass
+
+
+def _load_vector_index():
+    # ✅ The writer embeds every row here instead of inside the first (deadline-bound) vector question
+    from app.services.csv_qa import CHATBOT_SEARCH
+    if CHATBOT_SEARCH == "vector":
+        from realtime_pipeline.vector_indexer import get_indexer
+        get_indexer()
+
+
+def _start_voice_summaries():
+    from app.services.voice_service import voice_summaries
+    voice_summaries.ensure_started()
+
+
+def _start_live_feeds():
+    # ✅ The trackers parse their whole file once; done here instead of on the first stream client
+    from app.services.live_feed import drivers_feed, inventory_feed
+    for feed in (inventory_feed, drivers_feed):
+        try:
+            feed.ensure_started()
+        except FileNotFoundError:
+            pass
+
+
+def _start_auto_reorder():
+    from app.services.auto_reorder_service import AUTO_REORDER, get_auto_reorder
+    if AUTO_REORDER:
+        get_auto_reorder()
+
+
+def start_warmup(pool_ready: list = ()) -> Warmup:
+    """Start the warm-up thread; ``pool_ready`` are the futures of the CPU workers' own warm-up."""
+    warmup = Warmup()
+    if WARMUP:
+        warmup.add("tables", _load_tables)
+        if not pool_ready:
+            warmup.add("search_index", _load_search_index)  # chatbot searches run in this process
+        warmup.add("vector_index", _load_vector_index)  # vector searches always run in this process
+        warmup.add("voice", _start_voice_summaries)
+        warmup.add("live_feeds", _start_live_feeds)
+    warmup.add("auto_reorder", _start_auto_reorder)
+    # ✅ The workers warm up in their own processes meanwhile; last, so it rarely waits
+    warmup.add("cpu_pool", lambda: [future.result() for future in pool_ready])
+    return warmup.start()
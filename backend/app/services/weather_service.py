@@ -1,37 +1,145 @@
+import asyncio
 import os
-import requests
+
+import httpx
 from dotenv import load_dotenv
 
+from app.utils.cache import TTLCache
+
 # Load .env file from project root
 env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '.env'))
 load_dotenv(dotenv_path=env_path)
 
 API_KEY = os.getenv("WEATHER_API_KEY")
+# ✅ Overridable so tests and benchmarks can point at a local fake upstream
+WEATHER_API_URL = os.getenv("WEATHER_API_URL", "https://api.openweathermap.org/data/2.5/weather")
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+WEATHER_CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", "1024"))
+
+
+def _parse_weather(city: str, data: dict) -> dict:
+    # Extract all needed values safely
+    weather = data.get("weather", [{}])[0]
+    main = data.get("main", {})
+    wind = data.get("wind", {})
+
+    return {
+        "city": city,
+        "status": weather.get("main", "Unknown"),
+        "description": weather.get("description", ""),
+        "temperature": main.get("temp", 0),
+        "humidity": main.get("humidity", 0),
+        "wind_speed": wind.get("speed", 0),
+        "uv_index": 6,  # You can later fetch this via One Call API
+        "alert": weather.get("main") in ["Rain", "Thunderstorm", "Snow"]
+    }
+
 
-def fetch_weather(city: str):
-    url = f"https://api.openweathermap.org/data/2.5/weather?q={city}&appid={API_KEY}&units=metric"
+class WeatherClient:
+    """Async OpenWeather client.
+
+    Uses one pooled keep-alive connection set with strict timeouts and a
+    per-city TTL/LRU cache. Concurrent requests for the same uncached city
+    share a single upstream call (single-flight).
+    """
+
+    def __init__(self, base_url: str = WEATHER_API_URL, api_key: str = API_KEY,
+                 ttl: float = WEATHER_CACHE_TTL, max_entries: int = WEATHER_CACHE_SIZE,
+                 timeout: httpx.Timeout = None, limits: httpx.Limits = None, transport=None):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.cache = TTLCache(ttl, max_entries)
+        self.timeout = timeout or httpx.Timeout(5.0, connect=2.0)
+        self.limits = limits or httpx.Limits(max_connections=20, max_keepalive_connections=20)
+        self.transport = transport
+        self._client = None
+        self._loop = None
+        self._inflight = {}
+        self.upstream_calls = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+
+    def _http(self) -> httpx.AsyncClient:
+        # Connections belong to one event loop; a new loop (e.g. a reloaded worker) gets a new pool
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                self._close_stale(self._client, self._loop)
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, transport=self.transport)
+            self._loop = loop
+        return self._client
+
+    @staticmethod
+    def _close_stale(client: httpx.AsyncClient, loop):
+        # ✅ Close the old pool on its own loop if it still runs; otherwise drop its connections here
+        async def close():
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(close(), loop)
+        else:
+            asyncio.ensure_future(close())
 
-    try:
-        response = requests.get(url)
-        data = response.json()
+    async def _fetch_upstream(self, key: str, city: str) -> dict:
+        self.upstream_calls += 1
+        params = {"q": city, "appid": self.api_key, "units": "metric"}
+        try:
+            response = await self._http().get(self.base_url, params=params)
+            data = response.json()
+        except httpx.TimeoutException:
+            return {"error": f"Weather service timed out for {city}"}
+        except Exception as e:
+            return {"error": str(e)}
 
         if response.status_code == 200:
-            # Extract all needed values safely
-            weather = data.get("weather", [{}])[0]
-            main = data.get("main", {})
-            wind = data.get("wind", {})
-
-            return {
-                "city": city,
-                "status": weather.get("main", "Unknown"),
-                "description": weather.get("description", ""),
-                "temperature": main.get("temp", 0),
-                "humidity": main.get("humidity", 0),
-                "wind_speed": wind.get("speed", 0),
-                "uv_index": 6,  # You can later fetch this via One Call API
-                "alert": weather.get("main") in ["Rain", "Thunderstorm", "Snow"]
-            }
+            result = _parse_weather(city, data)
+            self.cache.set(key, result)  # errors are never cached
+            return result
+        return {"error": data.get("message", "Failed to get weather")}
+
+    async def fetch(self, city: str) -> dict:
+        key = city.strip().lower()
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return dict(cached, city=city)
+
+        # ✅ Single-flight: join the request already in progress for this city
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
         else:
-            return {"error": data.get("message", "Failed to get weather")}
-    except Exception as e:
-        return {"error": str(e)}
+            task = asyncio.ensure_future(self._fetch_upstream(key, city))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        result = await asyncio.shield(task)
+        return result if "error" in result else dict(result, city=city)
+
+    async def fetch_many(self, cities: list) -> list:
+        return list(await asyncio.gather(*(self.fetch(city) for city in cities)))
+
+    def stats(self) -> dict:
+        return {
+            "upstream_calls": self.upstream_calls,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "cached_cities": len(self.cache),
+        }
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+weather_client = WeatherClient()
+
+
+async def fetch_weather(city: str):
+    return await weather_client.fetch(city)
+
+
+async def fetch_weather_many(cities: list):
+    return await weather_client.fetch_many(cities)
@@ -0,0 +1,89 @@
+import csv
+import os
+import tempfile
+
+from app.utils.file_lock import FileLock
+
+
+def read_header(path: str) -> list:
+    """Column names from the first line of ``path`` ([] if missing or empty)."""
+    try:
+        with open(path, mode="r", newline="", encoding="utf-8") as file:
+            return next(csv.reader(file), [])
+    except FileNotFoundError:
+        return []
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        if file.tell() == 0:
+            return True
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) in (b"\n", b"\r")
+
+
+def append_rows(path: str, rows: list, fieldnames: list = None, lock: bool = True) -> list:
+    """Append ``rows`` (dicts) under the file lock without rewriting the file.
+
+    Columns follow the existing header. A header is written first if the file
+    is new or empty, and a missing trailing newline is repaired. Returns the
+    header that was used. Pass ``lock=False`` when the caller already holds
+    ``FileLock(path)``.
+    """
+    if lock:
+        with FileLock(path):
+            return append_rows(path, rows, fieldnames, lock=False)
+    header = read_header(path) or list(fieldnames or [])
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, mode="a", newline="", encoding="utf-8") as file:
+        if not new_file and not _ends_with_newline(path):
+            file.write("\n")
+        writer = csv.DictWriter(file, fieldnames=header, extrasaction="ignore")
+        if new_file:
+            writer.writeheader()
+        writer.writerows(rows)
+    return header
+
+
+def write_rows_atomic(path: str, fieldnames: list, rows) -> int:
+    """Replace ``path`` with ``rows`` via temp file + rename, so readers never see a partial file.
+
+    Callers that read-modify-write must already hold ``FileLock(path)``.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".csv", dir=directory)
+    count = 0
+    try:
+        with os.fdopen(fd, mode="w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def write_frame_atomic(path: str, frame) -> int:
+    """``write_rows_atomic`` for a DataFrame (pandas' C writer, for large files)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".csv", dir=directory)
+    try:
+        with os.fdopen(fd, mode="w", newline="", encoding="utf-8") as file:
+            frame.to_csv(file, index=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(frame)
@@ -0,0 +1,69 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_thread_locks = {}
+_guard = threading.Lock()
+
+
+def _thread_lock(path: str) -> threading.Lock:
+    with _guard:
+        return _thread_locks.setdefault(path, threading.Lock())
+
+
+class FileLock:
+    """Exclusive lock on ``<path>.lock``, held across threads and processes.
+
+    Writers of the same CSV (uvicorn workers, pipeline scripts) take it
+    before appending or replacing the file.
+    """
+
+    def __init__(self, path: str):
+        self.lock_path = os.path.abspath(path) + ".lock"
+        self._thread_lock = _thread_lock(self.lock_path)
+        self._file = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        """Take the lock; with ``blocking=False`` return False at once if someone else holds it."""
+        if not self._thread_lock.acquire(blocking):
+            return False
+        try:
+            self._file = open(self.lock_path, "a+")
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        except BaseException as e:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._thread_lock.release()
+            if not blocking and isinstance(e, OSError):
+                return False
+            raise
+        return True
+
+    def release(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._file.close()
+        finally:
+            self._file = None
+            self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
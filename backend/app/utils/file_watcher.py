@@ -1,2 +1,458 @@
-def watch_folder(path):
+import csv
+import ctypes
+import ctypes.util
+import hashlib
+import io
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# inotify(7) event masks
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+DELIVERY_WORKERS = int(os.getenv("WATCH_DELIVERY_WORKERS", "4"))  # files whose callbacks run at the same time
+HEAD_BYTES = 4096  # a hash of this much of the file start tells an in-place rewrite from an append
+
+logger = logging.getLogger(__name__)
+
+
+class FileChange:
+    """Rows appended to a watched CSV since the last delivery.
+
+    ``reset`` is True when the file was created, truncated or replaced (e.g.
+    an atomic rewrite). ``rows`` then holds the whole file instead of a tail.
+    """
+
+    def __init__(self, path: str, header: list, rows: list, reset: bool):
+        self.path = path
+        self.header = header
+        self.rows = rows
+        self.reset = reset
+
+    def __repr__(self):
+        return f"FileChange({self.path!r}, rows={len(self.rows)}, reset={self.reset})"
+
+
+def _record_end(data: bytes) -> int:
+    """Offset just past the last complete CSV record in ``data``, 0 if there is none.
+
+    A record ends at a newline outside quotes, i.e. after an even number of
+    ``"`` (the csv module's default dialect doubles quotes inside fields), so
+    quoted multi-line fields are never split. ``data`` must start at a record.
+    """
+    end = data.rfind(b"\n") + 1
+    quotes = data.count(b'"', 0, end)
+    while end and quotes % 2:
+        previous = data.rfind(b"\n", 0, end - 1) + 1
+        quotes -= data.count(b'"', previous, end)
+        end = previous
+    return end
+
+
+class CsvTail:
+    """Reads only the complete records appended to a CSV since the last offset."""
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self.header = []
+        self.offset = 0
+        self.inode = None
+        self.head = None
+
+    def _parse(self, data: bytes) -> list:
+        text = data.decode("utf-8")
+        return [dict(zip(self.header, values)) for values in csv.reader(io.StringIO(text)) if values]
+
+    def _head(self, file) -> bytes:
+        file.seek(0)
+        return hashlib.sha1(file.read(min(self.offset, HEAD_BYTES))).digest()
+
+    def read_all(self):
+        self.header, self.offset, self.inode, self.head = [], 0, None, None
+        return self.read_new(force_reset=True)
+
+    def read_new(self, force_reset: bool = False):
+        """Return a FileChange for the new bytes, or None if nothing complete was appended."""
+        try:
+            with open(self.path, "rb") as file:
+                stat = os.fstat(file.fileno())
+                # ✅ Same inode rewritten in place (to any size) changes the bytes we already read
+                reset = (force_reset or stat.st_ino != self.inode or stat.st_size < self.offset
+                         or (self.head is not None and self._head(file) != self.head))
+                if reset:
+                    self.inode, self.offset, self.header, self.head = stat.st_ino, 0, [], None
+                file.seek(self.offset)
+                data = file.read()
+
+                # ✅ Leave a partially written last record for the next event
+                end = _record_end(data)
+                if end == 0 and not reset:
+                    return None
+                data = data[:end]
+                self.offset += end
+                if self.head is None or self.offset - end < HEAD_BYTES:
+                    self.head = self._head(file)
+        except FileNotFoundError:
+            if self.inode is None:
+                return None
+            self.inode, self.offset, self.header, self.head = None, 0, [], None
+            return FileChange(self.path, [], [], reset=True)
+
+        if not self.header:
+            newline = data.find(b"\n")
+            if newline < 0:
+                return FileChange(self.path, [], [], reset=True) if reset else None
+            self.header = next(csv.reader([data[:newline].decode("utf-8").strip("\r")]), [])
+            data = data[newline + 1:]
+
+        rows = self._parse(data)
+        if not rows and not reset:
+            return None
+        return FileChange(self.path, list(self.header), rows, reset)
+
+    def snapshot(self):
+        """The rows up to the current offset as a reset FileChange, or None if the file moved on since."""
+        if self.inode is None:
+            return FileChange(self.path, [], [], reset=True)
+        try:
+            with open(self.path, "rb") as file:
+                if os.fstat(file.fileno()).st_ino != self.inode:
+                    return None
+                data = file.read(self.offset)
+        except FileNotFoundError:
+            return None
+        if len(data) < self.offset:
+            return None
+        rows = self._parse(data[data.find(b"\n") + 1:]) if self.header else []
+        return FileChange(self.path, list(self.header), rows, reset=True)
+
+
+class _InotifyBackend:
+    """Blocks on inotify events for the parent directories of the watched files."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}  # watch descriptor -> directory
+
+    def add(self, path: str):
+        directory = os.path.dirname(path)
+        if directory in self._dirs.values():
+            return
+        wd = self._libc.inotify_add_watch(self.fd, directory.encode(), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._dirs[wd] = directory
+
+    def wait(self, paths, timeout: float, wakeup_fd: int) -> set:
+        ready, _, _ = select.select([self.fd, wakeup_fd], [], [], timeout)
+        if self.fd not in ready:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        pos = 0
+        while pos < len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, pos)
+            name = data[pos + _EVENT_HEADER.size: pos + _EVENT_HEADER.size + length].rstrip(b"\0")
+            pos += _EVENT_HEADER.size + length
+            directory = self._dirs.get(wd)
+            if directory is not None and name:
+                full = os.path.join(directory, name.decode())
+                if full in paths:
+                    changed.add(full)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _PollingBackend:
+    """Fallback for platforms without inotify: stat() every ``interval`` seconds."""
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self._signatures = {}
+
+    @staticmethod
+    def _signature(path: str):
+        try:
+            stat = os.stat(path)
+            return stat.st_ino, stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def add(self, path: str):
+        self._signatures[path] = self._signature(path)
+
+    def wait(self, paths, timeout: float, wakeup_fd: int) -> set:
+        select.select([wakeup_fd], [], [], min(timeout, self.interval))
+        changed = set()
+        for path in list(paths):
+            signature = self._signature(path)
+            if signature != self._signatures.get(path):
+                self._signatures[path] = signature
+                changed.add(path)
+        return changed
+
+    def close(self):
+        pass
+
+
+class FileWatcher:
+    """Watches CSV files and delivers parsed row deltas to subscribers.
+
+    Uses inotify on Linux and falls back to polling elsewhere. Bursts of
+    writes are debounced: after the first event the watcher waits until the
+    file has been quiet for ``debounce`` seconds (at most ``max_delay``), then
+    reads the appended bytes once. Changed files are delivered on a small
+    thread pool, one delivery per file at a time, so a slow subscriber only
+    delays its own file.
+    """
+
+    def __init__(self, debounce: float = 0.02, max_delay: float = 0.1, poll_interval: float = 0.25,
+                 use_inotify: bool = None):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith("linux")
+        self.backend = None
+        if use_inotify:
+            try:
+                self.backend = _InotifyBackend()
+            except (OSError, AttributeError):
+                self.backend = None
+        if self.backend is None:
+            self.backend = _PollingBackend(poll_interval)
+
+        self._tails = {}
+        self._subscribers = {}
+        self._file_locks = {}  # one per file: its deliveries run one at a time, in order
+        self._scheduled = {}  # path -> True if it changed again while its delivery was running
+        self._pool = ThreadPoolExecutor(max_workers=DELIVERY_WORKERS, thread_name_prefix="file-watcher-deliver")
+        self._lock = threading.RLock()  # guards the dicts only; never held while callbacks run
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if isinstance(self.backend, _InotifyBackend) else "polling"
+
+    def subscribe(self, path: str, callback, initial: bool = True):
+        """Call ``callback(FileChange)`` on every change of ``path``.
+
+        With ``initial`` the callback first receives the whole current file as
+        a reset change. Callbacks of one file run in order; a slow one delays
+        that file only. Returns a function that removes the subscription.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            if path not in self._tails:
+                self._tails[path] = CsvTail(path)
+                self._file_locks[path] = threading.RLock()
+                self.backend.add(path)
+            tail, file_lock = self._tails[path], self._file_locks[path]
+        with file_lock:
+            # ✅ The snapshot ends exactly at the tail's offset: later rows only come as deltas
+            self._deliver(path)
+            snapshot = tail.snapshot()
+            while snapshot is None:
+                self._deliver(path)
+                snapshot = tail.snapshot()
+            with self._lock:
+                self._subscribers.setdefault(path, []).append(callback)
+            # ✅ Delivered under the file's lock, so no later delta can overtake the initial snapshot
+            if initial:
+                self._notify(callback, snapshot)
+
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(path, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+        return unsubscribe
+
+    @staticmethod
+    def _notify(callback, change: FileChange):
+        try:
+            callback(change)
+        except Exception:
+            logger.exception("Watcher callback failed for %s", change.path)
+
+    def poll_once(self, timeout: float) -> int:
+        """Wait up to ``timeout`` for changes, schedule their delivery and return how many files changed."""
+        # ✅ The live dict, not a copy: a file subscribed while we block is matched too
+        paths = self._tails
+        changed = self.backend.wait(paths, timeout, self._wakeup_r)
+        if not changed:
+            return 0
+
+        # ✅ Debounce: keep collecting until quiet, but never delay longer than max_delay
+        now = time.monotonic()
+        deadline = now + self.max_delay
+        quiet_at = now + self.debounce
+        while not self._stopped.is_set():
+            now = time.monotonic()
+            timeout = min(quiet_at, deadline) - now
+            if timeout <= 0:
+                break
+            more = self.backend.wait(paths, timeout, self._wakeup_r)
+            if more:
+                changed |= more
+                quiet_at = time.monotonic() + self.debounce
+
+        for path in changed:
+            self._schedule(path)
+        return len(changed)
+
+    def _schedule(self, path: str):
+        with self._lock:
+            if path in self._scheduled:  # the running delivery reads the file again when it is done
+                self._scheduled[path] = True
+                return
+            self._scheduled[path] = False
+        self._pool.submit(self._drain, path)
+
+    def _drain(self, path: str):
+        while True:
+            try:
+                self._deliver(path)
+            except Exception:
+                logger.exception("Watcher delivery failed for %s", path)
+            with self._lock:
+                if not self._scheduled[path]:
+                    del self._scheduled[path]
+                    return
+                self._scheduled[path] = False
+
+    def _deliver(self, path: str):
+        with self._lock:
+            tail, file_lock = self._tails[path], self._file_locks[path]
+        with file_lock:
+            change = tail.read_new()
+            if change is not None:
+                with self._lock:
+                    callbacks = list(self._subscribers.get(path, []))
+                for callback in callbacks:
+                    self._notify(callback, change)
+
+    def run(self):
+        while not self._stopped.is_set():
+            self.poll_once(timeout=1.0)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="file-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        os.write(self._wakeup_w, b"x")
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.backend.close()
+
+
+_default_watcher = None
+_default_lock = threading.Lock()
+
+
+def get_watcher() -> FileWatcher:
+    """Process-wide watcher thread, started on first use."""
+    global _default_watcher
+    with _default_lock:
+        if _default_watcher is None:
+            _default_watcher = FileWatcher().start()
+        return _default_watcher
+
+
+def watch_folder(path, callback=None):
+    """Subscribe ``callback`` to every CSV currently in ``path`` (prints the deltas by default)."""
     print(f"Watching {path} for updates...")
+    callback = callback or (lambda change: print(f"🔄 {change}"))
+    watcher = get_watcher()
+    return [
+        watcher.subscribe(os.path.join(path, name), callback)
+        for name in sorted(os.listdir(path)) if name.endswith(".csv")
+    ]
+
+
+class RowStateTracker:
+    """Keeps the current rows of a watched CSV keyed by ``key`` and turns FileChanges into diffs.
+
+    Each diff is ``{"version", "added", "changed", "removed"}``. Added and
+    changed hold full rows, removed holds keys. Listeners are called from the
+    watcher thread.
+    """
+
+    key = "id"
+
+    def __init__(self, file_path: str):
+        self.file_path = os.path.abspath(file_path)
+        self.rows = {}
+        self.version = 0
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"version": self.version, "rows": list(self.rows.values())}
+
+    def apply(self, change: FileChange) -> dict:
+        with self._lock:
+            added, changed, removed = [], [], []
+            if change.reset:
+                new_rows = {row.get(self.key): row for row in change.rows}
+                removed = [k for k in self.rows if k not in new_rows]
+                for k, row in new_rows.items():
+                    old = self.rows.get(k)
+                    if old is None:
+                        added.append(row)
+                    elif old != row:
+                        changed.append(row)
+                self.rows = new_rows
+            else:
+                for row in change.rows:
+                    k = row.get(self.key)
+                    old = self.rows.get(k)
+                    if old is None:
+                        added.append(row)
+                    elif old != row:
+                        changed.append(row)
+                    self.rows[k] = row
+            if not (added or changed or removed) and self.version:
+                return None
+            self.version += 1
+            diff = {"version": self.version, "added": added, "changed": changed, "removed": removed}
+        for listener in self._listeners:
+            try:
+                listener(diff)
+            except Exception:
+                logger.exception("Tracker listener failed for %s", self.file_path)
+        return diff
+
+    def start(self, watcher: FileWatcher = None):
+        (watcher or get_watcher()).subscribe(self.file_path, self.apply)
+        return self
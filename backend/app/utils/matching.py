@@ -0,0 +1,54 @@
+import numpy as np
+
+
+def greedy_match(groups: np.ndarray, spare: np.ndarray, need: np.ndarray, receiver_keys: tuple = ()) -> tuple:
+    """Greedy surplus -> deficit matching within each group, vectorised over all groups at once.
+
+    ``groups`` holds a dense group code per row (e.g. factorized SKUs);
+    ``spare`` and ``need`` are the non-negative units each row can give or
+    needs. Within a group, donors go largest spare first; receivers are
+    ordered by ``receiver_keys`` (lexsort keys, last one primary, ascending)
+    and then largest need first. Donors and receivers are laid out on one
+    number line by cumulative sums; every segment between consecutive
+    breakpoints moves units from the donor covering it to the receiver
+    covering it. Returns ``(donor rows, receiver rows, quantities)``, one
+    entry per donor/receiver pair.
+    """
+    empty = np.empty(0, dtype=np.int64)
+    donors = np.flatnonzero(spare > 0)
+    receivers = np.flatnonzero(need > 0)
+    if not len(donors) or not len(receivers):
+        return empty, empty, empty
+    donors = donors[np.lexsort((-spare[donors], groups[donors]))]
+    receivers = receivers[np.lexsort((-need[receivers], *(key[receivers] for key in receiver_keys), groups[receivers]))]
+
+    n_groups = int(groups.max()) + 1
+    supply = np.bincount(groups[donors], spare[donors], n_groups).astype(np.int64)
+    demand = np.bincount(groups[receivers], need[receivers], n_groups).astype(np.int64)
+    moved = np.minimum(supply, demand)
+    offsets = np.concatenate([[0], np.cumsum(np.maximum(supply, demand))[:-1]])
+
+    def ends(rows, amounts):
+        codes = groups[rows]
+        cumulative = np.cumsum(amounts[rows], dtype=np.int64)
+        starts_of_group = np.concatenate([[0], cumulative])[np.searchsorted(codes, codes, side="left")]
+        return offsets[codes] + cumulative - starts_of_group
+
+    donor_ends = ends(donors, spare)
+    receiver_ends = ends(receivers, need)
+    caps = offsets + moved
+    points = np.sort(np.concatenate([offsets, caps, donor_ends, receiver_ends]))
+    points = points[np.concatenate([[True], points[1:] != points[:-1]])]
+    starts, stops = points[:-1], points[1:]
+
+    segment_group = np.searchsorted(offsets, starts, side="right") - 1
+    keep = starts < caps[segment_group]
+    starts, stops = starts[keep], np.minimum(stops[keep], caps[segment_group[keep]])
+    if not len(starts):  # donors and receivers never share a group
+        return empty, empty, empty
+    donor = donors[np.searchsorted(donor_ends, starts, side="right")]
+    receiver = receivers[np.searchsorted(receiver_ends, starts, side="right")]
+
+    # Adjacent segments between the same pair (split by the other side's breakpoints) are one transfer
+    runs = np.flatnonzero(np.concatenate([[True], (donor[1:] != donor[:-1]) | (receiver[1:] != receiver[:-1])]))
+    return donor[runs], receiver[runs], np.add.reduceat(stops - starts, runs)
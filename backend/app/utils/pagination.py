@@ -0,0 +1,91 @@
+import base64
+import csv
+import io
+import itertools
+import json
+
+from fastapi.responses import StreamingResponse
+
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH = 1000
+
+
+def encode_cursor(cursor: dict) -> str:
+    if cursor is None:
+        return None
+    data = json.dumps(cursor, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> dict:
+    """Opaque cursor from a previous page; raises ValueError if it was tampered with."""
+    if not token:
+        return None
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(cursor, dict) or not isinstance(cursor.get("k"), int):
+        raise ValueError("Invalid cursor.")
+    return cursor
+
+
+def parse_fields(fields: str) -> list:
+    """``"id,name,sku"`` -> ``["id", "name", "sku"]`` (None when no projection was asked for)."""
+    if not fields:
+        return None
+    return list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip())) or None
+
+
+def _ndjson_chunks(rows):
+    batch = []
+    for row in rows:
+        batch.append(json.dumps(row))
+        if len(batch) >= EXPORT_BATCH:
+            yield "\n".join(batch) + "\n"
+            batch = []
+    if batch:
+        yield "\n".join(batch) + "\n"
+
+
+def _csv_chunks(rows, fieldnames: list):
+    buffer = io.StringIO()
+    writer = None
+    count = 0
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=fieldnames or list(row), extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow(row)
+        count += 1
+        if count % EXPORT_BATCH == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if writer is None and fieldnames:
+        csv.writer(buffer).writerow(fieldnames)
+    if buffer.getvalue():
+        yield buffer.getvalue()
+
+
+def stream_rows(rows, fmt: str, filename: str, fieldnames: list = None) -> StreamingResponse:
+    """Stream ``rows`` (any iterator of dicts) as NDJSON or CSV, EXPORT_BATCH rows per chunk."""
+    if fmt == "csv":
+        return StreamingResponse(
+            _csv_chunks(rows, fieldnames), media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.csv"'},
+        )
+    return StreamingResponse(
+        _ndjson_chunks(rows), media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.ndjson"'},
+    )
+
+
+_END = object()
+
+
+def prime(rows):
+    """Advance a row generator to its first row, so query errors surface before the response starts."""
+    rows = iter(rows)
+    first = next(rows, _END)
+    return iter(()) if first is _END else itertools.chain([first], rows)
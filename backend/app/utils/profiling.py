@@ -0,0 +1,76 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+def _is_project_file(filename: str) -> bool:
+    return filename.startswith(PROJECT_DIR) and "site-packages" not in filename
+
+
+class StackSampler:
+    """Sampling profiler over every thread of the process.
+
+    cProfile only sees the thread that enabled it, but sync endpoints run on
+    the threadpool, so the sampler reads ``sys._current_frames()`` every
+    ``interval`` seconds instead. Only stacks that pass through project code
+    are counted, which leaves out idle pool threads and the event loop
+    waiting; anything else running concurrently is included.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples = 0
+        self.inclusive = Counter()  # function -> samples with it anywhere on the stack
+        self.own = Counter()        # function -> samples with it on top
+        self._stopped = threading.Event()
+        self._thread = None
+        self.elapsed = 0.0
+
+    def _sample(self):
+        me = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if not any(_is_project_file(filename) for filename, _, _ in stack):
+                continue
+            self.samples += 1
+            self.own[stack[0]] += 1
+            for function in set(stack):  # recursion counts once per sample
+                self.inclusive[function] += 1
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stopped.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+
+    def report(self, limit: int = 30) -> str:
+        def where(function):
+            filename, line, name = function
+            if _is_project_file(filename):
+                filename = os.path.relpath(filename, PROJECT_DIR)
+            return f"{name} ({filename}:{line})"
+
+        lines = [f"{self.samples} samples over {1000 * self.elapsed:.1f} ms (every {1000 * self.interval:g} ms)", "",
+                 f"{'total %':>8} {'self %':>8}  function"]
+        for function, count in self.inclusive.most_common(limit):
+            lines.append(f"{100 * count / max(self.samples, 1):8.1f} {100 * self.own[function] / max(self.samples, 1):8.1f}  {where(function)}")
+        return "\n".join(lines) + "\n"
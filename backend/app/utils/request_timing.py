@@ -0,0 +1,80 @@
+import os
+import time
+
+from app.utils.metrics import REQUEST_LATENCY
+from app.utils.profiling import StackSampler
+
+PROFILING = os.getenv("PROFILING", "0") == "1"  # ✅ Opt-in: honour the X-Profile header only when enabled
+PROFILE_HEADER = b"x-profile"
+
+
+def route_template(scope) -> str:
+    """``/api/incidents/{incident_id}`` for ``/api/incidents/42``; "unmatched" when no route matched.
+
+    Depending on the FastAPI version, ``scope["route"].path`` is either the
+    full template or relative to its router's prefix, so the prefix is
+    recovered from the part of the concrete path the route did not match.
+    """
+    route = scope.get("route")
+    regex = getattr(route, "path_regex", None)
+    if regex is None:
+        return "unmatched"
+    path = scope["path"]
+    for i, char in enumerate(path):
+        if char == "/" and regex.match(path[i:]):
+            return path[:i] + route.path
+    return route.path
+
+
+class TimingMiddleware:
+    """Per-route latency histogram, a Server-Timing header and opt-in request profiling.
+
+    Latency is recorded under the route template (``/api/incidents/{incident_id}``,
+    not the concrete path) so the number of series stays bounded. With
+    PROFILING=1, a request sent with ``X-Profile: 1`` is run under the stack
+    sampler and answered with its report (text/plain) instead of the normal
+    body; the original status is in ``X-Profiled-Status``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if PROFILING and dict(scope["headers"]).get(PROFILE_HEADER) == b"1":
+            await self._profiled(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                # Time to the response head; streamed bodies keep going after it
+                timing = f"app;dur={1000 * (time.perf_counter() - start):.1f}".encode()
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            REQUEST_LATENCY.observe(time.perf_counter() - start, scope["method"], route_template(scope), str(status[0]))
+
+    async def _profiled(self, scope, receive, send):
+        status = [500]
+
+        async def discard(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+
+        with StackSampler() as sampler:
+            await self.app(scope, receive, discard)
+        body = sampler.report().encode()
+        await send({"type": "http.response.start", "status": 200, "headers": [
+            (b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(body)).encode()),
+            (b"x-profiled-status", str(status[0]).encode()),
+        ]})
+        await send({"type": "http.response.body", "body": body})
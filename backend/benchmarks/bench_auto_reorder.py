@@ -0,0 +1,99 @@
+"""Auto-reorder stage under bursts of stock updates.
+
+"direct" feeds inventory diffs straight into the stage (evaluation, dedup, CSV writes). "watched" appends
+the same kind of burst to inventory.csv and measures until the watcher -> tracker -> stage path has
+produced the reorders. Every run checks that no item ends up with two open reorders. For comparison,
+"rescan" is one vectorised pass over the whole inventory, what each update would cost without deltas.
+
+Run from backend/:  python -m benchmarks.bench_auto_reorder --items 100000 --updates 500000
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.utils.csv_io import append_rows
+from benchmarks.common import make_data_dir, timed
+from realtime_pipeline.auto_reorder import AutoReorderStage
+
+
+def updates(inventory: pd.DataFrame, n: int, seed: int) -> list:
+    """``n`` stock updates of random items; about 10% of them drop to or below the reorder point."""
+    rng = np.random.default_rng(seed)
+    picked = inventory.iloc[rng.integers(0, len(inventory), n)].copy()
+    low = rng.random(n) < 0.1
+    picked["currentStock"] = np.where(low, rng.integers(0, 10, n), rng.integers(11, 60, n)).astype(str)
+    return picked.to_dict("records")
+
+
+def drain(stage: AutoReorderStage, timeout: float = 300):
+    """Wait until the stage has processed a batch and its queue is empty."""
+    deadline = time.monotonic() + timeout
+    while (stage.queue.qsize() or stage.stats_counts["batches"] == 0) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(2 * stage.max_wait)  # the last batch may still be in flight
+
+
+def check_no_duplicates(path: str) -> int:
+    reorders = pd.read_csv(path, dtype=str)
+    auto = reorders[reorders["requestedBy"] == "System Auto-Reorder"]
+    latest = auto.drop_duplicates("id", keep="last")
+    open_per_item = latest[latest["status"].isin(["pending", "approved"])]["itemId"].value_counts()
+    assert (open_per_item <= 1).all(), "an item got two open reorders"
+    return len(latest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--updates", type=int, default=500_000)
+    parser.add_argument("--diff-rows", type=int, default=1_000, help="rows per inventory diff in the direct run")
+    args = parser.parse_args()
+
+    settings.DATA_DIR = make_data_dir(args.items)
+    inventory = pd.read_csv(settings.inventory_file_path(), dtype=str)
+    frame = inventory.astype({"currentStock": int, "reorderPoint": int})
+    rescan_s = min(timed(lambda: frame[frame["currentStock"] <= frame["reorderPoint"]])[1] for _ in range(5))
+    print(f"{args.items} items | rescan of the inventory {1000 * rescan_s:.1f} ms per update")
+
+    # Direct: diffs straight into the stage
+    stage = AutoReorderStage(settings.reorders_file_path(), settings.supplier_orders_file_path()).start()
+    rows = updates(inventory, args.updates, seed=1)
+    start = time.perf_counter()
+    for i in range(0, len(rows), args.diff_rows):
+        stage.submit(rows[i:i + args.diff_rows])
+    submitted_s = time.perf_counter() - start
+    drain(stage)
+    elapsed = time.perf_counter() - start
+    stats = stage.stats()
+    stage.stop()
+    print(f"direct  | {args.updates} updates in {elapsed:.2f}s ({args.updates / elapsed:,.0f}/s, submit {submitted_s:.2f}s)"
+          f" | {stats['reordersCreated']} reorders in {stats['ordersCreated']} supplier orders,"
+          f" {stats['deduplicated']} deduplicated, {stats['batches']} batches"
+          f" | {check_no_duplicates(settings.reorders_file_path())} auto reorders, no duplicates")
+
+    # Watched: a burst appended to inventory.csv, picked up by the file watcher
+    stage = AutoReorderStage(settings.reorders_file_path(), settings.supplier_orders_file_path()).start()
+    tracker = stage.follow_inventory(settings.inventory_file_path())
+    burst = updates(inventory, min(args.updates, args.items), seed=2)
+    before = stage.stats_counts["reordersCreated"]
+    start = time.perf_counter()
+    append_rows(settings.inventory_file_path(), burst)
+    deadline = time.monotonic() + 300
+    while tracker.version < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    drain(stage)
+    elapsed = time.perf_counter() - start
+    stats = stage.stats()
+    stage.stop()
+    print(f"watched | {len(burst)} appended rows processed in {elapsed:.2f}s ({len(burst) / elapsed:,.0f}/s)"
+          f" | {stats['reordersCreated'] - before} new reorders, {stats['deduplicated']} deduplicated"
+          f" | {check_no_duplicates(settings.reorders_file_path())} auto reorders, no duplicates"
+          f" | {os.path.getsize(settings.supplier_orders_file_path()) / 1e3:.0f} kB of supplier orders")
+
+
+if __name__ == "__main__":
+    main()
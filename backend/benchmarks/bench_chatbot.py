@@ -0,0 +1,86 @@
+"""POST /api/chatbot/query under concurrent load: p50/p99 latency with and without the answer cache.
+
+A mix of full-list, SKU, keyword-search and fallback questions is sent through the ASGI app. "no cache"
+runs every question through the intent router and retrieval; "cached" is the same load with the answer
+cache on, so repeated questions are served from it. For reference the old full-list answer
+(``frame.to_string()`` of the whole table) is timed once.
+
+Run from backend/:  python -m benchmarks.bench_chatbot --rows 100000 --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+from app.config import settings
+from benchmarks.common import WORDS, make_data_dir, timed
+
+
+def questions(rows: int, n: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    templates = [
+        lambda: "show all inventory",
+        lambda: "list reorders",
+        lambda: f"what is the stock of SKU{100000 + rng.randrange(rows)}?",
+        lambda: f"item {rng.randrange(1, rows)} price",
+        lambda: f"how much {rng.choice(WORDS)} {rng.choice(WORDS)} is in stock",
+        lambda: f"urgent reorder for {rng.choice(WORDS)}",
+        lambda: f"tell me about {rng.choice(WORDS)}",
+    ]
+    return [rng.choice(templates)() for _ in range(n)]
+
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    return 1000 * statistics.median(latencies), 1000 * latencies[int(len(latencies) * 0.99) - 1]
+
+
+async def run(app, qs: list, concurrency: int):
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(question, sem):
+            async with sem:
+                start = time.perf_counter()
+                response = await client.post("/api/chatbot/query", json={"question": question})
+                latencies.append(time.perf_counter() - start)
+                assert response.json()["status"] == "success"
+
+        sem = asyncio.Semaphore(concurrency)
+        start = time.perf_counter()
+        await asyncio.gather(*(one(q, sem) for q in qs))
+        return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    settings.DATA_DIR = make_data_dir(args.rows, reorder_rows=1_000)
+    from app.main import app
+    from app.services import csv_qa
+    from app.utils.cache import TTLCache
+
+    inventory = csv_qa.inventory_snapshot()
+    _, full_s = timed(inventory.frame.to_string)
+    print(f"{args.rows} rows | old full-list answer (to_string of the table): {1000 * full_s:.0f} ms")
+
+    qs = questions(args.rows, args.requests)
+    csv_qa.get_search_index(inventory)  # build the fuzzy index outside the timed runs
+    csv_qa.get_search_index(csv_qa.reorders_snapshot())
+    for label, ttl in [("no cache", 0), ("cached", csv_qa.CHATBOT_CACHE_TTL)]:
+        csv_qa._answers = TTLCache(ttl, csv_qa.CHATBOT_CACHE_SIZE)
+        latencies, elapsed = asyncio.run(run(app, qs, args.concurrency))
+        p50, p99 = percentiles(latencies)
+        print(f"{label:9} | {args.requests / elapsed:8.1f} req/s | p50 {p50:8.1f} ms | p99 {p99:8.1f} ms"
+              f" | cache entries {len(csv_qa._answers)}")
+
+
+if __name__ == "__main__":
+    main()
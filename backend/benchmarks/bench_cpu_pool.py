@@ -0,0 +1,88 @@
+"""Mixed load: chatbot searches saturating the CPU pool while health checks and inventory pages are probed.
+
+Every chatbot question is unique (no answer-cache hits), so each one is a full fuzzy search. "idle" probes
+with no chatbot traffic; "thread" runs the searches on threads in the server process (the old
+run_in_threadpool path, sharing the GIL with the event loop); "process" is the bounded process pool. For
+each mode: probe p50/p99 of GET / and GET /api/inventory/status?limit=20, chatbot answers/s, 503s
+(load shed) and the pool's wait times.
+
+Run from backend/:  python -m benchmarks.bench_cpu_pool --rows 100000 --clients 16 --seconds 10
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import statistics
+import time
+
+import httpx
+
+from app.config import settings
+from benchmarks.common import WORDS, make_data_dir
+
+PROBES = ["/", "/api/inventory/status?limit=20"]
+
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    return 1000 * statistics.median(latencies), 1000 * latencies[max(0, int(len(latencies) * 0.99) - 1)]
+
+
+async def load(app, clients: int, seconds: float) -> dict:
+    counter = itertools.count()
+    rng = random.Random(1)
+    probes = {path: [] for path in PROBES}
+    answered, shed = [0], [0]
+    stop = time.monotonic() + seconds
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60) as client:
+        async def chatbot():
+            while time.monotonic() < stop:
+                question = f"tell me about {rng.choice(WORDS)} {rng.choice(WORDS)} #{next(counter)}"
+                response = await client.post("/api/chatbot/query", json={"question": question})
+                if response.status_code == 503:
+                    shed[0] += 1
+                    await asyncio.sleep(min(float(response.headers["Retry-After"]), 0.2))
+                elif response.json()["status"] == "success":
+                    answered[0] += 1
+
+        async def probe():
+            while time.monotonic() < stop:
+                for path in PROBES:
+                    start = time.perf_counter()
+                    assert (await client.get(path)).status_code == 200
+                    probes[path].append(time.perf_counter() - start)
+                await asyncio.sleep(0.02)
+
+        await asyncio.gather(probe(), *(chatbot() for _ in range(clients)))
+    return {"probes": probes, "answered": answered[0], "shed": shed[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    settings.DATA_DIR = make_data_dir(args.rows)
+    from app.main import app
+    from app.services.cpu_pool import cpu_pool
+
+    print(f"{args.rows} items | {args.clients} chatbot clients | {cpu_pool.workers} workers, queue {cpu_pool.max_queue}")
+    for mode in ["idle", "thread", "process"]:
+        cpu_pool.shutdown()
+        cpu_pool.kind = mode if mode != "idle" else "thread"
+        cpu_pool.start()
+        cpu_pool.waits.clear()
+        result = asyncio.run(load(app, 0 if mode == "idle" else args.clients, args.seconds))
+        probes = " | ".join(f"{path} p50 {p50:6.1f} ms p99 {p99:7.1f} ms"
+                            for path, (p50, p99) in ((path, percentiles(v)) for path, v in result["probes"].items()))
+        stats = cpu_pool.stats()
+        print(f"{mode:7} | {probes} | chatbot {result['answered'] / args.seconds:5.1f}/s, {result['shed']} shed"
+              f" | pool wait p50 {stats['waitMs']['p50']:.0f} ms p95 {stats['waitMs']['p95']:.0f} ms")
+    cpu_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
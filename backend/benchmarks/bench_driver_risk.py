@@ -0,0 +1,83 @@
+"""Driver risk engine: incremental decayed aggregates vs recomputing from history.
+
+Seeds the engine with a synthetic driver table, replays an incident/delivery event stream into it (one
+O(1) update per event), then times a single update, top-N reads off the heap, and — for comparison — a
+vectorised rescan of the whole event history, which is what every update would cost without the
+per-driver aggregates.
+
+Run from backend/:  python -m benchmarks.bench_driver_risk --drivers 100000 --events 10000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.driver_risk_service import SEVERITY_WEIGHTS, RiskEngine
+from benchmarks.common import make_drivers, timed
+
+SEVERITIES = list(SEVERITY_WEIGHTS)
+SPAN_DAYS = 365
+
+
+def ms(seconds: float) -> str:
+    return f"{1000 * seconds:8.3f} ms"
+
+
+def rescan(driver_idx, weights, timestamps, deliveries, lam, now, n_drivers):
+    decay = np.exp(-lam * (now - timestamps))
+    incidents = np.bincount(driver_idx, weights * decay, minlength=n_drivers)
+    return 100.0 * incidents / deliveries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--drivers", type=int, default=100_000)
+    parser.add_argument("--events", type=int, default=10_000_000)
+    parser.add_argument("--delivery-share", type=float, default=0.5, help="fraction of events that are deliveries")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(5)
+    now = time.time()
+    drivers = make_drivers(args.drivers)
+    rows = [{**row, "id": str(row["id"])} for row in drivers.to_dict("records")]
+    engine, seed_s = timed(RiskEngine(now=now - SPAN_DAYS * 86400).seed, rows)
+    print(f"seed {args.drivers} drivers: {seed_s:.2f}s")
+
+    # Skewed driver activity (a few drivers have most events), timestamps in order over a year
+    driver_idx = np.minimum(rng.zipf(1.3, args.events) - 1, args.drivers - 1)
+    rng.shuffle(driver_idx)
+    timestamps = np.sort(rng.uniform(now - SPAN_DAYS * 86400, now, args.events))
+    is_delivery = rng.random(args.events) < args.delivery_share
+    severity = rng.choice(len(SEVERITIES), args.events, p=[0.7, 0.25, 0.05])
+    ids = [str(i + 1) for i in range(args.drivers)]
+
+    start = time.perf_counter()
+    record_incident, record_deliveries = engine.record_incident, engine.record_deliveries
+    for d, ts, delivery, sev in zip(driver_idx.tolist(), timestamps.tolist(), is_delivery.tolist(), severity.tolist()):
+        if delivery:
+            record_deliveries(ids[d], 1, ts)
+        else:
+            record_incident(ids[d], SEVERITIES[sev], ts)
+    replay_s = time.perf_counter() - start
+    print(f"replay {args.events} events: {replay_s:.1f}s ({args.events / replay_s:,.0f} events/s,"
+          f" {1e6 * replay_s / args.events:.2f} us/event) | heap {len(engine._heap)} entries")
+
+    update_s = min(timed(engine.record_incident, ids[i], "severe", now)[1] for i in range(1000))
+    print(f"single update {ms(update_s)}")
+    for n in [10, 100, 1000]:
+        engine.top(n)
+        top_s = min(timed(engine.top, n)[1] for _ in range(20))
+        print(f"top-{n:<5} {ms(top_s)}")
+
+    # What an update costs without per-driver aggregates: recompute every score from the event log
+    incident_mask = ~is_delivery
+    weights = np.array([SEVERITY_WEIGHTS[s] for s in SEVERITIES])[severity[incident_mask]]
+    delivered = np.bincount(driver_idx[is_delivery], minlength=args.drivers) + 20.0
+    _, rescan_s = timed(
+        rescan, driver_idx[incident_mask], weights, timestamps[incident_mask], delivered, engine.lam, now, args.drivers
+    )
+    print(f"full rescan {ms(rescan_s)} per update ({rescan_s / update_s:,.0f}x the incremental update)")
+
+
+if __name__ == "__main__":
+    main()
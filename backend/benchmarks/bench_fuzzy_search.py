@@ -0,0 +1,61 @@
+"""Chatbot fuzzy-search latency: legacy iterrows scan vs SearchIndex.
+
+Run from backend/:  python -m benchmarks.bench_fuzzy_search --sizes 1000 100000 1000000
+"""
+import argparse
+
+from rapidfuzz import fuzz
+
+from app.services.search_index import SearchIndex
+from benchmarks.common import make_inventory, timed
+
+QUESTIONS = ["stock of laptop pro", "price of office chair", "where is SKU123456",
+             "organic milk supplier", "lead time for desk lamp"]
+
+
+def legacy_fuzzy_search(df, question, threshold=50, max_results=3):
+    question_lower = question.lower()
+    matches = []
+    for i, (_, row) in enumerate(df.iterrows()):
+        row_text = " ".join(str(v).lower() for v in row.values)
+        score = fuzz.token_set_ratio(question_lower, row_text)
+        if score >= threshold:
+            matches.append((score, i))
+    matches = sorted(matches, key=lambda x: x[0], reverse=True)
+    return [i for _, i in matches[:max_results]]
+
+
+def run(size: int, legacy_limit: int):
+    df = make_inventory(size)
+    index, build_s = timed(SearchIndex, df)
+
+    indexed = []
+    for q in QUESTIONS:
+        result, elapsed = timed(index.search, q)
+        indexed.append(elapsed)
+
+    legacy_ms = "skipped"
+    if size <= legacy_limit:
+        legacy = []
+        for q in QUESTIONS:
+            expected, elapsed = timed(legacy_fuzzy_search, df, q)
+            legacy.append(elapsed)
+            assert index.search(q) == expected, f"top-k mismatch for {q!r}"
+        legacy_ms = f"{1000 * sum(legacy) / len(legacy):.1f}"
+
+    print(f"{size:>9} rows | build {build_s:7.2f}s | indexed {1000 * sum(indexed) / len(indexed):8.1f} ms/query"
+          f" | legacy {legacy_ms} ms/query")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-limit", type=int, default=100_000,
+                        help="largest size the legacy scan (and the parity check) runs at")
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.legacy_limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""GET /api/inventory/status throughput: per-request CSV re-read vs the shared DataStore.
+
+Run from backend/:  python -m benchmarks.bench_inventory_status --rows 1000 100000 --requests 50
+"""
+import argparse
+import csv
+import os
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from benchmarks.common import make_data_dir
+
+
+def legacy_app(inventory_file: str) -> FastAPI:
+    # The old handler: open + csv.DictReader on every request
+    legacy = FastAPI()
+
+    @legacy.get("/api/inventory/status")
+    def get_inventory_status():
+        with open(inventory_file, mode="r", newline="", encoding="utf-8") as file:
+            return {"status": "success", "inventory": list(csv.DictReader(file))}
+
+    return legacy
+
+
+def throughput(client: TestClient, requests: int) -> float:
+    client.get("/api/inventory/status").raise_for_status()  # warm-up / first parse
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get("/api/inventory/status").raise_for_status()
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        data_dir = make_data_dir(rows)
+        from app.config import settings
+        settings.DATA_DIR = data_dir
+        from app.main import app
+
+        before = throughput(TestClient(legacy_app(os.path.join(data_dir, "inventory.csv"))), args.requests)
+        after = throughput(TestClient(app), args.requests)
+        print(f"{rows:>9} rows | before {before:8.1f} req/s | after {after:8.1f} req/s | x{after / before:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Cost of the instrumentation: timing middleware per request, /metrics render, hot-path logging.
+
+"bare" serves the same routes with TimingMiddleware taken out (best of alternating rounds). Logging compares the old print on
+every GET /api/inventory/status with the level-gated logger.debug it became (LOG_LEVEL=INFO: dropped
+before formatting).
+
+Run from backend/:  python -m benchmarks.bench_metrics --requests 2000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import time
+
+import httpx
+
+from app.config import settings
+from benchmarks.common import make_data_dir, timed
+
+PATHS = ["/", "/api/inventory/status?limit=20"]
+
+
+async def per_request(app, path: str, requests: int) -> float:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get(path)
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get(path)
+        return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    settings.DATA_DIR = make_data_dir(args.rows)
+    from app.main import app
+    from app.utils import metrics
+
+    from app.utils.request_timing import TimingMiddleware
+
+    with_timing = list(app.user_middleware)
+    bare = [m for m in with_timing if m.cls is not TimingMiddleware]
+    best = {}
+    for _ in range(args.rounds):  # alternate, so warm-up and noise hit both the same way
+        for label, stack in [("bare", bare), ("timed", with_timing)]:
+            app.user_middleware, app.middleware_stack = stack, None  # rebuilt on the next request
+            for path in PATHS:
+                seconds = asyncio.run(per_request(app, path, args.requests))
+                best[label, path] = min(best.get((label, path), seconds), seconds)
+    for path in PATHS:
+        timed_s, bare_s = best["timed", path], best["bare", path]
+        print(f"{path:32} | with middleware {1e6 * timed_s:7.1f} us | bare {1e6 * bare_s:7.1f} us"
+              f" | overhead {1e6 * (timed_s - bare_s):+6.1f} us")
+
+    body, render_s = timed(metrics.render)
+    print(f"/metrics render {1000 * render_s:.2f} ms, {len(body.splitlines())} lines")
+
+    logger = logging.getLogger("app.routes.inventory")
+    n = 100_000
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, print_s = timed(lambda: [print("📦 Checking inventory at:", settings.inventory_file_path()) for _ in range(n)])
+    _, debug_s = timed(lambda: [logger.debug("📦 Checking inventory at: %s", settings.inventory_file_path()) for _ in range(n)])
+    print(f"per request: print {1e6 * print_s / n:.2f} us (to a buffer; a terminal is slower), logger.debug {1e6 * debug_s / n:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
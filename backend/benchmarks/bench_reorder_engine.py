@@ -0,0 +1,78 @@
+"""Reorder prediction engine: vectorized pass over every SKU vs a per-row Python loop.
+
+Run from backend/:  python -m benchmarks.bench_reorder_engine --skus 10000 1000000 --history-rows 5000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app import config  # noqa: F401  (puts the project root on sys.path)
+from models.refill_predictor import predict_reorders
+
+
+def make_inventory(n: int, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    reorder_point = rng.integers(5, 40, n)
+    return pd.DataFrame({
+        "sku": np.char.add("SKU", np.arange(n).astype(str)),
+        "currentStock": rng.integers(0, 120, n),
+        "minStock": reorder_point // 2,
+        "maxStock": reorder_point * 3,
+        "reorderPoint": reorder_point,
+        "reorderQuantity": rng.integers(5, 60, n),
+        "leadTime": rng.integers(1, 14, n),
+    })
+
+
+def make_history(inventory: pd.DataFrame, rows: int, seed: int = 4) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "sku": inventory["sku"].to_numpy()[rng.integers(0, len(inventory), rows)],
+        "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90, rows), unit="D"),
+        "quantity": rng.integers(1, 5, rows),
+    })
+
+
+def loop_predict(inventory: pd.DataFrame) -> int:
+    # What a per-row implementation costs (same fallback demand model, no history)
+    flagged = 0
+    for item in inventory.to_dict("records"):
+        lead = max(item["leadTime"], 1)
+        demand = max(item["reorderPoint"] - item["minStock"], 0) / lead
+        days = item["currentStock"] / demand if demand > 0 else float("inf")
+        if item["currentStock"] <= item["reorderPoint"] or days <= lead:
+            flagged += 1
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--history-rows", type=int, default=5_000_000)
+    parser.add_argument("--loop-limit", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for n in args.skus:
+        inventory = make_inventory(n)
+        start = time.perf_counter()
+        scores = predict_reorders(inventory)
+        vectorized = time.perf_counter() - start
+
+        history = make_history(inventory, args.history_rows)
+        start = time.perf_counter()
+        predict_reorders(inventory, history)
+        with_history = time.perf_counter() - start
+
+        loop = "skipped"
+        if n <= args.loop_limit:
+            start = time.perf_counter()
+            assert loop_predict(inventory) == int(scores["reorder"].sum())
+            loop = f"{time.perf_counter() - start:.3f}s"
+        print(f"{n:>9} SKUs | vectorized {vectorized:.3f}s | with {args.history_rows} history rows {with_history:.3f}s"
+              f" | python loop {loop} | flagged {int(scores['reorder'].sum())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Rows/sec of the three list endpoints: per-row pydantic models (legacy) vs the shared row codec.
+
+"legacy" rebuilds the old routes: csv.DictReader, one pydantic model per row, then FastAPI re-validating
+every row through response_model. "cold" is the first request after the data changed (decode + encode),
+"warm" a repeat request served from the cached body. All numbers go through the ASGI app.
+
+Run from backend/:  python -m benchmarks.bench_row_codec --sizes 1000 10000 100000
+"""
+import argparse
+import csv
+import os
+import tempfile
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.routes.drivers import Driver
+from app.routes.reorders import Reorder
+from app.services.data_store import data_store
+from benchmarks.common import make_data_dir, make_drivers, timed
+
+
+def legacy_app() -> FastAPI:
+    legacy = FastAPI()
+
+    def read(path):
+        with open(path, newline="", encoding="utf-8") as file:
+            return list(csv.DictReader(file))
+
+    @legacy.get("/api/drivers/", response_model=List[Driver])
+    def drivers():
+        return [Driver(**{**row, "safetyScore": int(row["safetyScore"]), "deliveries": int(row["deliveries"]),
+                          "incidents": int(row["incidents"]),
+                          "certifications": row["certifications"].split(";") if row["certifications"] else []})
+                for row in read(settings.drivers_file_path())]
+
+    @legacy.get("/api/reorders/list", response_model=List[Reorder])
+    def reorders():
+        return [Reorder(**{**row, "quantity": int(row["quantity"]), "estimatedCost": float(row["estimatedCost"])})
+                for row in read(settings.reorders_file_path())]
+
+    @legacy.get("/api/inventory/status")
+    def inventory():
+        return {"status": "success", "inventory": read(settings.inventory_file_path())}
+
+    return legacy
+
+
+def rate(client, url, n) -> float:
+    response, elapsed = timed(client.get, url)
+    assert response.status_code == 200, response.text[:200]
+    return n / elapsed
+
+
+def run(n: int):
+    data_dir = make_data_dir(n, n)
+    drivers_dir = tempfile.mkdtemp(prefix="smartstore-drivers-")
+    make_drivers(n).to_csv(os.path.join(drivers_dir, "drivers.csv"), index=False)
+    settings.DATA_DIR, settings.DRIVERS_DIR = data_dir, drivers_dir
+
+    legacy, client = TestClient(legacy_app()), TestClient(app)
+    for url in ["/api/drivers/", "/api/reorders/list", "/api/inventory/status"]:
+        assert legacy.get(url).json() == client.get(url).json(), f"response mismatch on {url}"
+        old = rate(legacy, url, n)
+        data_store.invalidate()
+        cold = rate(client, url, n)
+        warm = rate(client, url, n)
+        print(f"{n:>7} rows | {url:<22} | legacy {old:11.0f} rows/s | cold {cold:11.0f} rows/s"
+              f" | warm {warm:13.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    for n in args.sizes:
+        run(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Sentiment classification throughput (reviews/sec) at batch sizes 1, 100 and 10k.
+
+Compares one classify_sentiment call per review (the old usage) with the batch classifier, both
+cold (empty cache) and warm (every text seen before). Reviews repeat the way real feeds do.
+
+Run from backend/:  python -m benchmarks.bench_sentiment --batches 1 100 10000 --workers 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.config import settings
+from app.services.sentiment_service import BatchSentimentClassifier
+from models.sentiment_model import classify_sentiment
+
+OPENERS = ["Loved the", "Hated the", "Okay experience with the", "Really impressed by the", "Disappointed with the",
+           "Nothing special about the", "Great value on the", "Terrible wait for the"]
+SUBJECTS = ["burger combo", "delivery", "checkout line", "fresh bread", "staff", "coffee", "parking", "app"]
+CLOSERS = ["!", ", will come back.", ", never again.", " today.", ", as usual.", " :("]
+
+
+def make_reviews(n: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    return [f"{rng.choice(OPENERS)} {rng.choice(SUBJECTS)}{rng.choice(CLOSERS)}"
+            + (f" #{rng.randrange(n)}" if rng.random() < 0.7 else "") for _ in range(n)]
+
+
+def rate(n: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    settings.SENTIMENT_DIR = tempfile.mkdtemp(prefix="smartstore-sentiment-")
+
+    for size in args.batches:
+        reviews = make_reviews(size, seed=size)
+        legacy = rate(size, lambda: [classify_sentiment(text) for text in reviews])
+
+        classifier = BatchSentimentClassifier(workers=args.workers)
+        cold = rate(size, lambda: classifier.classify_all(reviews))
+        warm = rate(size, lambda: classifier.classify_all(reviews))
+        classifier.shutdown()
+        unique = len(set(reviews))
+        print(f"batch {size:>6} ({unique} unique) | per-review {legacy:9.0f}/s | batch cold {cold:9.0f}/s"
+              f" | batch warm {warm:10.0f}/s | workers {args.workers}")
+
+
+if __name__ == "__main__":
+    main()
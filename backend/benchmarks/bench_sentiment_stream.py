@@ -0,0 +1,78 @@
+"""Streaming sentiment: sustained throughput and end-to-end lag for a replayed review feed.
+
+Reviews are appended to a tailed reviews.csv at a target rate (reviews/sec) for a fixed duration.
+Lag is the time between a review being appended and its micro-batch landing in the window.
+GET /reviews cost is measured separately as the time of one window snapshot.
+
+Run from backend/:  python -m benchmarks.bench_sentiment_stream --rate 2000 --seconds 5
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+from app.config import settings
+from app.services.sentiment_service import BatchSentimentClassifier
+from app.utils.csv_io import append_rows
+from app.utils.file_watcher import FileWatcher
+from benchmarks.bench_sentiment import make_reviews
+from realtime_pipeline.sentiment_stream import SentimentStream, SentimentWindow
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--tick", type=float, default=0.02, help="append interval in seconds")
+    args = parser.parse_args()
+    settings.SENTIMENT_DIR = tempfile.mkdtemp(prefix="smartstore-sentiment-")
+    reviews_file = settings.reviews_file_path()
+    append_rows(reviews_file, [], fieldnames=["text"])
+
+    watcher = FileWatcher().start()
+    window = SentimentWindow()
+    stream = SentimentStream(BatchSentimentClassifier(workers=1, persist=False), window)
+
+    lags = []
+    process = stream.process
+
+    def timed_process(batch):
+        process(batch)
+        lags.append(stream.last_lag)
+
+    stream.process = timed_process
+    stream.start()
+    stream.follow_file(reviews_file, watcher)
+
+    reviews = make_reviews(int(args.rate * args.seconds) + 1)
+    per_tick = max(int(args.rate * args.tick), 1)
+    start = time.perf_counter()
+    sent = 0
+    while sent < len(reviews):
+        target = start + (sent / args.rate)
+        delay = target - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        append_rows(reviews_file, [{"text": text} for text in reviews[sent:sent + per_tick]])
+        sent += per_tick
+    while stream.processed < len(reviews) and time.perf_counter() - start < args.seconds * 10:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    stream.stop()
+    watcher.stop()
+
+    snap_start = time.perf_counter()
+    for _ in range(10_000):
+        window.snapshot()
+    snapshot_us = (time.perf_counter() - snap_start) / 10_000 * 1e6
+
+    lags_ms = sorted(1000 * lag for lag in lags) or [0.0]
+    p99 = lags_ms[min(len(lags_ms) - 1, int(0.99 * len(lags_ms)))]
+    print(f"offered {args.rate}/s for {args.seconds}s | processed {stream.processed}/{len(reviews)}"
+          f" in {elapsed:.2f}s ({stream.processed / elapsed:.0f}/s) | batches {stream.batches}")
+    print(f"batch lag p50 {statistics.median(lags_ms):.1f} ms | p99 {p99:.1f} ms | max {lags_ms[-1]:.1f} ms"
+          f" | snapshot {snapshot_us:.1f} us | watcher {watcher.mode}")
+
+
+if __name__ == "__main__":
+    main()
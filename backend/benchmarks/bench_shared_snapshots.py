@@ -0,0 +1,154 @@
+"""Memory and version propagation with many worker processes: private parses vs shared snapshots.
+
+Starts --workers processes that each load inventory.csv and reorders.csv through the DataStore (raw and
+typed frame), then serve the real endpoints once in-process (the full inventory, reorder and driver
+lists, a sorted page, a lookup and a chatbot question, so the encoded bodies, lookup dicts, sort orders
+and search index get built) and then poll for new versions like requests would. Chatbot searches run on
+a thread of the worker (CPU_POOL=thread), so the search index is counted in the worker it belongs to.
+"private" is the default per-process parse; "shared" is SHARED_SNAPSHOTS=1. Memory is summed over the
+workers as RSS (which counts every mapped shared page once per process) and PSS (shared pages split
+between the processes that map them, i.e. what the machine really spends), minus the same processes
+before loading: once with only the frames loaded ("data") and once after serving ("serving").
+Then rows are appended to inventory.csv and the time until every worker serves the new version is measured.
+
+Run from backend/:  python -m benchmarks.bench_shared_snapshots --rows 100000 --workers 16
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks import datagen
+
+
+ENDPOINTS = ["/api/inventory/status", "/api/reorders/list", "/api/drivers/",
+             "/api/inventory/status?sort=price&limit=100", "/api/inventory/lookup?sku={sku}"]
+
+
+def worker(number: int, env: dict, poll: float, events, go, serve):
+    os.environ.update(env)
+    from fastapi.testclient import TestClient
+
+    from app.config import settings
+    from app.main import app
+    from app.services.data_store import data_store
+
+    events.put(("imported", number, os.getpid(), time.time()))
+    go.wait()
+    paths = [settings.inventory_file_path(), settings.reorders_file_path()]
+    for path in paths:
+        snapshot = data_store.get(path)
+        snapshot.frame
+    events.put(("ready", number, os.getpid(), time.time()))
+    serve.wait()
+    client = TestClient(app)  # no lifespan: no warm-up thread, no forked pool
+    sku = data_store.get(paths[0]).raw["sku"].iloc[0]
+    for endpoint in ENDPOINTS:
+        client.get(endpoint.format(sku=sku)).raise_for_status()
+    client.post("/api/chatbot/query", json={"question": f"how many {sku} are in stock"}).raise_for_status()
+    events.put(("served", number, os.getpid(), time.time()))
+    version = data_store.get(paths[0]).version
+    while True:
+        time.sleep(poll)
+        current = data_store.get(paths[0]).version
+        if current != version:
+            events.put(("version", number, current, time.time()))
+            version = current
+
+
+def memory(pids: list) -> tuple:
+    """Summed (RSS, PSS) in bytes from /proc/<pid>/smaps_rollup."""
+    rss = pss = 0
+    for pid in pids:
+        with open(f"/proc/{pid}/smaps_rollup") as file:
+            for line in file:
+                if line.startswith("Rss:"):
+                    rss += int(line.split()[1]) * 1024
+                elif line.startswith("Pss:"):
+                    pss += int(line.split()[1]) * 1024
+    return rss, pss
+
+
+def directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def run(mode: str, data_dir: str, args) -> None:
+    shared_dir = tempfile.mkdtemp(prefix="bench-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    env = {**datagen.settings_env(data_dir), "LOG_LEVEL": "WARNING", "AUTO_REORDER": "0",
+           "CPU_POOL": "thread", "CPU_WORKERS": "1",
+           "SHARED_SNAPSHOTS": "1" if mode == "shared" else "0", "SHARED_DIR": shared_dir}
+    context = multiprocessing.get_context("spawn")
+    events, go, serve = context.Queue(), context.Event(), context.Event()
+    processes = [context.Process(target=worker, args=(i, env, args.poll, events, go, serve), daemon=True)
+                 for i in range(args.workers)]
+    for process in processes:
+        process.start()
+    pids = [events.get(timeout=600)[2] for _ in processes]
+    time.sleep(1)
+    base_rss, base_pss = memory(pids)  # the interpreters with the app imported, no data yet
+    start = time.time()
+    go.set()
+    for _ in processes:
+        events.get(timeout=600)
+    loaded_s = time.time() - start
+    time.sleep(1)
+    rss, pss = memory(pids)
+    rss, pss = rss - base_rss, pss - base_pss
+    serve.set()
+    for _ in processes:
+        events.get(timeout=600)
+    time.sleep(1)
+    serving_rss, serving_pss = memory(pids)
+    serving_rss, serving_pss = serving_rss - base_rss, serving_pss - base_pss
+    files = directory_size(shared_dir) if mode == "shared" else 0
+
+    # A burst of new rows: every worker has to move to the new version
+    rows = datagen.inventory_chunk(datagen.rng_for(args.seed + 1, "inventory", 0), args.rows, args.append)
+    data = rows.to_csv(header=False, index=False).encode("utf-8")
+    appended = time.time()
+    descriptor = os.open(os.path.join(data_dir, "inventory", "inventory.csv"), os.O_WRONLY | os.O_APPEND)
+    os.write(descriptor, data)  # one write call, so workers rarely catch half of the burst
+    os.close(descriptor)
+    seen = {}
+    deadline = time.time() + 600
+    while len(seen) < args.workers and time.time() < deadline:
+        try:
+            kind, number, _, at = events.get(timeout=1)
+        except queue.Empty:
+            continue
+        if kind == "version":
+            seen.setdefault(number, at - appended)
+    for process in processes:
+        process.terminate()
+    shutil.rmtree(shared_dir, ignore_errors=True)
+    latencies = sorted(seen.values())
+    print(f"{mode:7} | {args.workers} workers loaded in {loaded_s:5.1f}s | data RSS {rss / 2**20:7,.0f} MB | data PSS {pss / 2**20:7,.0f} MB"
+          f" | serving RSS {serving_rss / 2**20:7,.0f} MB | serving PSS {serving_pss / 2**20:7,.0f} MB"
+          + (f" (shared files {files / 2**20:,.0f} MB)" if files else "")
+          + f" | new version: first worker {1000 * latencies[0]:6,.0f} ms, median {1000 * statistics.median(latencies):6,.0f} ms,"
+          f" all {1000 * latencies[-1]:6,.0f} ms, spread {1000 * (latencies[-1] - latencies[0]):6,.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--append", type=int, default=1000, help="rows appended to trigger a new version")
+    parser.add_argument("--poll", type=float, default=0.005, help="seconds between a worker's version checks")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--modes", default="private,shared")
+    args = parser.parse_args()
+
+    for mode in args.modes.split(","):
+        data_dir = tempfile.mkdtemp(prefix="smartstore-shared-")
+        datagen.generate(data_dir, args.rows, args.seed)
+        run(mode, data_dir, args)
+
+
+if __name__ == "__main__":
+    main()
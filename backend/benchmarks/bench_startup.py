@@ -0,0 +1,114 @@
+"""Server start-up: import time of app.main and time to first response on a generated dataset.
+
+"import" runs ``python -X importtime -c "import app.main"`` in fresh interpreters and reports the total
+and the heaviest top-level packages. "boot" starts uvicorn and measures time until / answers (live),
+until /ready answers 200 (warm-up done), the first data request made as soon as the server is live and
+the same request once warm, plus resident memory of the server and its workers once ready. "warm" is
+the default background warm-up; "lazy" is WARMUP=0, where the first requests load what they need.
+
+Run from backend/:  python -m benchmarks.bench_startup --rows 1000000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks import datagen
+from benchmarks.load_test import BACKEND_DIR, RssSampler, stop_server
+
+FIRST_REQUEST = "/api/inventory/status?limit=100&status=low-stock"
+
+
+def import_times(runs: int) -> tuple:
+    """(median total seconds, {top-level package: cumulative seconds}) of ``import app.main``."""
+    totals, packages = [], {}
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=BACKEND_DIR,
+                                env={**os.environ, "LOG_LEVEL": "WARNING"}, capture_output=True, text=True).stderr
+        for line in output.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            name = name.strip()
+            if name == "app.main":
+                totals.append(int(cumulative) / 1e6)
+            elif "." not in name:
+                packages.setdefault(name, []).append(int(cumulative) / 1e6)
+    return statistics.median(totals), {name: statistics.median(times) for name, times in packages.items()}
+
+
+def wait_for(url: str, deadline: float) -> float:
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=5).status_code == 200:
+                return time.monotonic()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{url} did not answer 200 in time")
+
+
+def timed_get(url: str) -> float:
+    start = time.perf_counter()
+    httpx.get(url, timeout=300).raise_for_status()
+    return time.perf_counter() - start
+
+
+def boot(env: dict, port: int) -> dict:
+    base = f"http://127.0.0.1:{port}"
+    start = time.monotonic()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+                              cwd=BACKEND_DIR, env={**os.environ, "LOG_LEVEL": "WARNING", **env}, start_new_session=True)
+    sampler = RssSampler(server.pid)
+    try:
+        live = wait_for(base + "/", start + 300) - start
+        first = timed_get(base + FIRST_REQUEST)
+        ready = wait_for(base + "/ready", start + 600) - start
+        warm = min(timed_get(base + FIRST_REQUEST) for _ in range(5))
+        steps = httpx.get(base + "/ready").json()["steps"]
+        rss = sampler.rss()
+    finally:
+        sampler.stop()
+        stop_server(server)
+    return {"liveS": round(live, 3), "readyS": round(ready, 3), "firstRequestMs": round(1000 * first, 1),
+            "warmRequestMs": round(1000 * warm, 1), "rssMb": round(rss / 2**20, 1),
+            "steps": {name: step.get("seconds") for name, step in steps.items()}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--data", help="reuse a directory written by benchmarks.datagen")
+    parser.add_argument("--import-runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--out", help="also save the results as JSON")
+    args = parser.parse_args()
+
+    total, packages = import_times(args.import_runs)
+    heaviest = sorted(packages.items(), key=lambda item: -item[1])[:8]
+    print(f"import   | app.main {1000 * total:.0f} ms (median of {args.import_runs}) | "
+          + ", ".join(f"{name} {1000 * seconds:.0f}" for name, seconds in heaviest))
+
+    data_dir = args.data or tempfile.mkdtemp(prefix="smartstore-startup-")
+    if not args.data:
+        datagen.generate(data_dir, args.rows)
+    results = {"importMs": round(1000 * total, 1), "packagesMs": {name: round(1000 * s, 1) for name, s in heaviest}}
+    for mode, warmup in [("warm", "1"), ("lazy", "0")]:
+        result = boot({**datagen.settings_env(data_dir), "WARMUP": warmup, "AUTO_REORDER": "0"}, args.port)
+        results[mode] = result
+        print(f"{mode:8} | {args.rows:,} items | live {result['liveS']:.2f}s | ready {result['readyS']:.2f}s"
+              f" | first request {result['firstRequestMs']:,.0f} ms | warm {result['warmRequestMs']:,.1f} ms"
+              f" | RSS {result['rssMb']:,.0f} MB | steps {result['steps']}")
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
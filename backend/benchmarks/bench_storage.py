@@ -0,0 +1,95 @@
+"""Storage backends: point lookups and filtered scans on the CSV path vs SQLite.
+
+"legacy" is what the routes used to do per request (csv.DictReader over the whole file). "csv cold" is
+the data store's first parse after a file change, "csv warm" a lookup on the cached snapshot. SQLite
+numbers are per query on an imported database. The CSV paths hold the whole file in memory, so they
+only run up to --csv-limit rows.
+
+Run from backend/:  python -m benchmarks.bench_storage --sizes 10000 1000000 10000000
+"""
+import argparse
+import csv
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.services.storage import CsvStorage, SqliteStorage
+from benchmarks.common import CATEGORIES, LOCATIONS, WORDS, timed
+
+CHUNK = 500_000
+
+
+def write_inventory(path: str, n: int, seed: int = 42):
+    """Synthetic inventory.csv written in chunks, so 10M rows never sit in memory at once."""
+    rng = np.random.default_rng(seed)
+    words = np.array([w.title() for w in WORDS])
+    for start in range(0, n, CHUNK):
+        m = min(CHUNK, n - start)
+        ids = np.arange(start + 1, start + m + 1)
+        pd.DataFrame({
+            "id": ids, "name": np.char.add(np.char.add(rng.choice(words, m), " "), rng.choice(words, m)),
+            "sku": np.char.add("SKU", (100000 + ids - 1).astype(str)), "category": rng.choice(CATEGORIES, m),
+            "currentStock": rng.integers(0, 51, m), "minStock": 5, "maxStock": 60, "reorderPoint": 10,
+            "reorderQuantity": 20, "location": rng.choice(LOCATIONS, m),
+            "status": rng.choice(["in-stock", "low-stock", "out-of-stock"], m),
+            "price": np.round(rng.uniform(1, 999, m), 2), "supplier": np.char.add(rng.choice(words, m), "Co"),
+            "supplierContact": "supplier@example.com", "leadTime": rng.integers(1, 10, m),
+        }).to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+
+def legacy_lookup(path: str, sku: str):
+    with open(path, newline="", encoding="utf-8") as file:
+        return [row for row in csv.DictReader(file) if row["sku"] == sku]
+
+
+def best_of(fn, *args, repeat=5) -> float:
+    return min(timed(fn, *args)[1] for _ in range(repeat))
+
+
+def ms(seconds: float) -> str:
+    return f"{1000 * seconds:9.2f} ms"
+
+
+def run(n: int, csv_limit: int):
+    data_dir = tempfile.mkdtemp(prefix="smartstore-storage-")
+    settings.DATA_DIR = data_dir
+    path = settings.inventory_file_path()
+    write_inventory(path, n)
+    sku = f"SKU{100000 + n // 2}"
+    filters = {"status": "low-stock", "category": "Dairy"}
+    print(f"--- {n} rows ({os.path.getsize(path) / 1e6:.0f} MB CSV)")
+
+    if n <= csv_limit:
+        _, legacy_s = timed(legacy_lookup, path, sku)
+        store = CsvStorage()
+        _, cold_s = timed(store.find, "inventory", "sku", sku)
+        warm_s = best_of(store.find, "inventory", "sku", sku)
+        scan_s = best_of(store.scan, "inventory", filters, 100)
+        print(f"csv    | legacy lookup {ms(legacy_s)} | cold lookup {ms(cold_s)} | warm lookup {ms(warm_s)}"
+              f" | scan {ms(scan_s)}")
+
+    db = SqliteStorage(os.path.join(data_dir, "smartstore.db"))
+    count, import_s = timed(db.import_csv, "inventory", path)
+    db.connection().execute("PRAGMA optimize")
+    by_id_s = best_of(db.find, "inventory", "id", n // 2)
+    by_sku_s = best_of(db.find, "inventory", "sku", sku)
+    scan_s = best_of(db.scan, "inventory", filters, 100)
+    print(f"sqlite | import {import_s:7.1f}s ({count / import_s:.0f} rows/s) | id lookup {ms(by_id_s)}"
+          f" | sku lookup {ms(by_sku_s)} | scan {ms(scan_s)} | {os.path.getsize(db.path) / 1e6:.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--csv-limit", type=int, default=1_000_000,
+                        help="largest size the in-memory CSV paths run at")
+    args = parser.parse_args()
+    for n in args.sizes:
+        run(n, args.csv_limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Sharded per-store inventory: parallel shard loading, per-shard invalidation and cross-store queries.
+
+Writes ``--stores`` shards of ``--skus`` rows each (same SKUs, different stock) under a temp STORES_DIR.
+"sequential" parses every shard one after the other; "thread"/"process" go through StoreShards with that
+pool. After touching one shard, only that shard is re-parsed. stock_by_sku and the transfer plan are
+compared with a per-row Python loop over the same frame.
+
+Run from backend/:  python -m benchmarks.bench_store_shards --stores 50 --skus 20000
+"""
+import argparse
+import os
+import tempfile
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.services.data_store import data_store, read_raw
+from app.services.store_shards import StoreShards
+from app.services.transfer_planner import plan_transfers
+from app.utils.csv_io import append_rows
+from benchmarks.bench_transfer_planner import loop_plan
+from benchmarks.common import make_inventory, timed
+
+
+def write_shards(stores: int, skus: int) -> str:
+    root = tempfile.mkdtemp(prefix="smartstore-stores-")
+    base = make_inventory(skus)
+    rng = np.random.default_rng(3)
+    for i in range(stores):
+        os.makedirs(os.path.join(root, f"store{i:03d}"))
+        base.assign(currentStock=rng.integers(0, 90, skus)).to_csv(
+            os.path.join(root, f"store{i:03d}", "inventory.csv"), index=False)
+    return root
+
+
+def loop_stock_by_sku(frame) -> dict:
+    totals = defaultdict(int)
+    for sku, stock in zip(frame["sku"].tolist(), frame["currentStock"].tolist()):
+        totals[sku] += stock
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stores", type=int, default=50)
+    parser.add_argument("--skus", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    settings.STORES_DIR = write_shards(args.stores, args.skus)
+    rows = args.stores * args.skus
+    print(f"{args.stores} stores x {args.skus} SKUs = {rows:,} rows | {args.workers} workers")
+
+    paths = [settings.store_inventory_file_path(f"store{i:03d}") for i in range(args.stores)]
+    _, sequential_s = timed(lambda: [read_raw(path) for path in paths])
+    print(f"sequential | {sequential_s:.2f}s ({rows / sequential_s:,.0f} rows/s)")
+    for pool in ["thread", "process"]:
+        data_store.invalidate()
+        shards = StoreShards(workers=args.workers, pool=pool)
+        _, load_s = timed(shards.snapshots)
+        print(f"{pool:10} | {load_s:.2f}s ({rows / load_s:,.0f} rows/s)")
+
+    shards = StoreShards(workers=args.workers)
+    _, combine_s = timed(shards.combined)
+    _, cached_s = timed(shards.combined)
+    print(f"combined frame built in {combine_s:.2f}s, unchanged shards checked in {1000 * cached_s:.1f} ms")
+
+    before = {store: snapshot.version for store, snapshot in shards.snapshots().items()}
+    append_rows(paths[0], [{"id": "0", "sku": "SKU100000", "name": "Extra", "currentStock": "1"}])
+    _, reload_s = timed(shards.combined)
+    reparsed = [store for store, snapshot in shards.snapshots().items() if snapshot.version != before[store]]
+    print(f"one shard changed: reloaded in {reload_s:.2f}s, re-parsed {len(reparsed)} shard(s)")
+
+    _, frame = shards.combined()
+    _, loop_s = timed(loop_stock_by_sku, frame)
+    totals, stock_s = timed(shards.stock_by_sku)
+    print(f"stock_by_sku | {len(totals):,} SKUs in {1000 * stock_s:.0f} ms (python loop {1000 * loop_s:.0f} ms)")
+
+    columns = [frame[name].to_numpy() for name in ["currentStock", "minStock", "maxStock", "leadTime"]]
+    loop_moved, loop_s = timed(loop_plan, pd.factorize(frame["sku"])[0], *columns)
+    plan, plan_s = timed(plan_transfers, frame)
+    assert int(plan["quantity"].sum()) == loop_moved, "vectorised and loop matching disagree"
+    print(f"transfers    | {len(plan):,} transfers, {loop_moved:,} units in {1000 * plan_s:.0f} ms"
+          f" (python loop {1000 * loop_s:.0f} ms, same units)")
+
+if __name__ == "__main__":
+    main()
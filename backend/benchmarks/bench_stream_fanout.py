@@ -0,0 +1,82 @@
+"""Live-feed fan-out: thousands of subscribers on one event loop, with slow clients.
+
+Appends rows to a temp inventory.csv and measures how long each diff takes to reach every
+subscriber (file watcher -> tracker -> broadcaster -> subscriber queue).
+
+Run from backend/:  python -m benchmarks.bench_stream_fanout --subscribers 5000 --slow 50 --updates 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from app.utils.csv_io import append_rows
+from benchmarks.common import make_data_dir
+
+
+async def run(subscribers: int, slow: int, updates: int):
+    data_dir = make_data_dir(1_000)
+    path = os.path.join(data_dir, "inventory.csv")
+    from app.services.live_feed import LiveFeed
+    from realtime_pipeline.inventory_tracker import InventoryTracker
+    feed = LiveFeed("bench", InventoryTracker, lambda: path)
+
+    sent_at = {}
+    latencies = []
+    snapshots = {"fast": 0, "slow": 0}
+    ready = asyncio.Event()
+    connected = [0]
+
+    async def client(is_slow: bool):
+        kind = "slow" if is_slow else "fast"
+        async for message in feed.messages():
+            if message is None:
+                continue
+            if message.kind == "snapshot":
+                snapshots[kind] += 1
+                connected[0] += 1
+                if connected[0] == subscribers:
+                    ready.set()
+            elif not is_slow and message.version in sent_at:
+                latencies.append(time.perf_counter() - sent_at[message.version])
+            if is_slow:
+                await asyncio.sleep(0.5)
+
+    tasks = [asyncio.create_task(client(i < slow)) for i in range(subscribers)]
+    await ready.wait()
+
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    for i in range(updates):
+        version = feed.tracker.version + 1
+        sent_at[version] = time.perf_counter()
+        await loop.run_in_executor(None, append_rows, path, [{"id": f"s{i}", "name": "Stream Probe", "sku": f"S{i}"}])
+        while feed.tracker.version < version:
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.03)
+    elapsed = time.perf_counter() - start
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    fast = subscribers - slow
+    latencies.sort()
+    print(f"subscribers {subscribers} (slow {slow}) | updates {updates} in {elapsed:.2f}s")
+    print(f"delivered {len(latencies)}/{fast * updates} diffs to fast clients | "
+          f"p50 {1000 * statistics.median(latencies):.1f} ms | p99 {1000 * latencies[int(len(latencies) * 0.99) - 1]:.1f} ms "
+          f"(includes the watcher's 20 ms debounce)")
+    print(f"snapshots sent: fast {snapshots['fast']} (1 per client), slow {snapshots['slow']} (resyncs after backpressure)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=5_000)
+    parser.add_argument("--slow", type=int, default=50)
+    parser.add_argument("--updates", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.subscribers, args.slow, args.updates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Vector index: build cost, incremental upserts, and ANN recall/latency against exact search.
+
+Recall@k is the overlap of the IVF top-k with the exact (full scan) top-k for the same query.
+
+Run from backend/:  python -m benchmarks.bench_vector_index --rows 1000000 --nprobe 8 16 32 64
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+
+from app.config import settings  # noqa: F401  (puts realtime_pipeline/ on sys.path)
+from benchmarks.common import make_inventory, timed
+from realtime_pipeline.vector_indexer import VectorIndex, row_text
+
+
+def latency(fn, queries):
+    times = []
+    results = []
+    for q in queries:
+        result, elapsed = timed(fn, q)
+        times.append(1000 * elapsed)
+        results.append(result)
+    times.sort()
+    return results, statistics.median(times), times[min(len(times) - 1, int(0.99 * len(times)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[8, 16, 32, 64])
+    args = parser.parse_args()
+
+    df = make_inventory(args.rows).astype(str)
+    items = [(row["id"], row_text(row)) for row in df.to_dict("records")]
+    index = VectorIndex(os.path.join(tempfile.mkdtemp(prefix="smartstore-vectors-"), "inventory"))
+
+    _, build_s = timed(index.upsert, items)
+    _, train_s = timed(index.train)
+    print(f"{args.rows} rows | embed+store {build_s:.1f}s ({args.rows / build_s:.0f} rows/s)"
+          f" | train {train_s:.1f}s ({len(index.centroids)} clusters)")
+
+    # ✅ Incremental: 1000 changed rows and 1000 deletes, no re-embedding of the rest
+    rng = random.Random(3)
+    changed = [(key, text + " clearance") for key, text in rng.sample(items, 1000)]
+    _, upsert_s = timed(index.upsert, changed)
+    _, delete_s = timed(index.delete, [key for key, _ in rng.sample(items, 1000)])
+    _, noop_s = timed(index.upsert, changed)
+    print(f"upsert 1000 changed {1000 * upsert_s:.1f} ms | delete 1000 {1000 * delete_s:.1f} ms"
+          f" | re-upsert unchanged {1000 * noop_s:.1f} ms")
+
+    queries = [f"{row['name']} {row['category']} {row['location']}".lower()
+               for row in df.sample(args.queries, random_state=1).to_dict("records")]
+    exact, p50, p99 = latency(lambda q: index.search(q, args.k, exact=True), queries)
+    print(f"exact   | p50 {p50:7.2f} ms | p99 {p99:7.2f} ms | recall@{args.k} 1.000")
+    for nprobe in args.nprobe:
+        approx, p50, p99 = latency(lambda q: index.search(q, args.k, nprobe=nprobe), queries)
+        recall = statistics.mean(
+            len({key for key, _ in a} & {key for key, _ in e}) / max(len(e), 1) for a, e in zip(approx, exact)
+        )
+        print(f"nprobe {nprobe:>3} | p50 {p50:7.2f} ms | p99 {p99:7.2f} ms | recall@{args.k} {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
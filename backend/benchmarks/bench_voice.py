@@ -0,0 +1,80 @@
+"""Voice commands on live data: server-side latency of the common commands and time to first chunk.
+
+"rescan" builds the out-of-stock / pending-reorder answer from the whole table per request (what the
+summaries avoid); "summaries" is POST /api/voice/command served from the incrementally maintained
+summaries. Also timed: applying a one-row diff, and the first reply after it (re-rendered once).
+
+Run from backend/:  python -m benchmarks.bench_voice --rows 100000 --requests 500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.config import settings
+from benchmarks.common import make_data_dir, timed
+
+COMMANDS = ["what's out of stock", "pending reorders", "inventory status", "what is running low"]
+
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    return 1000 * statistics.median(latencies), 1000 * latencies[int(len(latencies) * 0.99) - 1]
+
+
+def rescan_reply(inventory, reorders) -> str:
+    out = inventory.frame[inventory.frame["status"] == "out-of-stock"]["name"]
+    pending = reorders.frame[reorders.frame["status"] == "pending"]
+    return f"{len(out)} items are out of stock: {', '.join(out.head(5))}. {len(pending)} pending reorders."
+
+
+async def run(app, path: str, requests: int):
+    latencies, first_chunk = [], []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for i in range(requests):
+            query = {"query": COMMANDS[i % len(COMMANDS)]}
+            start = time.perf_counter()
+            async with client.stream("POST", path, json=query) as response:
+                async for _ in response.aiter_bytes():
+                    if len(first_chunk) == i:
+                        first_chunk.append(time.perf_counter() - start)
+            latencies.append(time.perf_counter() - start)
+    return latencies, first_chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--reorders", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    settings.DATA_DIR = make_data_dir(args.rows, reorder_rows=args.reorders)
+    from app.main import app
+    from app.services import csv_qa
+    from app.services.voice_service import voice_summaries
+
+    inventory, reorders = csv_qa.inventory_snapshot(), csv_qa.reorders_snapshot()
+    rescan_s = min(timed(rescan_reply, inventory, reorders)[1] for _ in range(20))
+    print(f"{args.rows} items, {args.reorders} reorders | rescan per request {1000 * rescan_s:.2f} ms")
+
+    _, start_s = timed(voice_summaries.ensure_started)
+    print(f"summaries built from the initial files in {start_s:.2f}s")
+
+    for label, path in [("command", "/api/voice/command"), ("stream", "/api/voice/command/stream")]:
+        latencies, first = asyncio.run(run(app, path, args.requests))
+        p50, p99 = percentiles(latencies)
+        f50, f99 = percentiles(first)
+        print(f"{label:8} | p50 {p50:6.2f} ms | p99 {p99:6.2f} ms | first chunk p50 {f50:6.2f} ms p99 {f99:6.2f} ms")
+
+    row = dict(next(iter(voice_summaries._trackers[0].rows.values())), status="out-of-stock")
+    diff = {"version": 0, "added": [], "changed": [row], "removed": []}
+    _, apply_s = timed(voice_summaries.apply_inventory, diff)
+    _, render_s = timed(voice_summaries.reply, "out_of_stock")
+    print(f"one-row diff applied in {1e6 * apply_s:.1f} us, first reply after it rendered in {1e6 * render_s:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
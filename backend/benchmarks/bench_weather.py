@@ -0,0 +1,123 @@
+"""Weather client under load against a local fake OpenWeather upstream.
+
+Compares the old blocking one-request-per-call pattern (run in a threadpool, as the sync route did) with the
+async pooled WeatherClient: p50/p99 latency and how many calls reach the upstream.
+
+Run from backend/:  python -m benchmarks.bench_weather --requests 2000 --concurrency 200 --cities 20
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from app.services.weather_service import WeatherClient
+
+
+class FakeUpstream:
+    """Minimal keep-alive HTTP/1.1 server that answers like OpenWeather after ``delay`` seconds."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+        self.server = None
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                self.calls += 1
+                await asyncio.sleep(self.delay)
+                city = head.split(b"q=", 1)[1].split(b"&", 1)[0].decode() if b"q=" in head else "?"
+                body = json.dumps({"weather": [{"main": "Clear", "description": f"clear sky in {city}"}],
+                                   "main": {"temp": 21.5, "humidity": 40}, "wind": {"speed": 3.2}}).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/data/2.5/weather"
+
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    return 1000 * statistics.median(latencies), 1000 * latencies[int(len(latencies) * 0.99) - 1]
+
+
+async def run_legacy(url, cities, concurrency):
+    def fetch(city):
+        # One blocking request per call, like the old requests-based handler
+        return httpx.get(f"{url}?q={city}&appid=x&units=metric").json()
+
+    latencies = []
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(40)  # Starlette's default threadpool size
+
+    async def one(city, sem):
+        async with sem:
+            start = time.perf_counter()
+            await loop.run_in_executor(executor, fetch, city)
+            latencies.append(time.perf_counter() - start)
+
+    sem = asyncio.Semaphore(concurrency)
+    await asyncio.gather(*(one(c, sem) for c in cities))
+    executor.shutdown()
+    return latencies
+
+
+async def run_client(url, cities, concurrency, ttl):
+    client = WeatherClient(base_url=url, api_key="x", ttl=ttl)
+    latencies = []
+
+    async def one(city, sem):
+        async with sem:
+            start = time.perf_counter()
+            await client.fetch(city)
+            latencies.append(time.perf_counter() - start)
+
+    sem = asyncio.Semaphore(concurrency)
+    await asyncio.gather(*(one(c, sem) for c in cities))
+    await client.aclose()
+    return latencies, client
+
+
+async def main_async(args):
+    rng = random.Random(1)
+    cities = [f"city{rng.randrange(args.cities)}" for _ in range(args.requests)]
+
+    for label in ("legacy blocking+threadpool", "async client, no cache", "async client, cached"):
+        upstream = FakeUpstream(args.delay)
+        url = await upstream.start()
+        start = time.perf_counter()
+        if label.startswith("legacy"):
+            latencies = await run_legacy(url, cities, args.concurrency)
+        else:
+            latencies, _ = await run_client(url, cities, args.concurrency, ttl=0 if "no cache" in label else 600)
+        elapsed = time.perf_counter() - start
+        upstream.server.close()
+        p50, p99 = percentiles(latencies)
+        print(f"{label:28} | {args.requests / elapsed:8.1f} req/s | p50 {p50:7.1f} ms | p99 {p99:7.1f} ms"
+              f" | upstream calls {upstream.calls}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--cities", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.05, help="fake upstream latency in seconds")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Shared helpers for the benchmark scripts (run them from backend/)."""
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+
+WORDS = ["laptop", "phone", "chair", "lamp", "desk", "cable", "monitor", "mouse", "router", "speaker",
+         "bread", "milk", "wrap", "bun", "juice", "coffee", "tea", "rice", "pasta", "soap"]
+CATEGORIES = ["Electronics", "Furniture", "Bakery", "Dairy", "Grocery"]
+LOCATIONS = ["Warehouse A", "Warehouse B", "Store Room", "Aisle 3"]
+
+
+def make_inventory(n: int, seed: int = 42) -> pd.DataFrame:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        name = f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}"
+        rows.append({
+            "id": i + 1, "name": name, "sku": f"SKU{100000 + i}", "category": rng.choice(CATEGORIES),
+            "currentStock": rng.randint(0, 50), "minStock": 5, "maxStock": 60, "reorderPoint": 10,
+            "reorderQuantity": 20, "location": rng.choice(LOCATIONS),
+            "status": rng.choice(["in-stock", "low-stock", "out-of-stock"]),
+            "price": round(rng.uniform(1, 999), 2), "supplier": f"{rng.choice(WORDS).title()}Co",
+            "supplierContact": "supplier@example.com", "leadTime": rng.randint(1, 9),
+        })
+    return pd.DataFrame(rows)
+
+
+def make_drivers(n: int, seed: int = 11) -> pd.DataFrame:
+    rng = random.Random(seed)
+    return pd.DataFrame([{
+        "id": i + 1, "name": f"Driver {i + 1}", "email": f"driver{i + 1}@smartstore.com",
+        "phone": f"+1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "status": rng.choice(["active", "inactive", "on-break"]), "location": f"{rng.choice(LOCATIONS)} Route",
+        "vehicle": f"Van #{rng.randint(1, 99):03d}", "safetyScore": rng.randint(50, 100),
+        "deliveries": rng.randint(0, 500), "incidents": rng.randint(0, 6), "lastActive": "5 minutes ago",
+        "joinDate": "2023-03-15", "certifications": rng.choice(["Defensive Driving;Hazmat", "First Aid", ""]),
+        "riskLevel": rng.choice(["low", "medium", "high"]), "avatar": "",
+    } for i in range(n)])
+
+
+def make_data_dir(inventory_rows: int, reorder_rows: int = 100) -> str:
+    """Write synthetic inventory.csv / reorders.csv into a temp dir and return it."""
+    data_dir = tempfile.mkdtemp(prefix="smartstore-bench-")
+    make_inventory(inventory_rows).to_csv(os.path.join(data_dir, "inventory.csv"), index=False)
+    rng = random.Random(7)
+    pd.DataFrame([{
+        "id": i + 1, "itemId": 100 + i, "itemName": f"{rng.choice(WORDS).title()} Pack",
+        "supplier": f"{rng.choice(WORDS).title()}Co", "quantity": rng.randint(5, 50),
+        "estimatedCost": round(rng.uniform(10, 500), 2),
+        "urgency": rng.choice(["critical", "high", "medium", "low"]),
+        "requestedBy": "System Auto-Reorder", "requestedDate": "2024-01-15",
+        "status": rng.choice(["pending", "approved", "delivered"]), "notes": "",
+    } for i in range(reorder_rows)]).to_csv(os.path.join(data_dir, "reorders.csv"), index=False)
+    return data_dir
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
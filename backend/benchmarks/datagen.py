@@ -0,0 +1,276 @@
+"""Synthetic SmartStore data at any scale: inventory, reorders, drivers, incidents and reviews.
+
+Rows are generated with NumPy in fixed-size chunks, each seeded from (seed, table, chunk), so the same
+seed always gives the same files and memory stays flat from 10k to 10M rows. Values are internally
+consistent: an item's status follows its stock and reorder point, a driver's risk level follows the
+safety score, incidents and reorders point at existing drivers and items.
+
+The output directory mirrors the settings: inventory/ (DATA_DIR), drivers/, sentiment/reviews.csv,
+incidents.db and, with --stores, stores/<store>/inventory.csv. ``settings_env(out)`` gives the
+environment variables that point the app at it.
+
+Run from backend/:  python -m benchmarks.datagen --out /tmp/smartstore --rows 1000000 --seed 42
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 500_000
+TABLES = ["inventory", "reorders", "drivers", "incidents", "reviews", "stores"]
+
+ADJECTIVES = np.array(["Classic", "Organic", "Premium", "Fresh", "Smart", "Compact", "Deluxe", "Eco", "Ultra", "Family",
+                       "Mini", "Pro", "Golden", "Crunchy", "Wireless", "Artisan", "Frozen", "Spicy", "Vintage", "Daily"])
+CATEGORY_ITEMS = {
+    "Electronics": (["Laptop", "Phone", "Monitor", "Router", "Speaker", "Headphones", "Charger", "Tablet"], 20, 1500),
+    "Furniture": (["Chair", "Desk", "Lamp", "Shelf", "Stool", "Cabinet"], 25, 600),
+    "Bakery": (["Bread", "Bun", "Croissant", "Bagel", "Muffin", "Wrap"], 1, 12),
+    "Dairy": (["Milk", "Yogurt", "Cheese", "Butter", "Cream"], 1, 15),
+    "Grocery": (["Rice", "Pasta", "Coffee", "Tea", "Juice", "Cereal", "Soap", "Olive Oil"], 1, 30),
+}
+CATEGORIES = np.array(list(CATEGORY_ITEMS))
+LOCATIONS = np.array(["Warehouse A", "Warehouse B", "Store Room", "Aisle 1", "Aisle 2", "Aisle 3", "Cold Storage"])
+SUPPLIERS = np.array(["TechSupplier", "PhoneCo", "HomeGoods Ltd", "Local Bakery", "Fresh Foods Inc", "DairyBest",
+                      "Grocery Wholesale", "Metro Distributors", "GreenFarm", "Prime Logistics"])
+FIRST_NAMES = np.array(["John", "Sarah", "Mike", "Emily", "David", "Lisa", "Carlos", "Aisha", "Wei", "Priya", "Tom",
+                        "Anna", "Omar", "Grace", "Luis", "Nina", "Ravi", "Chloe", "Sam", "Fatima"])
+LAST_NAMES = np.array(["Smith", "Johnson", "Brown", "Garcia", "Miller", "Davis", "Martinez", "Lee", "Khan", "Patel",
+                       "Wilson", "Anderson", "Thomas", "Moore", "Clark", "Lewis", "Walker", "Young", "Hall", "Allen"])
+ROUTES = np.array(["Downtown Route", "Suburban Route", "Airport Route", "Industrial Route", "Harbor Route", "North Loop"])
+CERTIFICATIONS = np.array(["Defensive Driving;Hazmat", "Defensive Driving;First Aid", "First Aid", "Hazmat", ""])
+INCIDENT_TYPES = np.array(["Speeding", "Hard Braking", "Minor Collision", "Late Delivery", "Vehicle Damage",
+                           "Route Deviation", "Customer Complaint"])
+REVIEW_PARTS = {
+    "positive": (["Great", "Friendly", "Fast", "Clean", "Excellent", "Helpful"],
+                 ["service", "staff", "checkout", "store", "delivery", "selection"],
+                 ["today!", "as always.", "love it.", "highly recommend.", "will come back."]),
+    "negative": (["Terrible", "Slow", "Rude", "Dirty", "Awful", "Disappointing"],
+                 ["service", "staff", "checkout", "store", "delivery", "parking"],
+                 ["never again.", "very frustrating.", "worst experience.", "items were missing.", "long wait."]),
+    "neutral": (["Average", "Okay", "Standard", "Normal", "Typical"],
+                ["visit", "prices", "selection", "store", "delivery"],
+                ["nothing special.", "as expected.", "could be better.", "it was fine."]),
+}
+
+
+def rng_for(seed: int, table: str, chunk: int) -> np.random.Generator:
+    return np.random.default_rng([seed, TABLES.index(table), chunk])
+
+
+def chunks(rows: int):
+    for number, start in enumerate(range(0, rows, CHUNK_ROWS)):
+        yield number, start, min(CHUNK_ROWS, rows - start)
+
+
+def _join(*parts) -> np.ndarray:
+    result = parts[0].astype(object)
+    for part in parts[1:]:
+        result = result + part.astype(object)
+    return result
+
+
+def driver_names(ids: np.ndarray) -> np.ndarray:
+    """Name of driver ``id``: a pure function of the id, so incidents agree with drivers.csv."""
+    return _join(FIRST_NAMES[ids % len(FIRST_NAMES)], np.full(len(ids), " "), LAST_NAMES[(ids // len(FIRST_NAMES)) % len(LAST_NAMES)])
+
+
+def stock_status(stock: np.ndarray, reorder_point: np.ndarray) -> np.ndarray:
+    return np.where(stock <= 0, "out-of-stock", np.where(stock <= reorder_point, "low-stock", "in-stock"))
+
+
+def restock(frame: pd.DataFrame, rng) -> pd.DataFrame:
+    """The same items with stock drawn afresh, as another store would hold them."""
+    stock = rng.integers(0, frame["maxStock"].to_numpy() + 1)
+    return frame.assign(currentStock=stock, status=stock_status(stock, frame["reorderPoint"].to_numpy()))
+
+
+def inventory_chunk(rng, start: int, n: int) -> pd.DataFrame:
+    ids = np.arange(start + 1, start + n + 1)
+    category = rng.integers(0, len(CATEGORIES), n)
+    nouns = np.empty(n, dtype=object)
+    price = np.empty(n)
+    for code, (items, low, high) in enumerate(CATEGORY_ITEMS.values()):
+        mask = category == code
+        nouns[mask] = np.array(items)[rng.integers(0, len(items), mask.sum())]
+        price[mask] = np.round(np.exp(rng.uniform(np.log(low), np.log(high), mask.sum())), 2)
+    min_stock = rng.integers(2, 20, n)
+    reorder_point = min_stock + rng.integers(0, 10, n)
+    max_stock = reorder_point + rng.integers(20, 200, n)
+    # About 8% out of stock, 15% at or below the reorder point, the rest healthy
+    roll = rng.random(n)
+    stock = np.where(roll < 0.08, 0, np.where(roll < 0.23, rng.integers(1, reorder_point + 1), rng.integers(reorder_point + 1, max_stock + 1)))
+    supplier = SUPPLIERS[(category * 2 + rng.integers(0, 2, n)) % len(SUPPLIERS)]
+    return pd.DataFrame({
+        "id": ids,
+        "name": _join(ADJECTIVES[rng.integers(0, len(ADJECTIVES), n)], np.full(n, " "), nouns),
+        "sku": _join(np.full(n, "SKU"), (100000 + ids).astype(str)),
+        "category": CATEGORIES[category],
+        "currentStock": stock, "minStock": min_stock, "maxStock": max_stock,
+        "reorderPoint": reorder_point, "reorderQuantity": max_stock - reorder_point,
+        "location": LOCATIONS[rng.integers(0, len(LOCATIONS), n)],
+        "status": stock_status(stock, reorder_point), "price": price, "supplier": supplier,
+        "supplierContact": _join(np.char.lower(np.char.replace(supplier.astype(str), " ", "")).astype(object), np.full(n, "@example.com")),
+        "leadTime": rng.integers(1, 15, n),
+    })
+
+
+def reorders_chunk(rng, start: int, n: int, items: int) -> pd.DataFrame:
+    item_ids = rng.integers(1, max(items, 1) + 1, n)
+    quantity = rng.integers(5, 200, n)
+    return pd.DataFrame({
+        "id": np.arange(start + 1, start + n + 1),
+        "itemId": item_ids,
+        "itemName": _join(ADJECTIVES[item_ids % len(ADJECTIVES)], np.full(n, " Item "), item_ids.astype(str)),
+        "supplier": SUPPLIERS[rng.integers(0, len(SUPPLIERS), n)],
+        "quantity": quantity,
+        "estimatedCost": np.round(quantity * rng.uniform(1, 50, n), 2),
+        "urgency": np.array(["critical", "high", "medium", "low"])[rng.choice(4, n, p=[0.1, 0.25, 0.4, 0.25])],
+        "requestedBy": np.array(["System Auto-Reorder", "Store Manager", "Inventory Clerk"])[rng.integers(0, 3, n)],
+        "requestedDate": (np.datetime64("2024-01-01") + rng.integers(0, 365, n)).astype(str),
+        "status": np.array(["pending", "approved", "delivered", "cancelled"])[rng.choice(4, n, p=[0.3, 0.2, 0.45, 0.05])],
+        "notes": "",
+    })
+
+
+def drivers_chunk(rng, start: int, n: int) -> pd.DataFrame:
+    ids = np.arange(start + 1, start + n + 1)
+    names = driver_names(ids)
+    safety = np.clip(np.round(100 - rng.gamma(2.0, 6.0, n)), 40, 100).astype(int)
+    return pd.DataFrame({
+        "id": ids, "name": names,
+        "email": _join(np.char.lower(np.char.replace(names.astype(str), " ", ".")).astype(object), np.full(n, "."),
+                       ids.astype(str), np.full(n, "@smartstore.com")),
+        "phone": _join(np.full(n, "+1 (555) "), rng.integers(100, 1000, n).astype(str), np.full(n, "-"),
+                       rng.integers(1000, 10000, n).astype(str)),
+        "status": np.array(["active", "inactive", "on-break"])[rng.choice(3, n, p=[0.7, 0.15, 0.15])],
+        "location": ROUTES[rng.integers(0, len(ROUTES), n)],
+        "vehicle": _join(np.array(["Van #", "Truck #"])[rng.integers(0, 2, n)], np.char.zfill(rng.integers(1, 1000, n).astype(str), 3)),
+        "safetyScore": safety,
+        "deliveries": rng.integers(0, 2000, n),
+        "incidents": rng.poisson((100 - safety) / 10),
+        "lastActive": _join(rng.integers(1, 60, n).astype(str), np.full(n, " minutes ago")),
+        "joinDate": (np.datetime64("2019-01-01") + rng.integers(0, 1800, n)).astype(str),
+        "certifications": CERTIFICATIONS[rng.integers(0, len(CERTIFICATIONS), n)],
+        "riskLevel": np.where(safety >= 85, "low", np.where(safety >= 70, "medium", "high")),
+        "avatar": "",
+    })
+
+
+def incidents_chunk(rng, start: int, n: int, drivers: int) -> pd.DataFrame:
+    driver_ids = rng.integers(1, max(drivers, 1) + 1, n)
+    return pd.DataFrame({
+        "id": _join(np.full(n, "INC-"), np.arange(start + 1, start + n + 1).astype(str)),
+        "driverId": driver_ids.astype(str),
+        "driverName": driver_names(driver_ids),
+        "type": INCIDENT_TYPES[rng.integers(0, len(INCIDENT_TYPES), n)],
+        "severity": np.array(["minor", "moderate", "severe"])[rng.choice(3, n, p=[0.6, 0.3, 0.1])],
+        "description": "Generated incident",
+        "date": (np.datetime64("2024-01-01") + rng.integers(0, 365, n)).astype(str),
+        "status": np.array(["reported", "investigating", "resolved"])[rng.choice(3, n, p=[0.2, 0.2, 0.6])],
+        "location": ROUTES[rng.integers(0, len(ROUTES), n)],
+    })
+
+
+def reviews_chunk(rng, start: int, n: int) -> pd.DataFrame:
+    mood = rng.choice(3, n, p=[0.55, 0.3, 0.15])
+    text = np.empty(n, dtype=object)
+    for code, (first, middle, last) in enumerate(REVIEW_PARTS.values()):
+        mask = mood == code
+        k = mask.sum()
+        text[mask] = _join(np.array(first)[rng.integers(0, len(first), k)], np.full(k, " "),
+                           np.array(middle)[rng.integers(0, len(middle), k)], np.full(k, ", "),
+                           np.array(last)[rng.integers(0, len(last), k)])
+    rating = np.where(mood == 0, rng.integers(4, 6, n), np.where(mood == 1, rng.integers(1, 3, n), 3))
+    return pd.DataFrame({
+        "id": np.arange(start + 1, start + n + 1), "text": text, "rating": rating,
+        "date": (np.datetime64("2024-01-01") + rng.integers(0, 365, n)).astype(str),
+    })
+
+
+def write_csv(path: str, rows: int, make_chunk) -> int:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        for number, start, n in chunks(rows):
+            make_chunk(number, start, n).to_csv(file, header=number == 0, index=False)
+    return rows
+
+
+def write_incidents(path: str, rows: int, drivers: int, seed: int) -> int:
+    from app.services.incident_store import IncidentStore
+
+    for suffix in ["", "-wal", "-shm"]:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    store = IncidentStore(path)
+    for number, start, n in chunks(rows):
+        store.add_many(incidents_chunk(rng_for(seed, "incidents", number), start, n, drivers).to_dict("records"))
+    return rows
+
+
+def default_counts(rows: int) -> dict:
+    """Table sizes for ``--rows`` items: one reorder and incident per ten items, a driver per hundred."""
+    return {"inventory": rows, "reorders": max(rows // 10, 100), "drivers": max(rows // 100, 100),
+            "incidents": max(rows // 10, 100), "reviews": max(rows // 10, 100)}
+
+
+def generate(out: str, rows: int = 10_000, seed: int = 42, stores: int = 0, **counts) -> dict:
+    """Write every table under ``out``; ``counts`` overrides single table sizes. Returns rows written per table."""
+    sizes = {**default_counts(rows), **{k: v for k, v in counts.items() if v is not None}}
+    written = {
+        "inventory": write_csv(os.path.join(out, "inventory", "inventory.csv"), sizes["inventory"],
+                               lambda number, start, n: inventory_chunk(rng_for(seed, "inventory", number), start, n)),
+        "reorders": write_csv(os.path.join(out, "inventory", "reorders.csv"), sizes["reorders"],
+                              lambda number, start, n: reorders_chunk(rng_for(seed, "reorders", number), start, n, sizes["inventory"])),
+        "drivers": write_csv(os.path.join(out, "drivers", "drivers.csv"), sizes["drivers"],
+                             lambda number, start, n: drivers_chunk(rng_for(seed, "drivers", number), start, n)),
+        "reviews": write_csv(os.path.join(out, "sentiment", "reviews.csv"), sizes["reviews"],
+                             lambda number, start, n: reviews_chunk(rng_for(seed, "reviews", number), start, n)),
+        "incidents": write_incidents(os.path.join(out, "incidents.db"), sizes["incidents"], sizes["drivers"], seed),
+    }
+    # Per-store shards: the same catalog everywhere, stock drawn per store
+    for store in range(stores):
+        store_rng = rng_for(seed, "stores", store)
+        write_csv(os.path.join(out, "stores", f"store{store + 1:03d}", "inventory.csv"), sizes["inventory"],
+                  lambda number, start, n: restock(inventory_chunk(rng_for(seed, "inventory", number), start, n), store_rng))
+    if stores:
+        written["stores"] = stores * sizes["inventory"]
+    return written
+
+
+def settings_env(out: str) -> dict:
+    """Environment variables that point the app's settings at a generated directory."""
+    return {
+        "DATA_DIR": os.path.join(out, "inventory"),
+        "DRIVERS_DIR": os.path.join(out, "drivers"),
+        "SENTIMENT_DIR": os.path.join(out, "sentiment"),
+        "INCIDENTS_DB": os.path.join(out, "incidents.db"),
+        "STORES_DIR": os.path.join(out, "stores"),
+        "VECTOR_DIR": os.path.join(out, "vectors"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--rows", type=int, default=10_000, help="inventory items; the other tables scale with it")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stores", type=int, default=0, help="also write this many per-store inventory shards")
+    for table in ["reorders", "drivers", "incidents", "reviews"]:
+        parser.add_argument(f"--{table}", type=int, default=None, help=f"rows of {table} (default: scaled from --rows)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = generate(args.out, args.rows, args.seed, args.stores, reorders=args.reorders, drivers=args.drivers,
+                       incidents=args.incidents, reviews=args.reviews)
+    elapsed = time.perf_counter() - start
+    total = sum(written.values())
+    print(f"{total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s) under {args.out}")
+    for table, rows in written.items():
+        print(f"  {table:10} {rows:>12,}")
+    print("Point the app at it with: " + " ".join(f"{k}={v}" for k, v in settings_env(args.out).items()))
+
+
+if __name__ == "__main__":
+    main()
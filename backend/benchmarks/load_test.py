@@ -0,0 +1,330 @@
+"""End-to-end load test: the real server under concurrent clients, one endpoint at a time.
+
+Generates a dataset with benchmarks.datagen (or reuses --data), starts uvicorn on it in a subprocess and
+drives every router registered in app.main with --concurrency clients for --duration seconds per
+endpoint. Reports throughput, p50/p95/p99 latency, errors and the server's peak RSS (the process and its
+workers, sampled from /proc) per endpoint, and saves them as JSON so runs can be compared with --compare.
+Weather calls an external API and only runs with --weather.
+
+Run from backend/:  python -m benchmarks.load_test --rows 100000 --concurrency 16 --duration 10
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+import numpy as np
+
+from benchmarks import datagen
+from benchmarks.common import timed
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+PAGE = 100
+
+
+class Scenario:
+    """One endpoint: ``request(i)`` gives (method, path, json body) for the i-th call."""
+
+    def __init__(self, name: str, request, first_chunk: bool = False):
+        self.name = name
+        self.request = request
+        self.first_chunk = first_chunk  # endless streams: time to the first chunk, then disconnect
+
+
+def get(path):
+    return lambda i: ("GET", path(i) if callable(path) else path, None)
+
+
+def post(path, body=None):
+    return lambda i: ("POST", path, body(i) if callable(body) else body)
+
+
+def scenarios(counts: dict, stores: list, seed: int, weather: bool) -> list:
+    rng = random.Random(seed)
+    item = lambda: rng.randint(1, counts["inventory"])
+    driver = lambda: rng.randint(1, counts["drivers"])
+    incident = lambda: rng.randint(1, counts["incidents"])
+    new_ids = itertools.count(counts["inventory"] + 1)
+    new_incidents = itertools.count(counts["incidents"] + 1)
+    questions = ["what's out of stock", "how many items are low on stock", "pending reorders",
+                 "which supplier has the most items", "show items in Warehouse A"]
+    reviews = ["Great service today!", "Slow checkout, very frustrating.", "It was fine."]
+
+    def new_item(i):
+        rows = datagen.inventory_chunk(np.random.default_rng([seed, i]), next(new_ids) - 1, 1)
+        return rows.to_dict("records")[0]
+
+    def new_incident(i):
+        driver_id = driver()
+        return {"id": f"LOAD-{seed}-{next(new_incidents)}", "driverId": str(driver_id),
+                "driverName": str(datagen.driver_names(np.array([driver_id]))[0]), "type": "Hard Braking",
+                "severity": "minor", "description": "Load test", "date": "2024-06-01", "status": "reported",
+                "location": "Downtown Route"}
+
+    store = lambda: rng.choice(stores) if stores else "main"
+    result = [
+        Scenario("root", get("/")),
+        Scenario("metrics", get("/metrics")),
+        Scenario("pool", get("/api/pool")),
+        # Inventory
+        Scenario("inventory.status.page", get(lambda i: f"/api/inventory/status?limit={PAGE}&status=low-stock")),
+        Scenario("inventory.status.full", get("/api/inventory/status")),
+        Scenario("inventory.lookup", get(lambda i: f"/api/inventory/lookup?sku=SKU{100000 + item()}")),
+        Scenario("inventory.export", get("/api/inventory/export?status=out-of-stock")),
+        Scenario("inventory.add", post("/api/inventory/add", new_item)),
+        Scenario("inventory.add.batch", post("/api/inventory/add/batch", lambda i: {"items": [new_item(i) for _ in range(10)]})),
+        Scenario("inventory.transfers.plan", post(f"/api/inventory/transfers/plan?limit={PAGE}")),
+        Scenario("inventory.transfers.saved", get(f"/api/inventory/transfers/plan?limit={PAGE}")),
+        # Reorders
+        Scenario("reorders.list", get(f"/api/reorders/list?limit={PAGE}&status=pending")),
+        Scenario("reorders.suggestions", get("/api/reorders/suggestions")),
+        Scenario("reorders.auto", get("/api/reorders/auto")),
+        # Drivers
+        Scenario("drivers.list", get(f"/api/drivers/?limit={PAGE}")),
+        Scenario("drivers.risk.top", get("/api/drivers/risk/top")),
+        Scenario("drivers.risk.one", get(lambda i: f"/api/drivers/risk/{driver()}")),
+        Scenario("drivers.deliveries", post("/api/drivers/deliveries", lambda i: {"driverId": str(driver()), "count": 1})),
+        # Sentiment
+        Scenario("sentiment.reviews", get("/api/sentiment/reviews")),
+        Scenario("sentiment.ingest", post("/api/sentiment/reviews", {"reviews": reviews})),
+        Scenario("sentiment.classify", post("/api/sentiment/classify?stream=false",
+                                            lambda i: {"reviews": [f"{text} #{i}" for text in reviews]})),
+        # Chatbot and voice
+        Scenario("chatbot.query", post("/api/chatbot/query", lambda i: {"question": questions[i % len(questions)]})),
+        Scenario("voice.command", post("/api/voice/command", lambda i: {"query": questions[i % len(questions)]})),
+        Scenario("voice.stream", post("/api/voice/command/stream", lambda i: {"query": questions[i % len(questions)]})),
+        # Incidents
+        Scenario("incidents.list", get(f"/api/incidents/?limit={PAGE}&status=reported")),
+        Scenario("incidents.counts", get(lambda i: f"/api/incidents/counts?driverId={driver()}")),
+        Scenario("incidents.get", get(lambda i: f"/api/incidents/INC-{incident()}")),
+        Scenario("incidents.add", post("/api/incidents/", new_incident)),
+        Scenario("incidents.resolve", lambda i: ("PATCH", f"/api/incidents/INC-{incident()}/resolve", None)),
+        # Live stream and stores
+        Scenario("stream.inventory", get("/api/stream/inventory"), first_chunk=True),
+        Scenario("stores.list", get("/api/stores/")),
+        Scenario("stores.stock", get(f"/api/stores/stock?limit={PAGE}")),
+        Scenario("stores.transfers", get(f"/api/stores/transfers?limit={PAGE}")),
+        Scenario("stores.inventory", get(lambda i: f"/api/stores/{store()}/inventory?limit={PAGE}")),
+    ]
+    if weather:
+        result.append(Scenario("weather", get("/api/weather/?city=London")))
+    return result
+
+
+class RssSampler:
+    """Peak resident memory of a process and all its descendants, sampled from /proc."""
+
+    def __init__(self, pid: int, interval: float = 0.1):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stopped = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    @staticmethod
+    def _children(pid: int) -> list:
+        children = []
+        try:
+            for task in os.listdir(f"/proc/{pid}/task"):
+                with open(f"/proc/{pid}/task/{task}/children") as file:
+                    children.extend(int(child) for child in file.read().split())
+        except OSError:
+            pass
+        return children
+
+    def rss(self) -> int:
+        total, pending = 0, [self.pid]
+        while pending:
+            pid = pending.pop()
+            try:
+                with open(f"/proc/{pid}/statm") as file:
+                    total += int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            except OSError:
+                continue
+            pending.extend(self._children(pid))
+        return total
+
+    def reset(self):
+        self.peak = self.rss()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.peak = max(self.peak, self.rss())
+
+    def stop(self):
+        self._stopped.set()
+
+
+async def call(client: httpx.AsyncClient, scenario: Scenario, i: int) -> int:
+    method, path, body = scenario.request(i)
+    async with client.stream(method, path, json=body) as response:
+        async for _ in response.aiter_raw():
+            if scenario.first_chunk:
+                break
+        return response.status_code
+
+
+async def drive(base_url: str, scenario: Scenario, concurrency: int, duration: float, timeout: float) -> dict:
+    latencies, statuses, counter = [], {}, itertools.count()
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                status = str(await call(client, scenario, next(counter)))
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    quantile = lambda q: round(float(np.percentile(ms, q)), 2) if len(ms) else None
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50": quantile(50), "p95": quantile(95), "p99": quantile(99),
+        "errors": sum(count for status, count in statuses.items() if not status.startswith(("2", "3"))),
+        "statuses": statuses,
+    }
+
+
+def start_server(env: dict, port: int, workers: int) -> subprocess.Popen:
+    try:
+        httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+        raise RuntimeError(f"port {port} is already serving; stop that server or pass --port")
+    except httpx.TransportError:
+        pass
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"]
+    if workers > 1:
+        command += ["--workers", str(workers)]
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env={**os.environ, "LOG_LEVEL": "WARNING", **env},
+                              start_new_session=True)
+    deadline = time.monotonic() + 300
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/ready", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    stop_server(server)
+    raise RuntimeError("server did not start within 300s")
+
+
+def stop_server(server: subprocess.Popen):
+    os.killpg(server.pid, signal.SIGTERM)
+    try:
+        server.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        os.killpg(server.pid, signal.SIGKILL)  # anything still left in the session, e.g. pool workers
+    except ProcessLookupError:
+        pass
+
+
+def git_sha() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(results: dict, baseline_path: str):
+    with open(baseline_path) as file:
+        baseline = json.load(file)["endpoints"]
+    print(f"\nvs {baseline_path}")
+    print(f"{'endpoint':28} {'rps':>18} {'p95 ms':>20} {'peak RSS MB':>16}")
+    change = lambda new, old: f"{100 * (new - old) / old:+6.1f}%" if old else "    n/a"
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None or not result["requests"] or not old["requests"]:
+            continue
+        print(f"{name:28} {result['rps']:>9,.1f} {change(result['rps'], old['rps'])}"
+              f" {result['p95']:>11,.2f} {change(result['p95'], old['p95'])}"
+              f" {result['peakRssMb']:>7,.0f} {change(result['peakRssMb'], old['peakRssMb'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000, help="inventory items to generate (or in --data)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stores", type=int, default=4, help="per-store shards to generate")
+    parser.add_argument("--data", help="reuse a directory written by benchmarks.datagen with the same --rows/--stores")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10, help="seconds per endpoint")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--only", help="comma-separated endpoint names (or prefixes) to run")
+    parser.add_argument("--weather", action="store_true", help="also hit /api/weather (external API)")
+    parser.add_argument("--out", help="result file (default: benchmarks/results/load-<time>.json)")
+    parser.add_argument("--compare", help="an earlier result file to compare against")
+    args = parser.parse_args()
+
+    data_dir = args.data or tempfile.mkdtemp(prefix="smartstore-load-")
+    counts = datagen.default_counts(args.rows)
+    if not args.data:
+        _, generate_s = timed(datagen.generate, data_dir, args.rows, args.seed, args.stores)
+        print(f"generated {args.rows:,} items and related tables in {generate_s:.1f}s under {data_dir}")
+    stores = [f"store{store + 1:03d}" for store in range(args.stores)]
+    selected = [scenario for scenario in scenarios(counts, stores, args.seed, args.weather)
+                if not args.only or scenario.name.startswith(tuple(args.only.split(",")))]
+
+    started = time.perf_counter()
+    server = start_server({**datagen.settings_env(data_dir), "AUTO_REORDER": "0"}, args.port, args.workers)
+    print(f"server ready in {time.perf_counter() - started:.1f}s | {args.concurrency} clients, {args.duration:g}s per endpoint")
+    sampler = RssSampler(server.pid)
+    results = {}
+    try:
+        for scenario in selected:
+            sampler.reset()
+            result = asyncio.run(drive(f"http://127.0.0.1:{args.port}", scenario, args.concurrency, args.duration, args.timeout))
+            result["peakRssMb"] = round(sampler.peak / 2**20, 1)
+            results[scenario.name] = result
+            print(f"{scenario.name:28} {result['rps']:>9,.1f} req/s | p50 {result['p50']:>8} ms | p95 {result['p95']:>8} ms"
+                  f" | p99 {result['p99']:>8} ms | errors {result['errors']:>5} | peak RSS {result['peakRssMb']:>7,.0f} MB")
+    finally:
+        sampler.stop()
+        stop_server(server)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "git": git_sha(), "rows": args.rows, "stores": args.stores,
+            "seed": args.seed, "concurrency": args.concurrency, "duration": args.duration, "workers": args.workers,
+            "python": platform.python_version(), "cpus": os.cpu_count(), "data": data_dir,
+        },
+        "endpoints": results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"load-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"results saved to {out}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
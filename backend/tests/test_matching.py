@@ -0,0 +1,63 @@
+"""greedy_match against a plain per-group greedy loop.
+
+Run from backend/:  python -m pytest tests
+"""
+import numpy as np
+import pytest
+
+from app.utils.matching import greedy_match
+
+
+def loop_match(groups, spare, need, receiver_keys=()) -> list:
+    """The same matching one group at a time: ``[(donor row, receiver row, quantity), ...]``."""
+    spare, need = spare.astype(np.int64), need.astype(np.int64)
+    pairs = []
+    for group in sorted(set(groups.tolist())):
+        rows = [i for i in range(len(groups)) if groups[i] == group]
+        donors = sorted((i for i in rows if spare[i] > 0), key=lambda i: -spare[i])
+        receivers = sorted((i for i in rows if need[i] > 0),
+                           key=lambda i: (*(key[i] for key in reversed(receiver_keys)), -need[i]))
+        left = {i: spare[i] for i in donors}
+        wanted = {i: need[i] for i in receivers}
+        d = r = 0
+        while d < len(donors) and r < len(receivers):
+            quantity = min(left[donors[d]], wanted[receivers[r]])
+            pairs.append((donors[d], receivers[r], int(quantity)))
+            left[donors[d]] -= quantity
+            wanted[receivers[r]] -= quantity
+            d += left[donors[d]] == 0
+            r += wanted[receivers[r]] == 0
+    return pairs
+
+
+def as_pairs(result) -> list:
+    donor, receiver, quantity = result
+    return list(zip(donor.tolist(), receiver.tolist(), quantity.tolist()))
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_matches_per_group_greedy(seed):
+    rng = np.random.default_rng(seed)
+    rows = int(rng.integers(1, 40))
+    groups = rng.integers(0, int(rng.integers(1, 6)), rows)
+    spare = np.where(rng.random(rows) < 0.5, rng.integers(0, 20, rows), 0)
+    need = np.where(spare == 0, rng.integers(0, 20, rows), 0)
+    keys = (rng.integers(-3, 3, rows), rng.random(rows) < 0.5) if seed % 2 else ()
+
+    expected = loop_match(groups, spare, need, keys)
+    # greedy_match orders pairs by group, then along each group's number line, like the loop
+    assert as_pairs(greedy_match(groups, spare, need, receiver_keys=keys)) == expected
+
+
+def test_no_shared_group():
+    groups = np.array([0, 1])
+    result = greedy_match(groups, np.array([5, 0]), np.array([0, 5]))
+    assert all(len(part) == 0 for part in result)
+
+
+def test_moves_at_most_supply_or_demand():
+    groups = np.array([0, 0, 0, 1, 1])
+    spare = np.array([7, 0, 0, 2, 0])
+    need = np.array([0, 4, 6, 0, 9])
+    donor, receiver, quantity = greedy_match(groups, spare, need)
+    assert as_pairs((donor, receiver, quantity)) == [(0, 2, 6), (0, 1, 1), (3, 4, 2)]
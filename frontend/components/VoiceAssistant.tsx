@@ -15,7 +15,7 @@ export default function VoiceAssistant() {
 
   const sendCommandToBackend = async (cmd: string) => {
     try {
-      const res = await fetch("http://localhost:8000/api/voice/command", {
+      const res = await fetch("http://localhost:8000/api/voice/command/stream", {
         method: "POST",
         headers: {
           "Content-Type": "application/json"
@@ -23,12 +23,23 @@ export default function VoiceAssistant() {
         body: JSON.stringify({ query: cmd })
       })
 
-      const data = await res.json()
-      console.log("Reply from backend:", data.reply)
-
-      // ✅ Speak the reply
-      const utterance = new SpeechSynthesisUtterance(data.reply)
-      speechSynthesis.speak(utterance)
+      // ✅ Speak each sentence as soon as it arrives (one JSON object per line)
+      const reader = res.body!.getReader()
+      const decoder = new TextDecoder()
+      let buffered = ""
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+        buffered += decoder.decode(value, { stream: true })
+        const lines = buffered.split("\n")
+        buffered = lines.pop() ?? ""
+        for (const line of lines) {
+          if (!line.trim()) continue
+          const { text } = JSON.parse(line)
+          console.log("Reply from backend:", text)
+          speechSynthesis.speak(new SpeechSynthesisUtterance(text))
+        }
+      }
     } catch (err) {
       console.error("Error sending voice command:", err)
     }
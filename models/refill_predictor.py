@@ -1,7 +1,96 @@
+import numpy as np
+import pandas as pd
+
+NUMERIC_COLUMNS = ["currentStock", "minStock", "maxStock", "reorderPoint", "reorderQuantity", "leadTime"]
+URGENCY_ORDER = ["critical", "high", "medium", "low"]
+
+
+def daily_demand_by_position(skus: pd.Series, consumption: pd.DataFrame) -> np.ndarray:
+    """Average units consumed per day for each SKU in ``skus`` (NaN where it has no history).
+
+    ``consumption`` has columns ``sku``, ``date`` and ``quantity``. Each
+    SKU's total is spread over its own span: from its first history row to
+    the end of the history window, so recently listed SKUs are not diluted
+    by days before they were sold. History rows are matched to inventory
+    positions with a hash lookup and summed with ``np.bincount`` instead of
+    a groupby.
+    """
+    dates = pd.to_datetime(consumption["date"], errors="coerce").to_numpy(dtype="datetime64[D]")
+    quantity = pd.to_numeric(consumption["quantity"], errors="coerce").fillna(0).to_numpy(dtype="float64")
+
+    codes, uniques = pd.factorize(skus)
+    positions = pd.Index(uniques).get_indexer(consumption["sku"].astype(str))
+    known = positions >= 0
+    totals = np.bincount(positions[known], weights=quantity[known], minlength=len(uniques))
+    seen = np.bincount(positions[known], minlength=len(uniques)) > 0
+
+    # ✅ Days since each SKU's first dated row, counting the last day of the window
+    dated = known & ~np.isnat(dates)
+    days = np.ones(len(uniques))
+    if dated.any():
+        day = dates[dated].astype("int64")
+        first = np.full(len(uniques), day.max())
+        np.minimum.at(first, positions[dated], day)
+        days = (day.max() - first + 1).astype("float64")
+    return np.where(seen, totals / days, np.nan)[codes]
+
+
+def predict_reorders(inventory: pd.DataFrame, consumption: pd.DataFrame = None) -> pd.DataFrame:
+    """Score every SKU in one vectorized pass.
+
+    Returns ``sku``, ``dailyDemand``, ``daysToStockout``, ``reorder``,
+    ``suggestedQuantity`` and ``urgency`` aligned with ``inventory``'s rows.
+    Demand comes from the consumption history when a SKU has any. Otherwise
+    it is estimated from the reorder point: reorderPoint = lead-time demand +
+    safety stock (minStock).
+    """
+    columns = {c: pd.to_numeric(inventory[c], errors="coerce").fillna(0).to_numpy(dtype="float64")
+               for c in NUMERIC_COLUMNS if c in inventory}
+    n = len(inventory)
+    zeros = np.zeros(n)
+    stock = columns.get("currentStock", zeros)
+    min_stock = columns.get("minStock", zeros)
+    reorder_point = columns.get("reorderPoint", zeros)
+    reorder_qty = columns.get("reorderQuantity", zeros)
+    lead_time = np.maximum(columns.get("leadTime", zeros), 1)
+    max_stock = columns.get("maxStock", reorder_point + reorder_qty)
+
+    skus = inventory["sku"].astype(str) if "sku" in inventory else pd.Series(np.arange(n).astype(str))
+    demand = np.maximum(reorder_point - min_stock, 0) / lead_time
+    if consumption is not None and not consumption.empty:
+        history = daily_demand_by_position(skus, consumption)
+        demand = np.where(np.isnan(history), demand, history)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_to_stockout = np.where(demand > 0, np.maximum(stock, 0) / demand, np.inf)
+
+    lead_time_demand = demand * lead_time
+    reorder = (stock <= reorder_point) | (days_to_stockout <= lead_time)
+
+    # ✅ Order up to maxStock, counting what will be consumed while the order is in transit
+    order_up_to = max_stock - (stock - lead_time_demand)
+    suggested = np.where(reorder, np.ceil(np.maximum(order_up_to, reorder_qty)), 0).astype("int64")
+
+    urgency = pd.Categorical.from_codes(
+        np.select([stock <= 0, days_to_stockout <= lead_time, stock <= reorder_point], [0, 1, 2], default=3),
+        categories=URGENCY_ORDER,
+    )
+
+    return pd.DataFrame({
+        "sku": skus.set_axis(inventory.index),
+        "currentStock": stock.astype("int64"),
+        "dailyDemand": np.round(demand, 3),
+        "daysToStockout": np.round(days_to_stockout, 1),
+        "reorder": reorder,
+        "suggestedQuantity": suggested,
+        "urgency": urgency,
+    }, index=inventory.index)
+
+
 def predict_low_stock(inventory):
-    low_items = []
-    for item in inventory:
-        stock = int(item.get("stock", 0))
-        if stock < 10:
-            low_items.append(item)
-    return low_items
+    """List-of-dicts convenience wrapper: the items that should be reordered now."""
+    items = list(inventory)
+    if not items:
+        return []
+    scores = predict_reorders(pd.DataFrame(items))
+    return [item for item, flagged in zip(items, scores["reorder"].to_numpy()) if flagged]
@@ -1,14 +1,39 @@
-from textblob import TextBlob
+POSITIVE_THRESHOLD = 0.1
+NEGATIVE_THRESHOLD = -0.1
 
-def classify_sentiment(text):
-    polarity = TextBlob(text).sentiment.polarity
-    if polarity > 0.1:
+
+def label_for(polarity: float) -> str:
+    if polarity > POSITIVE_THRESHOLD:
         return "positive"
-    elif polarity < -0.1:
+    elif polarity < NEGATIVE_THRESHOLD:
         return "negative"
     else:
         return "neutral"
 
+
+def _textblob():
+    # Imported on first use: textblob pulls in nltk, about a fifth of the backend's import time
+    from textblob import TextBlob
+    return TextBlob
+
+
+def classify_sentiment(text):
+    return label_for(_textblob()(text).sentiment.polarity)
+
+
+def classify_batch(texts):
+    """Classify a list of reviews; returns ``[(label, polarity), ...]`` in the same order.
+
+    Top-level and picklable so the backend can hand chunks to a process pool.
+    """
+    TextBlob = _textblob()
+    results = []
+    for text in texts:
+        polarity = float(TextBlob(text).sentiment.polarity)
+        results.append((label_for(polarity), round(polarity, 4)))
+    return results
+
 # Example
 if __name__ == "__main__":
     print(classify_sentiment("This store is amazing!"))
+    print(classify_batch(["Worst experience ever.", "Clean store and fast service."]))
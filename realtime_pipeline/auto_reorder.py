@@ -0,0 +1,295 @@
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime
+
+# ✅ Reuse the backend's watcher subsystem (backend/app/utils/file_watcher.py)
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend"))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.utils.csv_io import append_rows
+from app.utils.file_lock import FileLock
+from app.utils.file_watcher import CsvTail, FileWatcher, RowStateTracker
+
+logger = logging.getLogger(__name__)
+
+REORDER_COLUMNS = ["id", "itemId", "itemName", "supplier", "quantity", "estimatedCost",
+                   "urgency", "requestedBy", "requestedDate", "status", "notes"]
+ORDER_COLUMNS = ["orderId", "supplier", "supplierContact", "lines", "totalQuantity", "estimatedCost",
+                 "urgency", "createdAt", "status", "reorderIds"]
+OPEN_STATUSES = {"pending", "approved"}
+URGENCY_ORDER = ["critical", "high", "medium", "low"]
+REQUESTED_BY = "System Auto-Reorder"
+MIRROR_RETRY_SECONDS = 5.0
+
+
+def _number(value, cast=float):
+    try:
+        return cast(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def reorder_urgency(stock: int, min_stock: int) -> str:
+    if stock <= 0:
+        return "critical"
+    if min_stock is not None and stock <= min_stock:
+        return "high"
+    return "medium"
+
+
+class AutoReorderStage:
+    """Pipeline stage: inventory deltas in -> deduplicated reorders and per-supplier orders out.
+
+    Only rows handed to ``submit`` (the added/changed rows of each inventory
+    diff) are checked against ``currentStock <= reorderPoint``, so a burst of
+    updates never rescans the inventory. Rows are micro-batched (at most
+    ``max_wait`` seconds or ``batch_size`` rows); within a batch only the
+    latest row per item counts. An item with an open (pending/approved)
+    reorder is skipped. Open reorders are re-read from the tail of
+    reorders.csv under its file lock right before each write, so another
+    process creating or closing reorders is seen too.
+
+    ``mirror(reorders)`` (e.g. the SQLite upsert) runs under the same lock
+    right after the CSV append. Rows it fails on are kept and retried, so no
+    reorder stays in the CSV only.
+    """
+
+    def __init__(self, reorders_path: str, orders_path: str, batch_size: int = 10_000, max_wait: float = 0.25,
+                 mirror=None):
+        self.reorders_path = reorders_path
+        self.orders_path = orders_path
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.queue = queue.Queue()
+        self.open_items = Counter()  # itemId -> open reorders
+        self.reorder_items = {}      # reorder id -> (itemId, open)
+        self.recent_orders = []
+        self._tail = CsvTail(reorders_path)
+        self._listeners = []
+        self.mirror = mirror
+        self.unmirrored = []
+        self._mirror_retry_at = 0.0
+        self._seq = 0
+        self._thread = None
+        self._stopped = threading.Event()
+        self.stats_counts = Counter()
+        self.last_lag = 0.0
+
+    def add_listener(self, listener):
+        """``listener(reorders, orders)`` is called after every batch that created reorders."""
+        self._listeners.append(listener)
+
+    # --- input -----------------------------------------------------------------
+
+    def submit(self, rows, timestamp: float = None):
+        if rows:
+            self.queue.put((rows, time.time() if timestamp is None else timestamp))
+
+    def on_inventory_diff(self, diff: dict):
+        """RowStateTracker listener; the first diff (the initial file) is not a change and is skipped."""
+        if diff["version"] > 1:
+            self.submit(diff["added"] + diff["changed"])
+
+    def follow_inventory(self, path: str, watcher: FileWatcher = None) -> RowStateTracker:
+        tracker = RowStateTracker(path)
+        tracker.add_listener(self.on_inventory_diff)
+        return tracker.start(watcher)
+
+    # --- open reorders -----------------------------------------------------------
+
+    def _apply_reorder_rows(self, change):
+        if change.reset:
+            self.open_items.clear()
+            self.reorder_items.clear()
+        for row in change.rows:
+            key = row.get("id")
+            old = self.reorder_items.get(key)
+            if old is not None and old[1]:
+                self.open_items[old[0]] -= 1
+                if self.open_items[old[0]] <= 0:
+                    del self.open_items[old[0]]
+            is_open = (row.get("status") or "").lower() in OPEN_STATUSES
+            self.reorder_items[key] = (row.get("itemId"), is_open)
+            if is_open:
+                self.open_items[row.get("itemId")] += 1
+
+    def _sync_reorders(self):
+        change = self._tail.read_new()
+        if change is not None:
+            self._apply_reorder_rows(change)
+
+    def _mirror(self, reorders: list):
+        """Hand ``reorders`` plus any earlier failed ones to ``mirror``; caller holds the reorders lock."""
+        pending = self.unmirrored + reorders
+        if self.mirror is None or not pending:
+            return
+        try:
+            self.mirror(pending)
+            self.unmirrored = []
+        except Exception:
+            self.unmirrored = pending
+            self._mirror_retry_at = time.monotonic() + MIRROR_RETRY_SECONDS
+            self.stats_counts["mirrorErrors"] += 1
+            logger.exception("❌ Mirroring %d reorders to the active store failed; will retry", len(pending))
+
+    def retry_mirror(self):
+        if self.unmirrored and time.monotonic() >= self._mirror_retry_at:
+            with FileLock(self.reorders_path):
+                self._mirror([])
+
+    # --- batches ------------------------------------------------------------------
+
+    def _next_batch(self) -> list:
+        try:
+            batch = [self.queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+            size += len(batch[-1][0])
+        return batch
+
+    def _candidates(self, batch: list) -> dict:
+        latest = {}
+        for rows, _ in batch:
+            for row in rows:
+                latest[row.get("id")] = row
+        self.stats_counts["evaluated"] += len(latest)
+        below = {}
+        for key, row in latest.items():
+            stock = _number(row.get("currentStock"), int)
+            reorder_point = _number(row.get("reorderPoint"), int)
+            if key and stock is not None and reorder_point is not None and stock <= reorder_point:
+                below[key] = row
+        self.stats_counts["belowReorderPoint"] += len(below)
+        return below
+
+    def _next_id(self, prefix: str, stamp: str) -> str:
+        """``PREFIX-<utc second>-<pid>-<n>``: the pid keeps ids unique across workers and restarts."""
+        self._seq += 1
+        return f"{prefix}-{stamp}-{os.getpid()}-{self._seq}"
+
+    def _build(self, below: dict) -> tuple:
+        stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        today = date.today().isoformat()
+        by_supplier = {}
+        for item_id, row in below.items():
+            by_supplier.setdefault(row.get("supplier") or "Unknown supplier", []).append(row)
+
+        reorders, orders = [], []
+        for supplier, rows in by_supplier.items():
+            order_id = self._next_id("PO", stamp)
+            lines = []
+            for row in rows:
+                stock = _number(row.get("currentStock"), int)
+                quantity = _number(row.get("reorderQuantity"), int) or 0
+                cost = round(quantity * (_number(row.get("price")) or 0.0), 2)
+                lines.append({
+                    "id": self._next_id("AR", stamp), "itemId": row.get("id"), "itemName": row.get("name", ""),
+                    "supplier": supplier, "quantity": quantity, "estimatedCost": cost,
+                    "urgency": reorder_urgency(stock, _number(row.get("minStock"), int)),
+                    "requestedBy": REQUESTED_BY, "requestedDate": today, "status": "pending",
+                    "notes": f"Stock {stock} at or below reorder point {row.get('reorderPoint')}. Supplier order {order_id}.",
+                })
+            reorders.extend(lines)
+            orders.append({
+                "orderId": order_id, "supplier": supplier, "supplierContact": rows[0].get("supplierContact", ""),
+                "lines": len(lines), "totalQuantity": sum(line["quantity"] for line in lines),
+                "estimatedCost": round(sum(line["estimatedCost"] for line in lines), 2),
+                "urgency": min((line["urgency"] for line in lines), key=URGENCY_ORDER.index),
+                "createdAt": datetime.utcnow().isoformat(), "status": "pending",
+                "reorderIds": ";".join(line["id"] for line in lines),
+            })
+        return reorders, orders
+
+    def process(self, batch: list) -> tuple:
+        below = self._candidates(batch)
+        reorders, orders = [], []
+        if below:
+            with FileLock(self.reorders_path):
+                self._sync_reorders()
+                fresh = {key: row for key, row in below.items() if key not in self.open_items}
+                self.stats_counts["deduplicated"] += len(below) - len(fresh)
+                if fresh:
+                    reorders, orders = self._build(fresh)
+                    append_rows(self.reorders_path, reorders, fieldnames=REORDER_COLUMNS, lock=False)
+                    self._sync_reorders()  # our own rows: the items are open from now on
+                    self._mirror(reorders)
+            if orders:
+                append_rows(self.orders_path, orders, fieldnames=ORDER_COLUMNS)
+                self.recent_orders = (self.recent_orders + orders)[-100:]
+                self.stats_counts["reordersCreated"] += len(reorders)
+                self.stats_counts["ordersCreated"] += len(orders)
+                for listener in self._listeners:
+                    listener(reorders, orders)
+        self.last_lag = time.time() - min(enqueued for _, enqueued in batch)
+        self.stats_counts["batches"] += 1
+        return reorders, orders
+
+    def run(self):
+        while not self._stopped.is_set():
+            batch = self._next_batch()
+            try:
+                if batch:
+                    self.process(batch)
+                else:
+                    self.retry_mirror()
+            except Exception:
+                self.stats_counts["errors"] += 1
+                logger.exception("❌ Auto-reorder batch failed")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="auto-reorder", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def stats(self) -> dict:
+        return {
+            **{key: self.stats_counts[key] for key in
+               ["evaluated", "belowReorderPoint", "deduplicated", "reordersCreated", "ordersCreated", "batches", "errors",
+                "mirrorErrors"]},
+            "unmirrored": len(self.unmirrored),
+            "openItems": len(self.open_items),
+            "queued": self.queue.qsize(),
+            "lastLagMs": round(1000 * self.last_lag, 1),
+        }
+
+
+def run_auto_reorder(inventory_file: str, reorders_file: str, orders_file: str):
+    stage = AutoReorderStage(reorders_file, orders_file).start()
+    stage.add_listener(lambda reorders, orders: print(
+        f"🧾 {len(reorders)} reorders in {len(orders)} supplier orders: "
+        + ", ".join(f"{o['supplier']} ({o['lines']})" for o in orders[:5])
+    ))
+    stage.follow_inventory(inventory_file)
+    print(f"🧾 Auto-reordering from {inventory_file}")
+    try:
+        while True:
+            time.sleep(5)
+    except KeyboardInterrupt:
+        stage.stop()
+
+if __name__ == "__main__":
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "data", "inventory")
+    run_auto_reorder(os.path.join(data_dir, "inventory.csv"), os.path.join(data_dir, "reorders.csv"),
+                     os.path.join(data_dir, "supplier_orders.csv"))
@@ -1,19 +1,37 @@
-import time
 import os
+import sys
 
-def watch_driver_file(file_path):
-    print(f"👀 Watching driver file: {file_path}")
-    last_modified = None
+# ✅ Reuse the backend's watcher subsystem (backend/app/utils/file_watcher.py)
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend"))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
-    while True:
-        if os.path.exists(file_path):
-            modified_time = os.path.getmtime(file_path)
-            if modified_time != last_modified:
-                last_modified = modified_time
-                with open(file_path, "r") as file:
-                    print("🚨 Driver safety file updated:")
-                    print(file.read())
-        time.sleep(3)
+from app.utils.file_watcher import FileWatcher, FileChange, RowStateTracker
+
+
+class DriverTracker(RowStateTracker):
+    """Current driver rows keyed by ``id``; every file change becomes an added/changed/removed diff."""
+
+    key = "id"
+
+
+def print_driver_change(change: FileChange):
+    if change.reset:
+        print(f"🚨 Driver safety file reloaded: {len(change.rows)} drivers")
+    else:
+        print(f"🚨 Driver safety file updated: {len(change.rows)} new rows")
+        for row in change.rows:
+            print(f"   + {row.get('name')}: safety {row.get('safetyScore')}, risk {row.get('riskLevel')}")
+
+
+def watch_driver_file(file_path, on_change=print_driver_change, watcher: FileWatcher = None):
+    watcher = watcher or FileWatcher()
+    print(f"👀 Watching driver file: {file_path} ({watcher.mode})")
+    watcher.subscribe(file_path, on_change)
+    try:
+        watcher.run()  # blocks; returns after watcher.stop()
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
-    watch_driver_file("../data/drivers/drivers.csv")
+    watch_driver_file(os.path.join(os.path.dirname(__file__), "..", "data", "drivers", "drivers.csv"))
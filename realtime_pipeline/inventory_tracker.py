@@ -1,19 +1,37 @@
-import time
 import os
+import sys
 
-def watch_inventory_file(file_path):
-    print(f"👀 Watching inventory file: {file_path}")
-    last_modified = None
+# ✅ Reuse the backend's watcher subsystem (backend/app/utils/file_watcher.py)
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend"))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
-    while True:
-        if os.path.exists(file_path):
-            modified_time = os.path.getmtime(file_path)
-            if modified_time != last_modified:
-                last_modified = modified_time
-                with open(file_path, "r") as file:
-                    print("🔄 Inventory file updated:")
-                    print(file.read())
-        time.sleep(3)  # check every 3 sec
+from app.utils.file_watcher import FileWatcher, FileChange, RowStateTracker
+
+
+class InventoryTracker(RowStateTracker):
+    """Current inventory rows keyed by ``id``; every file change becomes an added/changed/removed diff."""
+
+    key = "id"
+
+
+def print_inventory_change(change: FileChange):
+    if change.reset:
+        print(f"🔄 Inventory file reloaded: {len(change.rows)} items")
+    else:
+        print(f"🔄 Inventory file updated: {len(change.rows)} new rows")
+        for row in change.rows:
+            print(f"   + {row.get('sku')} {row.get('name')}: stock {row.get('currentStock')} ({row.get('status')})")
+
+
+def watch_inventory_file(file_path, on_change=print_inventory_change, watcher: FileWatcher = None):
+    watcher = watcher or FileWatcher()
+    print(f"👀 Watching inventory file: {file_path} ({watcher.mode})")
+    watcher.subscribe(file_path, on_change)
+    try:
+        watcher.run()  # blocks; returns after watcher.stop()
+    except KeyboardInterrupt:
+        pass
 
 if __name__ == "__main__":
-    watch_inventory_file("../data/inventory/inventory.csv")
+    watch_inventory_file(os.path.join(os.path.dirname(__file__), "..", "data", "inventory", "inventory.csv"))
@@ -1,18 +1,252 @@
-import random
+import logging
+import os
+import queue
+import sys
+import threading
 import time
 
-def stream_sentiment():
-    reviews = [
-        "Worst experience ever.",
-        "Loved the burger combo!",
-        "Delivery was super late!",
-        "Clean store and fast service."
-    ]
+# ✅ Reuse the backend's watcher and batch classifier
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend"))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
-    while True:
-        sample = random.choice(reviews)
-        print(f"🗞️ New sentiment: {sample}")
-        time.sleep(4)
+from app.utils.file_watcher import FileWatcher, get_watcher
+
+LABELS = ("positive", "neutral", "negative")
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentWindow:
+    """Sliding and tumbling sentiment aggregates in constant memory.
+
+    The sliding window is a ring of ``window_seconds / bucket_seconds``
+    buckets with running totals, so ``add`` and ``snapshot`` are O(1). Expired
+    buckets are subtracted as time moves on. The tumbling window keeps the
+    current and the last completed fixed-size period. Rolling polarity is an
+    exponentially weighted moving average.
+    """
+
+    def __init__(self, window_seconds: int = 300, bucket_seconds: int = 1, tumbling_seconds: int = 60,
+                 ewma_alpha: float = 0.05):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.tumbling_seconds = tumbling_seconds
+        self.ewma_alpha = ewma_alpha
+        self.size = max(window_seconds // bucket_seconds, 1)
+        self._buckets = [[0, 0, 0, 0.0] for _ in range(self.size)]  # positive, neutral, negative, polarity sum
+        self._bucket_ids = [-1] * self.size
+        self._totals = [0, 0, 0, 0.0]
+        self._head = None
+        self._tumble_id = None
+        self._tumble = [0, 0, 0, 0.0]
+        self._last_tumble = None
+        self.ewma_polarity = None
+        self.total_seen = 0
+        self._lock = threading.Lock()
+
+    def _advance(self, bucket_id: int):
+        if self._head is None:
+            self._head = bucket_id
+            return
+        if bucket_id <= self._head:
+            return
+        # ✅ At most one pass over the ring, however long the stream was idle
+        for expired in range(max(self._head + 1, bucket_id - self.size + 1), bucket_id + 1):
+            slot = expired % self.size
+            if self._bucket_ids[slot] != -1:
+                bucket = self._buckets[slot]
+                for i in range(4):
+                    self._totals[i] -= bucket[i]
+                self._buckets[slot] = [0, 0, 0, 0.0]
+                self._bucket_ids[slot] = -1
+        self._head = bucket_id
+
+    def _roll_tumbling(self, now: float):
+        tumble_id = int(now // self.tumbling_seconds)
+        if self._tumble_id is None:
+            self._tumble_id = tumble_id
+        elif tumble_id != self._tumble_id:
+            self._last_tumble = self._summary(self._tumble, self._tumble_id * self.tumbling_seconds)
+            if tumble_id != self._tumble_id + 1:
+                self._last_tumble = self._summary([0, 0, 0, 0.0], (tumble_id - 1) * self.tumbling_seconds)
+            self._tumble_id = tumble_id
+            self._tumble = [0, 0, 0, 0.0]
+
+    def add(self, label: str, polarity: float, timestamp: float = None):
+        now = time.time()
+        timestamp = now if timestamp is None else min(timestamp, now)
+        index = LABELS.index(label)
+        with self._lock:
+            self._advance(int(now // self.bucket_seconds))
+            self._roll_tumbling(now)
+            bucket_id = int(timestamp // self.bucket_seconds)
+            if bucket_id <= self._head - self.size:
+                return  # older than the sliding window
+            slot = bucket_id % self.size
+            if self._bucket_ids[slot] not in (-1, bucket_id):
+                return
+            self._bucket_ids[slot] = bucket_id
+            bucket = self._buckets[slot]
+            bucket[index] += 1
+            bucket[3] += polarity
+            self._totals[index] += 1
+            self._totals[3] += polarity
+            self._tumble[index] += 1
+            self._tumble[3] += polarity
+            self.total_seen += 1
+            self.ewma_polarity = polarity if self.ewma_polarity is None else (
+                self.ewma_alpha * polarity + (1 - self.ewma_alpha) * self.ewma_polarity)
+
+    def add_many(self, results, timestamp: float = None):
+        for label, polarity in results:
+            self.add(label, polarity, timestamp)
+
+    @staticmethod
+    def _summary(values, start=None) -> dict:
+        count = values[0] + values[1] + values[2]
+        summary = {
+            "count": count,
+            "positive": values[0],
+            "neutral": values[1],
+            "negative": values[2],
+            "averagePolarity": round(values[3] / count, 4) if count else 0.0,
+        }
+        if start is not None:
+            summary["start"] = start
+        return summary
+
+    def snapshot(self) -> dict:
+        now = time.time()
+        with self._lock:
+            self._advance(int(now // self.bucket_seconds))
+            self._roll_tumbling(now)
+            sliding = self._summary(self._totals)
+            counts = {label: sliding[label] for label in LABELS}
+            dominant = max(LABELS, key=lambda label: counts[label]) if sliding["count"] else "neutral"
+            return {
+                "sentiment": dominant,
+                "windowSeconds": self.window_seconds,
+                "sliding": sliding,
+                "tumbling": {
+                    "seconds": self.tumbling_seconds,
+                    "current": self._summary(self._tumble, self._tumble_id * self.tumbling_seconds),
+                    "previous": self._last_tumble,
+                },
+                "rollingPolarity": round(self.ewma_polarity, 4) if self.ewma_polarity is not None else 0.0,
+                "totalSeen": self.total_seen,
+            }
+
+
+class SentimentStream:
+    """Micro-batching stage: reviews in (file tail or local queue) -> classifier -> window.
+
+    Reviews wait at most ``max_wait`` seconds, or until ``batch_size`` have
+    arrived, before they are classified together.
+    """
+
+    def __init__(self, classifier, window: SentimentWindow, batch_size: int = 256, max_wait: float = 0.05):
+        self.classifier = classifier
+        self.window = window
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.queue = queue.Queue()
+        self.processed = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def submit(self, texts, timestamp: float = None):
+        enqueued = time.time() if timestamp is None else timestamp
+        for text in texts:
+            if text:
+                self.queue.put((text, enqueued))
+
+    def follow_file(self, path: str, watcher: FileWatcher = None, column: str = "text"):
+        """Tail a CSV of reviews; only rows written from now on are streamed.
+
+        The file's current rows are skipped. When it is recreated or rotated,
+        the reset change carries the new file's rows, and those are streamed.
+        """
+        def on_change(change):
+            self.submit([row.get(column, "") for row in change.rows])
+        return (watcher or get_watcher()).subscribe(path, on_change, initial=False)
+
+    def _next_batch(self) -> list:
+        try:
+            batch = [self.queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def process(self, batch: list):
+        results = self.classifier.classify_all([text for text, _ in batch])
+        for (text, enqueued), result in zip(batch, results):
+            self.window.add(result["sentiment"], result["polarity"], enqueued)
+        now = time.time()
+        self.last_lag = now - min(enqueued for _, enqueued in batch)
+        self.max_lag = max(self.max_lag, self.last_lag)
+        self.processed += len(batch)
+        self.batches += 1
+
+    def run(self):
+        while not self._stopped.is_set():
+            batch = self._next_batch()
+            if batch:
+                try:
+                    self.process(batch)
+                except Exception:
+                    self.errors += 1
+                    logger.exception("❌ Sentiment batch of %d reviews failed", len(batch))
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="sentiment-stream", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def stats(self) -> dict:
+        return {
+            "processed": self.processed,
+            "batches": self.batches,
+            "errors": self.errors,
+            "queued": self.queue.qsize(),
+            "lastLagMs": round(1000 * self.last_lag, 1),
+            "maxLagMs": round(1000 * self.max_lag, 1),
+        }
+
+
+def stream_sentiment(reviews_file: str):
+    from app.services.sentiment_service import sentiment_classifier
+
+    window = SentimentWindow()
+    stream = SentimentStream(sentiment_classifier, window).start()
+    stream.follow_file(reviews_file)
+    print(f"🗞️ Streaming reviews from {reviews_file}")
+    try:
+        while True:
+            time.sleep(4)
+            snapshot = window.snapshot()
+            print(f"🗞️ Last {window.window_seconds}s: {snapshot['sliding']} | rolling polarity {snapshot['rollingPolarity']}")
+    except KeyboardInterrupt:
+        stream.stop()
 
 if __name__ == "__main__":
-    stream_sentiment()
+    stream_sentiment(os.path.join(os.path.dirname(__file__), "..", "data", "sentiment", "reviews.csv"))
@@ -1,7 +1,510 @@
-def update_vector_store(data_type, content):
-    print(f"🧠 Updating vector store for {data_type}...")
-    print(f"🔎 Indexed content: {content[:100]}...")
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import zlib
 
-# Example usage
+import numpy as np
+import pandas as pd
+
+# ✅ Reuse the backend's watcher subsystem (backend/app/utils/file_watcher.py)
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend"))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from app.utils.file_lock import FileLock
+from app.utils.file_watcher import FileWatcher, RowStateTracker
+
+logger = logging.getLogger(__name__)
+
+DIM = int(os.getenv("VECTOR_DIM", "256"))
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+EMBED_CHUNK = 32768
+# Below this many rows a full scan is as fast as probing clusters
+ANN_MIN_ROWS = int(os.getenv("VECTOR_ANN_MIN_ROWS", "20000"))
+FOLLOW_INTERVAL = 1.0  # seconds between a follower's checks for a newer saved index
+
+
+def row_text(row: dict) -> str:
+    # ✅ Same text the fuzzy search matches against: every value, lowercased
+    return " ".join(str(value) for value in row.values()).lower()
+
+
+def _features(text: str) -> list:
+    # Words plus a 4-character prefix, so "laptops" still lands near "laptop"
+    words = TOKEN_RE.findall(text.lower())
+    return words + ["#" + word[:4] for word in words if len(word) > 4]
+
+
+class HashingEmbedder:
+    """CPU-only bag-of-words embeddings via the hashing trick.
+
+    Every feature hashes (crc32, stable across processes) to one of ``dim``
+    signed buckets. Counts are dampened with log1p and rows are L2-normalised,
+    so a dot product is a cosine similarity. No vocabulary is fitted, which
+    keeps embeddings of existing rows valid as the corpus changes.
+    """
+
+    def __init__(self, dim: int = DIM):
+        self.dim = dim
+        self._buckets = {}
+
+    def _bucket(self, feature: str) -> tuple:
+        cached = self._buckets.get(feature)
+        if cached is None:
+            h = zlib.crc32(feature.encode("utf-8"))
+            cached = (h % self.dim, 1.0 if (h >> 31) & 1 else -1.0)
+            if len(self._buckets) < 1_000_000:
+                self._buckets[feature] = cached
+        return cached
+
+    def embed(self, texts: list) -> np.ndarray:
+        n = len(texts)
+        features = [_features(text) for text in texts]
+        counts = np.fromiter((len(f) for f in features), dtype=np.int64, count=n)
+        flat = [feature for row in features for feature in row]
+        if not flat:
+            return np.zeros((n, self.dim), dtype=np.float32)
+
+        # ✅ Hash each distinct feature once, then scatter all rows in one bincount
+        codes, uniques = pd.factorize(pd.Series(flat, dtype=object), sort=False)
+        buckets = np.array([self._bucket(feature) for feature in uniques], dtype=np.float64)
+        rows = np.repeat(np.arange(n, dtype=np.int64), counts)
+        cells = rows * self.dim + buckets[codes, 0].astype(np.int64)
+        dense = np.bincount(cells, weights=buckets[codes, 1], minlength=n * self.dim).reshape(n, self.dim)
+        dense = np.sign(dense) * np.log1p(np.abs(dense))
+        norms = np.linalg.norm(dense, axis=1, keepdims=True)
+        return (dense / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+class VectorIndex:
+    """Incrementally updated vector index over keyed rows, stored in a memory-mapped matrix.
+
+    ``<path>.f32`` holds one embedding per slot and ``<path>.keys.json`` maps
+    keys to slots (plus a checksum of the embedded text, so unchanged rows
+    are never re-embedded). Deleted slots are reused by later upserts.
+
+    Search is exact (one matrix-vector product) for small indexes. Once the
+    index is trained (``train``), rows are also assigned to k-means clusters
+    and only the ``nprobe`` nearest clusters are scanned (IVF). New rows are
+    assigned to their nearest cluster on upsert; nothing is rebuilt. Training
+    holds the lock only to copy vectors, so searches and upserts go on meanwhile.
+
+    With ``readonly`` the saved index is mapped for searching only; the files
+    then belong to a writer in another process.
+    """
+
+    def __init__(self, path: str, dim: int = DIM, capacity: int = 1024, readonly: bool = False):
+        self.path = path
+        self.readonly = readonly
+        self.dim = dim
+        self.embedder = HashingEmbedder(dim)
+        self.slots = {}
+        self.keys = []
+        self.checksums = []
+        self.free = []
+        self.centroids = None
+        self._trained_size = 0
+        self._training = False
+        self._dirty = None  # slots written while a training run is in progress
+        self._lock = threading.RLock()
+        self._load(capacity)
+
+    # ---- storage ----
+    @property
+    def matrix_path(self) -> str:
+        return self.path + ".f32"
+
+    def _writable(self):
+        if self.readonly:
+            raise RuntimeError(f"Vector index {self.path} is read-only here; its writer process updates it")
+
+    def _open_matrix(self, capacity: int):
+        if self.readonly:
+            # Map what the writer has sized, never grow it
+            size = os.path.getsize(self.matrix_path) if os.path.exists(self.matrix_path) else 0
+            self.capacity = size // (self.dim * 4)
+            self.matrix = (np.memmap(self.matrix_path, dtype=np.float32, mode="r", shape=(self.capacity, self.dim))
+                           if self.capacity else np.zeros((0, self.dim), dtype=np.float32))
+            return
+        needed = capacity * self.dim * 4
+        with open(self.matrix_path, "ab") as f:
+            if f.tell() < needed:
+                f.truncate(needed)
+        self.capacity = capacity
+        self.matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _load(self, capacity: int):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        meta_path = self.path + ".keys.json"
+        meta = None
+        if os.path.exists(meta_path) and os.path.exists(self.matrix_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("dim") != self.dim:
+                meta = None
+        if meta is not None:
+            self._open_matrix(max(capacity, len(meta["keys"])))
+            if self.capacity < len(meta["keys"]):
+                meta = None  # only possible for a reader of a damaged index: start empty
+        if meta is None:
+            if os.path.exists(self.matrix_path) and not self.readonly:
+                os.remove(self.matrix_path)
+            self._open_matrix(capacity)
+            self.keys, self.checksums, self.slots, self.free = [], [], {}, []
+            self.alive = np.zeros(self.capacity, dtype=bool)
+            self.assign = np.full(self.capacity, -1, dtype=np.int32)
+            self.df = np.zeros(self.dim, dtype=np.int64)
+            return
+
+        self.keys = meta["keys"]
+        self.checksums = meta["checksums"]
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        for slot, key in enumerate(self.keys):
+            if key is None:
+                self.free.append(slot)
+            else:
+                self.slots[key] = slot
+                self.alive[slot] = True
+        if "df" in meta:
+            self.df = np.array(meta["df"], dtype=np.int64)
+        else:
+            self.df = (self.matrix[:len(self.keys)][self.alive[:len(self.keys)]] != 0).sum(axis=0).astype(np.int64)
+        self.assign = np.full(self.capacity, -1, dtype=np.int32)
+        ivf_path = self.path + ".ivf.npz"
+        if os.path.exists(ivf_path):
+            ivf = np.load(ivf_path)
+            if ivf["centroids"].shape[1] == self.dim and len(ivf["assign"]) == len(self.keys):
+                self.centroids = ivf["centroids"]
+                self.assign[:len(self.keys)] = ivf["assign"]
+                self._trained_size = int(ivf["trained_size"])
+
+    def save(self):
+        self._writable()
+        with self._lock:
+            self.matrix.flush()
+            meta_path = self.path + ".keys.json"
+            with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"dim": self.dim, "keys": self.keys, "checksums": self.checksums,
+                           "df": self.df.tolist()}, f)
+            os.replace(meta_path + ".tmp", meta_path)
+            if self.centroids is not None:
+                np.savez(self.path + ".ivf.tmp.npz", centroids=self.centroids,
+                         assign=self.assign[:len(self.keys)], trained_size=self._trained_size)
+                os.replace(self.path + ".ivf.tmp.npz", self.path + ".ivf.npz")
+
+    def _grow(self, needed: int):
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        self.matrix.flush()
+        self._open_matrix(capacity)
+        self.alive = np.concatenate((self.alive, np.zeros(capacity - len(self.alive), dtype=bool)))
+        self.assign = np.concatenate((self.assign, np.full(capacity - len(self.assign), -1, dtype=np.int32)))
+
+    def __len__(self):
+        return len(self.slots)
+
+    # ---- updates ----
+    def upsert(self, items) -> int:
+        """Embed and store ``(key, text)`` pairs; rows whose text did not change are skipped."""
+        self._writable()
+        with self._lock:
+            pending = {}
+            for key, text in items:
+                checksum = zlib.crc32(text.encode("utf-8"))
+                slot = self.slots.get(key)
+                if slot is None or self.checksums[slot] != checksum:
+                    pending[key] = (text, checksum)
+            if not pending:
+                return 0
+
+            new_keys = [key for key in pending if key not in self.slots]
+            reused = min(len(self.free), len(new_keys))
+            self._grow(len(self.keys) + len(new_keys) - reused)
+            slots = np.empty(len(pending), dtype=np.int64)
+            replaced = []
+            for i, (key, (_, checksum)) in enumerate(pending.items()):
+                slot = self.slots.get(key)
+                if slot is None:
+                    if self.free:
+                        slot = self.free.pop()
+                    else:
+                        slot = len(self.keys)
+                        self.keys.append(None)
+                        self.checksums.append(None)
+                    self.slots[key] = slot
+                    self.keys[slot] = key
+                else:
+                    replaced.append(slot)
+                self.checksums[slot] = checksum
+                slots[i] = slot
+            if replaced:
+                self.df -= (np.asarray(self.matrix[replaced]) != 0).sum(axis=0)
+
+            # ✅ Embedded and scattered into the memmap in bounded chunks; frequencies updated incrementally
+            texts = [text for text, _ in pending.values()]
+            for start in range(0, len(texts), EMBED_CHUNK):
+                chunk = slots[start:start + EMBED_CHUNK]
+                vectors = self.embedder.embed(texts[start:start + EMBED_CHUNK])
+                self.matrix[chunk] = vectors
+                self.alive[chunk] = True
+                self.df += (vectors != 0).sum(axis=0)
+                if self.centroids is not None:
+                    self.assign[chunk] = np.argmax(vectors @ self.centroids.T, axis=1)
+            if self._dirty is not None:
+                self._dirty.update(slots.tolist())
+            return len(pending)
+
+    def delete(self, keys) -> int:
+        self._writable()
+        with self._lock:
+            removed = 0
+            for key in keys:
+                slot = self.slots.pop(key, None)
+                if slot is None:
+                    continue
+                self.df -= self.matrix[slot] != 0
+                self.alive[slot] = False
+                self.assign[slot] = -1
+                self.keys[slot] = None
+                self.checksums[slot] = None
+                self.free.append(slot)
+                removed += 1
+            return removed
+
+    def retain(self, keys) -> int:
+        """Delete every key not in ``keys`` (rows removed while nobody was watching)."""
+        with self._lock:
+            keys = set(keys)
+            return self.delete([key for key in self.slots if key not in keys])
+
+    # ---- approximate search ----
+    def train(self, nlist: int = None, sample: int = 20000, iterations: int = 8, seed: int = 0):
+        """Cluster the stored vectors (spherical k-means) and assign every row to its nearest cluster."""
+        self._writable()
+        with self._lock:
+            size = len(self.keys)
+            live = np.flatnonzero(self.alive[:size])
+            if len(live) == 0:
+                return
+            nlist = nlist or int(min(max(np.sqrt(len(live)), 1), 1024))
+            rng = np.random.default_rng(seed)
+            picked = np.sort(rng.choice(live, size=min(sample, len(live)), replace=False))
+            data = np.asarray(self.matrix[picked])
+            self._dirty = set()
+
+        # ✅ k-means and the bulk assignment run outside the lock, on copies of the vectors
+        centroids = data[rng.choice(len(data), size=min(nlist, len(data)), replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, data)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            filled = norms[:, 0] > 0
+            centroids[filled] = sums[filled] / norms[filled]
+        assign = np.full(size, -1, dtype=np.int32)
+        for start in range(0, len(live), 65536):
+            chunk = live[start:start + 65536]
+            with self._lock:
+                vectors = np.asarray(self.matrix[chunk])
+            assign[chunk] = np.argmax(vectors @ centroids.T, axis=1)
+
+        with self._lock:
+            # Swap in; rows written or added meanwhile are assigned again here
+            redo = np.union1d(np.fromiter(self._dirty, dtype=np.int64, count=len(self._dirty)),
+                              size + np.flatnonzero(self.alive[size:len(self.keys)]))
+            self._dirty = None
+            self.assign = np.full(self.capacity, -1, dtype=np.int32)
+            self.assign[:size] = assign
+            if len(redo):
+                self.assign[redo] = np.argmax(np.asarray(self.matrix[redo]) @ centroids.T, axis=1)
+            self.assign[~self.alive] = -1
+            self.centroids = centroids
+            self._trained_size = len(live)
+
+    def _query_vector(self, text: str) -> np.ndarray:
+        # ✅ IDF is applied on the query side only, so stored rows never need re-weighting
+        q = self.embedder.embed([text])[0]
+        idf = np.log((1 + len(self.slots)) / (1 + self.df)) + 1
+        q = q * idf.astype(np.float32)
+        return q / max(float(np.linalg.norm(q)), 1e-12)
+
+    def search(self, text: str, k: int = 3, nprobe: int = None, exact: bool = False,
+               min_score: float = 0.0) -> list:
+        """Return up to ``k`` ``(key, score)`` pairs, best first."""
+        with self._lock:
+            size = len(self.keys)
+            if not self.slots or k <= 0:
+                return []
+            q = self._query_vector(text)
+            if exact or self.centroids is None:
+                scores = np.asarray(self.matrix[:size]) @ q
+                scores[~self.alive[:size]] = -np.inf
+                rows = np.arange(size)
+            else:
+                nprobe = min(nprobe or max(1, len(self.centroids) // 16), len(self.centroids))
+                probes = np.argpartition(-(self.centroids @ q), nprobe - 1)[:nprobe]
+                rows = np.flatnonzero(np.isin(self.assign[:size], probes))
+                if len(rows) == 0:
+                    return []
+                scores = np.asarray(self.matrix[rows]) @ q
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+            top = top[np.lexsort((rows[top], -scores[top]))]
+            return [(self.keys[rows[i]], float(scores[i])) for i in top if scores[i] > min_score]
+
+    def maybe_train(self):
+        # ✅ Cluster once the index is big enough, re-cluster after it has grown 4x; in the background
+        if self.readonly or self._training or len(self.slots) < ANN_MIN_ROWS or len(self.slots) < 4 * self._trained_size:
+            return
+        self._training = True
+        threading.Thread(target=self._train_in_background, name="vector-train", daemon=True).start()
+
+    def _train_in_background(self):
+        try:
+            start = time.perf_counter()
+            self.train()
+            logger.info("🧠 Trained vector index %s in %.1fs", self.path, time.perf_counter() - start)
+        except Exception:
+            logger.exception("❌ Training vector index %s failed", self.path)
+        finally:
+            self._training = False
+
+
+class VectorIndexer:
+    """Keeps one VectorIndex per CSV in sync with the file watcher's row diffs.
+
+    One process per ``directory`` is the writer: it holds ``writer.lock``,
+    tracks the CSVs, embeds and saves. Every other process (e.g. the other
+    uvicorn workers) maps the saved index read-only, reloads it once the writer
+    saves again (``save_interval``), and takes over if the writer exits.
+    """
+
+    def __init__(self, directory: str, sources: dict, save_interval: float = 10.0):
+        self.directory = directory
+        self.sources = sources
+        self.save_interval = save_interval
+        self.indexes = {}
+        self.trackers = {}
+        self.writer = False
+        self._writer_lock = FileLock(os.path.join(directory, "writer"))
+        self._loaded = {}  # name -> stamp of the saved files a follower has mapped
+        self._checked = 0.0
+        self._last_save = 0.0
+        self._save_timer = None
+        self._lock = threading.Lock()
+
+    def apply(self, name: str, diff: dict):
+        index = self.indexes[name]
+        # ✅ Rows without an id cannot be found again after a reload, so they are not indexed
+        rows = [row for row in diff["added"] + diff["changed"] if row.get("id")]
+        if diff["version"] == 1:
+            # The first diff is the whole file: drop rows deleted while the index was not watching
+            index.retain(row["id"] for row in rows)
+        index.upsert((row["id"], row_text(row)) for row in rows)
+        index.delete(diff["removed"])
+        index.maybe_train()
+        # ✅ At most one save per save_interval, and none skipped: followers only see saved changes
+        due = self._last_save + self.save_interval - time.monotonic()
+        if due <= 0:
+            self.save()
+        elif self._save_timer is None:
+            self._save_timer = threading.Timer(due, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def save(self):
+        self._save_timer = None
+        self._last_save = time.monotonic()
+        for index in self.indexes.values():
+            index.save()
+
+    def start(self, watcher: FileWatcher = None):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            if self._writer_lock.acquire(blocking=False):
+                self._become_writer(watcher)
+            else:
+                self._follow()
+        return self
+
+    def _become_writer(self, watcher: FileWatcher = None):
+        self.writer = True
+        self.indexes = {name: VectorIndex(os.path.join(self.directory, name)) for name in self.sources}
+        for name, path in self.sources.items():
+            tracker = RowStateTracker(path)
+            tracker.add_listener(lambda diff, name=name: self.apply(name, diff))
+            self.trackers[name] = tracker.start(watcher)
+        self.save()  # followers can map the initial index right away
+        logger.info("🧠 Vector index writer for %s (pid %d)", self.directory, os.getpid())
+
+    def _follow(self):
+        """Map every index the writer saved since the last look."""
+        for name in self.sources:
+            path = os.path.join(self.directory, name)
+            stamp = tuple(os.stat(file).st_mtime_ns if os.path.exists(file) else None
+                          for file in (path + ".keys.json", path + ".ivf.npz"))
+            if name not in self.indexes or stamp != self._loaded.get(name):
+                self.indexes[name] = VectorIndex(path, readonly=True)
+                self._loaded[name] = stamp
+
+    def _refresh(self):
+        # ✅ Followers: take over if the writer has gone, otherwise pick up its latest save
+        if self.writer or time.monotonic() - self._checked < FOLLOW_INTERVAL:
+            return
+        with self._lock:
+            if self.writer:
+                return
+            self._checked = time.monotonic()
+            if self._writer_lock.acquire(blocking=False):
+                self._become_writer()
+            else:
+                self._follow()
+
+    def search(self, name: str, question: str, k: int = 3, min_score: float = 0.1) -> list:
+        self._refresh()
+        return self.indexes[name].search(question, k, min_score=min_score)
+
+
+_indexer = None
+_indexer_lock = threading.Lock()
+
+
+def get_indexer() -> VectorIndexer:
+    """Process-wide indexer over inventory, reorders and drivers, started on first use (or in warm-up).
+
+    The writer's first start embeds every row; the other processes only map the saved index.
+    """
+    global _indexer
+    from app.config import settings
+
+    with _indexer_lock:
+        if _indexer is None:
+            _indexer = VectorIndexer(settings.VECTOR_DIR, {
+                "inventory": settings.inventory_file_path(),
+                "reorders": settings.reorders_file_path(),
+                "drivers": settings.drivers_file_path(),
+            }).start()
+        return _indexer
+
+
+def update_vector_store(data_type, content, key=None):
+    """Upsert one document into the ``data_type`` index (keyed by its checksum unless ``key`` is given)."""
+    index = get_indexer().indexes[data_type]
+    key = key if key is not None else str(zlib.crc32(content.encode("utf-8")))
+    index.upsert([(key, content.lower())])
+    logger.debug("🧠 Indexed %s document %s: %s", data_type, key, content[:100])
+    return key
+
+# Example usage (a throwaway index, never the persisted one)
 if __name__ == "__main__":
-    update_vector_store("inventory", "Store 002 has shortage of Coke.")
+    import tempfile
+
+    demo = VectorIndex(os.path.join(tempfile.mkdtemp(prefix="vectors-demo-"), "inventory"))
+    demo.upsert([("demo-1", "store 002 has shortage of coke."), ("demo-2", "laptop pro back in stock")])
+    print(demo.search("coke shortage"))